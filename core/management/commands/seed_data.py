@@ -1479,7 +1479,7 @@ class Command(BaseCommand):
         from engagements.services import default_share_text, get_engagement_post_context
         from events.models import VirtualMeeting
         from feed.models import FeedEvent, FeedImpression, FeedTarget
-        from feed.tasks import create_feed_event_task
+        from feed.tasks import create_feed_events_task
         from posts.models import Post
         from reviews.models import Review
 
@@ -1572,7 +1572,7 @@ class Command(BaseCommand):
         self.stdout.write(f"    Created {len(created_reviews)} reviews")
 
         # --- Feed Events ---
-        # Use create_feed_event_task exactly like organic creation so FeedTargets
+        # Use the same task path as organic creation (batched) so FeedTargets
         # are created from each entity's real .feed_targets property.
         self.stdout.write("  Creating feed events...")
 
@@ -1584,15 +1584,15 @@ class Command(BaseCommand):
             )
         }
 
-        feed_event_count = 0
+        feed_events = []
 
         for internship in self.internships[:80]:
-            create_feed_event_task(
-                event_type=FeedEvent.EventType.INTERNSHIP_CREATED,
-                related_object_id=internship.id,
-                related_model="internship",
-                audience=FeedEvent.Audience.PUBLIC,
-                data={
+            feed_events.append({
+                "event_type": FeedEvent.EventType.INTERNSHIP_CREATED,
+                "related_object_id": internship.id,
+                "related_model": "internship",
+                "audience": FeedEvent.Audience.PUBLIC,
+                "data": {
                     "title": internship.title,
                     "alumni": internship.alumnus.full_name,
                     "work_mode": internship.work_mode,
@@ -1603,18 +1603,17 @@ class Command(BaseCommand):
                     "remaining_slots": internship.remaining_slots,
                     "created_at": internship.created_at.isoformat(),
                 },
-                score=random.randint(0, 10),
-                shuffle_seed=random.random(),
-            )
-            feed_event_count += 1
+                "score": random.randint(0, 10),
+                "shuffle_seed": random.random(),
+            })
 
         for mentorship in self.mentorships[:60]:
-            create_feed_event_task(
-                event_type=FeedEvent.EventType.MENTORSHIP_CREATED,
-                related_object_id=mentorship.id,
-                related_model="mentorship",
-                audience=FeedEvent.Audience.PUBLIC,
-                data={
+            feed_events.append({
+                "event_type": FeedEvent.EventType.MENTORSHIP_CREATED,
+                "related_object_id": mentorship.id,
+                "related_model": "mentorship",
+                "audience": FeedEvent.Audience.PUBLIC,
+                "data": {
                     "title": mentorship.title,
                     "alumni": mentorship.alumnus.full_name,
                     "category": mentorship.category,
@@ -1622,10 +1621,9 @@ class Command(BaseCommand):
                     "remaining_slots": mentorship.remaining_slots,
                     "created_at": mentorship.created_at.isoformat(),
                 },
-                score=random.randint(0, 10),
-                shuffle_seed=random.random(),
-            )
-            feed_event_count += 1
+                "score": random.randint(0, 10),
+                "shuffle_seed": random.random(),
+            })
 
         for event in self.events[:40]:
             event_data = {
@@ -1640,16 +1638,15 @@ class Command(BaseCommand):
             if vm_platform:
                 event_data["virtual_meeting"] = vm_platform
 
-            create_feed_event_task(
-                event_type=FeedEvent.EventType.EVENT_CREATED,
-                related_object_id=event.id,
-                related_model="event",
-                audience=FeedEvent.Audience.PUBLIC,
-                data=event_data,
-                score=random.randint(0, 10),
-                shuffle_seed=random.random(),
-            )
-            feed_event_count += 1
+            feed_events.append({
+                "event_type": FeedEvent.EventType.EVENT_CREATED,
+                "related_object_id": event.id,
+                "related_model": "event",
+                "audience": FeedEvent.Audience.PUBLIC,
+                "data": event_data,
+                "score": random.randint(0, 10),
+                "shuffle_seed": random.random(),
+            })
 
         for engagement in self.engagements[:60]:
             detail = engagement.detail
@@ -1664,32 +1661,32 @@ class Command(BaseCommand):
                     content=default_text,
                     related_object=engagement,
                 )
-                create_feed_event_task(
-                    event_type=FeedEvent.EventType.INTERNSHIP_STARTED
+                feed_events.append({
+                    "event_type": FeedEvent.EventType.INTERNSHIP_STARTED
                     if engagement.engagement_type == Engagement.EngagementType.INTERNSHIP
                     else FeedEvent.EventType.MENTORSHIP_STARTED,
-                    related_object_id=post.id,
-                    related_model="post",
-                    audience=FeedEvent.Audience.PUBLIC,
-                    data={"content": post.content, "engagement": context},
-                    score=random.randint(0, 10),
-                    shuffle_seed=random.random(),
-                )
+                    "related_object_id": post.id,
+                    "related_model": "post",
+                    "audience": FeedEvent.Audience.PUBLIC,
+                    "data": {"content": post.content, "engagement": context},
+                    "score": random.randint(0, 10),
+                    "shuffle_seed": random.random(),
+                })
             else:
-                create_feed_event_task(
-                    event_type=FeedEvent.EventType.INTERNSHIP_STARTED
+                feed_events.append({
+                    "event_type": FeedEvent.EventType.INTERNSHIP_STARTED
                     if engagement.engagement_type == Engagement.EngagementType.INTERNSHIP
                     else FeedEvent.EventType.MENTORSHIP_STARTED,
-                    related_object_id=engagement.id,
-                    related_model=engagement.engagement_type,
-                    audience=FeedEvent.Audience.PUBLIC,
-                    data={**post_context},
-                    score=random.randint(0, 10),
-                    shuffle_seed=random.random(),
-                )
-            feed_event_count += 1
+                    "related_object_id": engagement.id,
+                    "related_model": engagement.engagement_type,
+                    "audience": FeedEvent.Audience.PUBLIC,
+                    "data": {**post_context},
+                    "score": random.randint(0, 10),
+                    "shuffle_seed": random.random(),
+                })
 
-        self.stdout.write(f"    Created {feed_event_count} feed events")
+        created_feed_events = create_feed_events_task(feed_events)
+        self.stdout.write(f"    Created {len(created_feed_events)} feed events")
 
         # --- Feed Impressions ---
         self.stdout.write("  Creating feed impressions...")
@@ -1724,7 +1721,7 @@ class Command(BaseCommand):
         self.stdout.write(
             self.style.SUCCESS(
                 f"  Batch 8 complete: {len(created_reviews)} reviews, "
-                f"{feed_event_count} feed events, "
+                f"{len(created_feed_events)} feed events, "
                 f"{len(unique_impressions)} impressions"
             )
         )
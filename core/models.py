@@ -13,6 +13,19 @@ from futaverse.models import BaseModel
 def default_expiry():
     return timezone.now() + timedelta(minutes=10)
 
+def feed_match_q(match_targets, prefix='targets__'):
+    """
+    OR together one ``target_value__in`` lookup per target type, so the filter
+    grows with the number of target types (at most six), not with the number of skills.
+    """
+    match_filter = None
+
+    for target_type, values in match_targets.items():
+        attribute = models.Q(**{f'{prefix}target_type': target_type, f'{prefix}target_value__in': values})
+        match_filter = attribute if match_filter is None else match_filter | attribute
+
+    return match_filter
+
 class UserManager(BaseUserManager):
     def create_user(self, **extra_fields):
         email = extra_fields.get("email")
@@ -195,35 +208,33 @@ class StudentProfile(BaseModel):
         return f"{self.full_name} (student)"
     
     @cached_property
-    def feed_match_filter(self):
-        attributes = []
+    def feed_match_targets(self):
+        targets = {}
 
-        for skill in self.skills: 
-            attributes.append(models.Q(targets__target_type='skill', targets__target_value=skill))
+        if self.skills:
+            targets['skill'] = list(self.skills)
 
         if self.department:
-            attributes.append(models.Q(targets__target_type='department', targets__target_value=self.department))
-            
+            targets['department'] = [self.department]
+
         if self.faculty:
-            attributes.append(models.Q(targets__target_type='faculty', targets__target_value=self.faculty))
+            targets['faculty'] = [self.faculty]
 
         if self.level:
-            attributes.append(models.Q(targets__target_type='level', targets__target_value=str(self.level)))
-            
+            targets['level'] = [str(self.level)]
+
         if self.preferred_industry:
-            attributes.append(models.Q(targets__target_type='industry', targets__target_value=self.preferred_industry))
-            
+            targets['industry'] = [self.preferred_industry]
+
         if self.preferred_company_type:
-            attributes.append(models.Q(targets__target_type='company_type', targets__target_value=self.preferred_company_type))
+            targets['company_type'] = [self.preferred_company_type]
 
-        if not attributes:
-            return None
+        return targets
 
-        match_filter = attributes[0]
-        for attr in attributes[1:]:
-            match_filter |= attr
+    @cached_property
+    def feed_match_filter(self):
+        return feed_match_q(self.feed_match_targets)
 
-        return match_filter
 class StudentResume(BaseModel):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name='resumes')
     resume = models.URLField(max_length=200)
@@ -280,24 +291,20 @@ class AlumniProfile(BaseModel):
         return f"{self.full_name} (alumnus)"
     
     @cached_property
-    def feed_match_filter(self):
-        attributes = []
+    def feed_match_targets(self):
+        targets = {}
 
         if self.department:
-            attributes.append(models.Q(targets__target_type='department', targets__target_value=self.department))
-            
+            targets['department'] = [self.department]
+
         if self.faculty:
-            attributes.append(models.Q(targets__target_type='faculty', targets__target_value=self.faculty))
+            targets['faculty'] = [self.faculty]
 
         if self.industry:
-            attributes.append(models.Q(targets__target_type='industry', targets__target_value=self.industry))
+            targets['industry'] = [self.industry]
 
-        if not attributes:
-            return None
-
-        match_filter = attributes[0]
-        for attr in attributes[1:]:
-            match_filter |= attr
+        return targets
 
-        return match_filter
-    
+    @cached_property
+    def feed_match_filter(self):
+        return feed_match_q(self.feed_match_targets)
@@ -10,6 +10,7 @@ from engagements.models import Engagement
 from engagements.services import engagement_domain
 
 from futaverse.lib import MODELS
+from notifications.models import Notification
 
 logger = logging.getLogger(__name__)
 
@@ -65,7 +66,8 @@ def schedule_auto_acknowledgement_task(engagement_data):
             "notifications.tasks.send_notifications_task",
             user_ids=[student_id],
             title=f'{domain} Completed',
-            content=f'Your {domain} with {alumnus_name} has been marked as completed.'
+            content=f'Your {domain} with {alumnus_name} has been marked as completed.',
+            priority=Notification.Priority.LOW,
         )
     except Exception as e:
         logger.warning("Notification task dispatch failed for engagement %s: %s", sqid, e)
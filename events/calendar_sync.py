@@ -0,0 +1,93 @@
+"""
+Debounced Google Calendar attendee sync.
+
+A purchase only marks its event dirty. Syncs are debounced (see
+futaverse.utils.schedules): the first mark in a window schedules one django-q
+job CALENDAR_SYNC_DEBOUNCE_SECONDS later, and that job reads the final paid
+attendee list once and sends it in a single PATCH; every purchase made
+meanwhile rides along. A list identical to the last one synced is not sent
+again.
+
+A sync that can't reach Google (the PATCH fails, or the organizer must
+re-authenticate) raises CalendarSyncFailed, leaving the task unacknowledged
+so django-q retries it (Q_CLUSTER retry / max_attempts).
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from futaverse.utils.schedules import clear_debounce, debounce
+
+from .models import Event, TicketPurchase
+from .services import GoogleAuthRequired, GoogleCalendarService, get_user_credentials
+
+logger = logging.getLogger(__name__)
+
+SYNC_TASK = "events.tasks.sync_calendar_attendees_task"
+
+DIRTY_KEY = "events:calendar:dirty:{event_id}"
+SYNCED_KEY = "events:calendar:synced:{event_id}"
+
+
+class CalendarSyncFailed(Exception):
+    pass
+
+
+def mark_dirty(event_id):
+    """Queue an attendee sync for the event after the current transaction commits."""
+    transaction.on_commit(lambda: _schedule_sync(event_id))
+
+
+def _schedule_sync(event_id):
+    debounce(DIRTY_KEY.format(event_id=event_id), SYNC_TASK, event_id, window=settings.CALENDAR_SYNC_DEBOUNCE_SECONDS)
+
+
+def attendee_emails(event):
+    emails = list(
+        TicketPurchase.objects.filter(ticket__event=event, is_paid=True)
+        .order_by("email")
+        .values_list("email", flat=True)
+        .distinct()
+    )
+    if event.creator.email not in emails:
+        emails.append(event.creator.email)
+    return emails
+
+
+def sync_attendees(event_id):
+    """
+    Send the event's full attendee list to Google; returns True if a PATCH was
+    sent, False if there was nothing to send. Raises CalendarSyncFailed if
+    Google couldn't be updated.
+    """
+    # Clearing the flag first means any purchase from here on schedules a new sync.
+    clear_debounce(DIRTY_KEY.format(event_id=event_id))
+
+    event = (
+        Event.objects.select_related("creator", "virtual_meeting").filter(id=event_id).first()
+    )
+    virtual_meeting = getattr(event, "virtual_meeting", None) if event else None
+    if not virtual_meeting or not virtual_meeting.external_calendar_event_id:
+        return False
+
+    emails = attendee_emails(event)
+    digest = hashlib.sha1("\n".join(emails).encode()).hexdigest()
+    synced_key = SYNCED_KEY.format(event_id=event_id)
+    if cache.get(synced_key) == digest:
+        return False
+
+    try:
+        service = GoogleCalendarService(get_user_credentials(event.creator))
+    except GoogleAuthRequired as e:
+        logger.warning("Calendar sync failed for event %s: organizer must re-authenticate", event.sqid)
+        raise CalendarSyncFailed(f"Organizer of event {event.sqid} must re-authenticate") from e
+
+    if service.add_attendee_to_event(virtual_meeting.external_calendar_event_id, emails) is None:
+        raise CalendarSyncFailed(f"Attendee update for event {event.sqid} was rejected by Google")
+
+    cache.set(synced_key, digest, timeout=60 * 60 * 24 * 30)
+    return True
@@ -0,0 +1,66 @@
+"""
+Management command: benchmark_calendar_client
+
+Measures what a Google Calendar call costs before it reaches the network, as
+CreateEventView, UpdateEventView and UpdateEventModeView pay it: getting a
+client for the organizer's credentials and building one events.patch
+request. Compares the old per-call ``build("calendar", "v3", ...)`` with
+``GoogleCalendarService``'s shared resource and per-user transport. Nothing
+is executed, so no Google account or network is needed.
+Run: python manage.py benchmark_calendar_client [--iterations N]
+
+Options:
+    --iterations   Clients to create per strategy (default 500)
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from events.services import GoogleCalendarService
+
+PATCH_BODY = {"summary": "Benchmark", "attendees": [{"email": "bench@example.invalid"}]}
+
+
+class Command(BaseCommand):
+    help = "Benchmark Google Calendar client construction per request"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=500, help="Clients to create per strategy")
+
+    def handle(self, *args, **options):
+        iterations = options["iterations"]
+        credentials = Credentials(token="benchmark-token")
+
+        # Pay the one-off process-wide cost outside the timings.
+        GoogleCalendarService(credentials)
+
+        self.stdout.write(f"Benchmarking {iterations} Calendar clients")
+        build_ms = self.measure("build() per call", iterations, lambda: self.discovery_build(credentials))
+        shared_ms = self.measure("shared resource", iterations, lambda: self.shared_resource(credentials))
+        self.stdout.write(self.style.SUCCESS(f"  speedup (median): {build_ms / shared_ms:.1f}x"))
+
+    def discovery_build(self, credentials):
+        service = build("calendar", "v3", credentials=credentials)
+        return service.events().patch(calendarId="primary", eventId="bench", body=PATCH_BODY, sendUpdates="all")
+
+    def shared_resource(self, credentials):
+        service = GoogleCalendarService(credentials)
+        return service.events.patch(calendarId="primary", eventId="bench", body=PATCH_BODY, sendUpdates="all")
+
+    def measure(self, label, iterations, run):
+        timings = []
+        for _ in range(iterations):
+            started = time.perf_counter()
+            run()
+            timings.append((time.perf_counter() - started) * 1000)
+
+        median = statistics.median(timings)
+        p95 = statistics.quantiles(timings, n=20)[-1]
+        self.stdout.write(
+            self.style.SUCCESS(f"  {label:<20} median={median:.3f}ms p95={p95:.3f}ms total={sum(timings):.0f}ms")
+        )
+        return median
@@ -0,0 +1,17 @@
+# Registers the periodic django-q schedule that reconciles Redis ticket
+# stock with ticket purchases (see events.reservations).
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("events", "0001_initial"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("reconcile_ticket_stock", "events.tasks.reconcile_ticket_stock_task", minutes=10),
+    ]
@@ -135,6 +135,9 @@ class TicketPurchase(BaseModel):
     checked_in = models.BooleanField(default=False)
     checked_in_at = models.DateTimeField(blank=True, null=True)
 
+    confirmation_claimed_at = models.DateTimeField(blank=True, null=True)
+    confirmation_sent_at = models.DateTimeField(blank=True, null=True)
+
     def __str__(self):
         return f"{self.ticket_uid} - {self.ticket.name}"
 
@@ -0,0 +1,273 @@
+"""
+Ticket inventory reservations in Redis.
+
+Every limited ticket has a stock counter (seats neither sold nor held) and a
+sorted set of holds (ticket_uid -> expiry) in Redis. ``reserve`` is one Lua
+script: it returns expired holds to stock, then takes a seat only if one is
+left, so concurrent buyers can never get more than ``quantity`` between them
+and no request waits on a lock on the Ticket row.
+
+A purchase holds its seat from the request until its sale is recorded:
+free tickets confirm as soon as the purchase commits, paid tickets when
+Paystack reports the charge. Checkouts that are abandoned or rolled back
+release their seat explicitly, or lose it when the hold expires after
+TICKET_RESERVATION_TTL_SECONDS.
+
+TicketPurchase stays the record of what was sold. Keys are seeded from it on
+first use, and ``reconcile`` periodically rebuilds each ticket's stock from
+its paid purchases and live holds, also correcting ``Ticket.quantity_sold``.
+Without Redis, availability falls back to the ``quantity_sold`` check.
+"""
+
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F, Q
+from django.utils import timezone
+from redis.exceptions import RedisError, WatchError
+
+from futaverse.utils.redis_client import get_redis
+
+from .models import Ticket, TicketPurchase
+
+logger = logging.getLogger(__name__)
+
+STOCK_KEY = "tickets:{{{ticket_id}}}:stock"
+HOLDS_KEY = "tickets:{{{ticket_id}}}:holds"
+
+# Returns expired holds to stock, then takes one seat if any is left and holds
+# it until ARGV[3]. -1 means the keys haven't been seeded yet.
+RESERVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+local expired = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+if #expired > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', ARGV[2])
+    redis.call('INCRBY', KEYS[1], #expired)
+end
+if redis.call('ZSCORE', KEYS[2], ARGV[1]) then
+    return 1
+end
+if tonumber(redis.call('GET', KEYS[1])) <= 0 then
+    return 0
+end
+redis.call('DECR', KEYS[1])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[1])
+return 1
+"""
+
+# Turns a hold into a sale. A hold that already expired went back to stock,
+# so the seat is taken again if one is left; 0 means the sale oversold.
+CONFIRM_SCRIPT = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 1 then
+    return 1
+end
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return -1
+end
+if tonumber(redis.call('GET', KEYS[1])) <= 0 then
+    return 0
+end
+redis.call('DECR', KEYS[1])
+return 1
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 1 then
+    redis.call('INCR', KEYS[1])
+    return 1
+end
+return 0
+"""
+
+# ARGV: stock, then (expiry, ticket_uid) pairs. Never overwrites live keys.
+SEED_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 0
+end
+redis.call('DEL', KEYS[2])
+redis.call('SET', KEYS[1], ARGV[1])
+for i = 2, #ARGV, 2 do
+    redis.call('ZADD', KEYS[2], ARGV[i], ARGV[i + 1])
+end
+return 1
+"""
+
+
+def keys_for(ticket_id):
+    return [STOCK_KEY.format(ticket_id=ticket_id), HOLDS_KEY.format(ticket_id=ticket_id)]
+
+
+def hold_id(ticket_uid):
+    # Views use the hex form, Paystack echoes it back as the reference.
+    return uuid.UUID(str(ticket_uid)).hex
+
+
+def is_limited(ticket):
+    return ticket.quantity is not None
+
+
+def sold_count(ticket_id):
+    return TicketPurchase.objects.filter(ticket_id=ticket_id, is_paid=True).count()
+
+
+def pending_holds(ticket_id, now):
+    """Unpaid purchases still inside the reservation TTL, as ``{hold_id: expiry}``."""
+    ttl = settings.TICKET_RESERVATION_TTL_SECONDS
+    rows = TicketPurchase.objects.filter(
+        ticket_id=ticket_id, is_paid=False, created_at__gt=now - timedelta(seconds=ttl)
+    ).values_list("ticket_uid", "created_at")
+    return {hold_id(ticket_uid): (created_at + timedelta(seconds=ttl)).timestamp() for ticket_uid, created_at in rows}
+
+
+def seed(ticket, client):
+    """Build the ticket's keys from Postgres unless another request already has."""
+    holds = pending_holds(ticket.id, timezone.now())
+    stock = ticket.quantity - sold_count(ticket.id) - len(holds)
+
+    args = [stock]
+    for member, expiry in holds.items():
+        args.extend([expiry, member])
+    client.register_script(SEED_SCRIPT)(keys=keys_for(ticket.id), args=args)
+
+
+def _run(script, ticket, ticket_uid, args, client):
+    script = client.register_script(script)
+    result = script(keys=keys_for(ticket.id), args=[hold_id(ticket_uid), *args])
+    if result == -1:
+        seed(ticket, client)
+        result = script(keys=keys_for(ticket.id), args=[hold_id(ticket_uid), *args])
+    return result
+
+
+def _available_in_db(ticket):
+    return Ticket.objects.filter(id=ticket.id, quantity_sold__lt=F("quantity")).exists()
+
+
+def reserve(ticket, ticket_uid, client=None):
+    """Hold one seat for ``ticket_uid``; returns False when the ticket is sold out."""
+    if not is_limited(ticket):
+        return True
+
+    client = client or get_redis()
+    if client is None:
+        return _available_in_db(ticket)
+
+    now = time.time()
+    try:
+        return _run(
+            RESERVE_SCRIPT, ticket, ticket_uid, [now, now + settings.TICKET_RESERVATION_TTL_SECONDS], client
+        ) == 1
+    except RedisError as e:
+        logger.warning("Ticket reservation failed for ticket %s, checking Postgres: %s", ticket.id, e)
+        return _available_in_db(ticket)
+
+
+def confirm(ticket, ticket_uid, client=None):
+    """
+    Record the sale of ``ticket_uid``'s seat: consumes its hold and bumps
+    ``quantity_sold`` in its own short statement. Call after the purchase has
+    committed.
+    """
+    Ticket.objects.filter(id=ticket.id).update(quantity_sold=F("quantity_sold") + 1)
+
+    if not is_limited(ticket):
+        return
+
+    client = client or get_redis()
+    if client is None:
+        return
+
+    try:
+        confirmed = _run(CONFIRM_SCRIPT, ticket, ticket_uid, [], client)
+    except RedisError as e:
+        logger.warning("Ticket sale confirmation failed for ticket %s: %s", ticket.id, e)
+        return
+
+    if confirmed == 0:
+        # Paid after the hold expired and the seat was resold.
+        logger.error("Ticket %s oversold by late payment %s", ticket.id, ticket_uid)
+
+
+def release(ticket, ticket_uid, client=None):
+    """Give ``ticket_uid``'s held seat back to stock (abandoned or failed purchase)."""
+    if not is_limited(ticket):
+        return
+
+    client = client or get_redis()
+    if client is None:
+        return
+
+    try:
+        client.register_script(RELEASE_SCRIPT)(keys=keys_for(ticket.id), args=[hold_id(ticket_uid)])
+    except RedisError as e:
+        logger.warning("Ticket reservation release failed for ticket %s: %s", ticket.id, e)
+
+
+def reconcile_ticket(ticket, client):
+    """
+    Rebuild the ticket's stock from its paid purchases and live Redis holds.
+    Returns ``(sold, changed)``; if a reservation touches the ticket meanwhile
+    the rewrite is dropped and the ticket is simply checked again next run.
+    """
+    stock_key, holds_key = keys_for(ticket.id)
+
+    with client.pipeline() as pipe:
+        try:
+            # Any reserve/confirm/release from here until EXEC aborts the rewrite.
+            pipe.watch(stock_key, holds_key)
+            # Counted after WATCH: a sale confirmed before it has already committed.
+            sold = sold_count(ticket.id)
+            current = pipe.get(stock_key)
+            if current is None:
+                return sold, False
+
+            now = time.time()
+            expected = ticket.quantity - sold - pipe.zcount(holds_key, f"({now}", "+inf")
+
+            pipe.multi()
+            pipe.zremrangebyscore(holds_key, "-inf", now)
+            pipe.set(stock_key, expected)
+            pipe.execute()
+        except WatchError:
+            return sold, False
+
+    return sold, int(current) != expected
+
+
+def reconcile(client=None):
+    """Correct drifted Redis stock and ``quantity_sold`` for every ticket on sale."""
+    client = client or get_redis()
+    tickets = Ticket.objects.filter(
+        Q(sales_end__isnull=True) | Q(sales_end__gt=timezone.now()), is_active=True
+    )
+
+    checked = 0
+    corrected = 0
+    counters_fixed = 0
+    for ticket in tickets.iterator():
+        checked += 1
+        sold, changed = None, False
+
+        if client is not None and is_limited(ticket):
+            try:
+                sold, changed = reconcile_ticket(ticket, client)
+            except RedisError as e:
+                logger.warning("Ticket stock reconciliation failed for ticket %s: %s", ticket.id, e)
+        if sold is None:
+            sold = sold_count(ticket.id)
+
+        corrected += changed
+        if ticket.quantity_sold != sold:
+            Ticket.objects.filter(id=ticket.id).update(quantity_sold=sold)
+            counters_fixed += 1
+
+    stats = {"checked": checked, "corrected": corrected, "counters_fixed": counters_fixed}
+    logger.info(
+        "reconcile_ticket_stock: checked=%s corrected=%s counters_fixed=%s", checked, corrected, counters_fixed
+    )
+    return stats
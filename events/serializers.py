@@ -170,6 +170,7 @@ class TicketPurchaseSerializer(serializers.ModelSerializer):
         if value.sales_end and value.sales_end < timezone.now():
             raise serializers.ValidationError({"ticket": "Ticket sales have ended"})
 
+        # Cheap early reject; the seat reservation in CreateTicketPurchaseView is authoritative.
         if value.quantity is not None and value.quantity_sold >= value.quantity:
             raise serializers.ValidationError({"ticket": "Ticket is sold out"})
 
@@ -12,9 +12,9 @@ from logging import getLogger
 from datetime import timedelta, datetime
 
 from futaverse.utils.email_service import BrevoEmailService
+from futaverse.utils.google.clients import authorized_http, calendar_events, new_calendar_batch
 from futaverse.utils.google.views import build_google_auth_url
 
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
@@ -28,33 +28,6 @@ class EventService:
     def __init__(self, event):
         self.event = event
         
-    def sync_to_calendar(self):
-        event = self.event
-        
-        try:
-            virtual_meeting = getattr(event, 'virtual_meeting', None)
-            if not virtual_meeting:
-                return
-
-            credentials = get_user_credentials(event.creator)
-            service = GoogleCalendarService(credentials)
-
-            all_emails = list(TicketPurchase.objects.filter(
-                ticket__event=event, 
-                is_paid=True
-            ).values_list('email', flat=True))
-            
-            if event.creator.email not in all_emails:
-                all_emails.append(event.creator.email)
-
-            service.add_attendee_to_event(
-                event_id=virtual_meeting.external_calendar_event_id,
-                new_attendee_emails=all_emails
-            )
-            
-        except Exception as e:
-            logger.error(f"Calendar sync failed: {e}")
-
     @staticmethod
     def send_ticket_email(ticket_purchase):
         event: Event = ticket_purchase.ticket.event
@@ -73,15 +46,13 @@ class EventService:
         
         html_body = render_to_string('emails/ticket_confirmation.html', context)
         
-        try:
-            mailer.send(
-                subject=f"Confirmation: Your Ticket for {event.title}",
-                body=html_body,
-                recipient=ticket_purchase.email,
-                is_html=True,
-            )
-        except Exception as e:
-            logger.warning("Ticket email send failed for %s: %s", ticket_purchase.email, e)
+        # Raises on failure so the ticket email task is retried; see events.ticket_emails.
+        mailer.send(
+            subject=f"Confirmation: Your Ticket for {event.title}",
+            body=html_body,
+            recipient=ticket_purchase.email,
+            is_html=True,
+        )
     
     def send_event_update_emails(self, old_data):
         event = self.event
@@ -220,9 +191,15 @@ class GoogleAuthRequired(Exception):
         
 class GoogleCalendarService:
     def __init__(self, credentials):
-        self.service = build("calendar", "v3", credentials=credentials)
+        # Only the transport is per user; the API methods are built once per process.
+        self.events = calendar_events()
+        self.http = authorized_http(credentials)
 
-    def create_event(self, event: Event, attendees_emails, manual_join_url=None):
+    def batch(self):
+        """Queue changes to many events and send them in as few round trips as possible."""
+        return CalendarBatch(self)
+
+    def insert_request(self, event: Event, attendees_emails, manual_join_url=None):
         
         start_datetime = timezone.make_aware(datetime.combine(event.date, event.start_time))
         end_datetime = start_datetime + timedelta(minutes=event.duration_mins)
@@ -254,40 +231,23 @@ class GoogleCalendarService:
                 }
             }
 
-        try:
-            return self.service.events().insert(
-                calendarId='primary',
-                body=body,
-                conferenceDataVersion=1 if not manual_join_url else 0,
-                sendUpdates='all'        
-            ).execute()
-            
-        except HttpError as e:
-            logger.error(f"Google Calendar Create Error: {e}")
-            raise 
-        
-    def add_attendee_to_event(self, event_id, new_attendee_emails):
-        """
-        event_id: The external_calendar_event_id
-        new_attendee_emails: List of current + new attendee emails
-        """
-        try:
-            body = {
-                'attendees': [{'email': email} for email in new_attendee_emails]
-            }
+        return self.events.insert(
+            calendarId='primary',
+            body=body,
+            conferenceDataVersion=1 if not manual_join_url else 0,
+            sendUpdates='all'        
+        )
 
-            return self.service.events().patch(
-                calendarId='primary',
-                eventId=event_id,
-                body=body,
-                sendUpdates='all'  
-            ).execute()
-            
-        except HttpError as e:
-            logger.error(f"Error patching calendar attendees: {e}")
-            return None
-        
-    def update_event_details(self, event: Event, changes, manual_join_url=None):
+    def attendees_request(self, event_id, attendee_emails):
+        return self.events.patch(
+            calendarId='primary',
+            eventId=event_id,
+            body={'attendees': [{'email': email} for email in attendee_emails]},
+            sendUpdates='all'  
+        )
+
+    def update_request(self, event: Event, changes, external_id, manual_join_url=None):
+        """The PATCH for ``changes``, or None if none of them show on the calendar."""
         body = {}
         
         date_fields = ['date', 'start_time', 'duration_mins']
@@ -314,16 +274,50 @@ class GoogleCalendarService:
         if body == {}:
             return None 
         
+        return self.events.patch(
+            calendarId='primary',
+            eventId=external_id,
+            body=body,
+            conferenceDataVersion=1,
+            sendUpdates='all' 
+        )
+
+    def delete_request(self, event_id):
+        return self.events.delete(
+            calendarId='primary',
+            eventId=event_id,
+            sendUpdates='all' 
+        )
+
+    def create_event(self, event: Event, attendees_emails, manual_join_url=None):
+        try:
+            return self.insert_request(event, attendees_emails, manual_join_url).execute(http=self.http)
+            
+        except HttpError as e:
+            logger.error(f"Google Calendar Create Error: {e}")
+            raise 
+        
+    def add_attendee_to_event(self, event_id, new_attendee_emails):
+        """
+        event_id: The external_calendar_event_id
+        new_attendee_emails: List of current + new attendee emails
+        """
         try:
-            external_id = event.virtual_meeting.external_calendar_event_id
+            return self.attendees_request(event_id, new_attendee_emails).execute(http=self.http)
             
-            return self.service.events().patch(
-                calendarId='primary',
-                eventId=external_id,
-                body=body,
-                conferenceDataVersion=1,
-                sendUpdates='all' 
-            ).execute()
+        except HttpError as e:
+            logger.error(f"Error patching calendar attendees: {e}")
+            return None
+        
+    def update_event_details(self, event: Event, changes, manual_join_url=None):
+        request = self.update_request(
+            event, changes, event.virtual_meeting.external_calendar_event_id, manual_join_url
+        )
+        if request is None:
+            return None 
+        
+        try:
+            return request.execute(http=self.http)
             
         except HttpError as e:
             logger.error(f"Google Calendar Update Error: {e}")
@@ -334,11 +328,7 @@ class GoogleCalendarService:
         Deletes an event from the user's primary calendar.
         """
         try:
-            self.service.events().delete(
-                calendarId='primary',
-                eventId=event_id,
-                sendUpdates='all' 
-            ).execute()
+            self.delete_request(event_id).execute(http=self.http)
             return True
         
         except HttpError as e:
@@ -348,7 +338,98 @@ class GoogleCalendarService:
             
             logger.error(f"Google Calendar Delete Error: {e}")
             raise
-        
+
+
+class CalendarBatch:
+    """
+    Calendar changes for many events, queued per VirtualMeeting and sent
+    CALENDAR_BATCH_SIZE to a round trip through Google's batch endpoint.
+
+    Items succeed or fail on their own. ``execute`` returns ``(results,
+    errors)``: lists of ``(virtual_meeting, response)`` and
+    ``(virtual_meeting, HttpError)``. Inserted events get their Google id (and
+    Meet link) set on their VirtualMeeting; saving it is up to the caller.
+    Deleting an event Google no longer has counts as a success, as in
+    ``delete_event``.
+    """
+
+    def __init__(self, service: GoogleCalendarService):
+        self.service = service
+        self.queued = []
+
+    def __len__(self):
+        return len(self.queued)
+
+    def create_event(self, virtual_meeting: VirtualMeeting, attendees_emails, manual_join_url=None):
+        self._queue(
+            virtual_meeting,
+            self.service.insert_request(virtual_meeting.event, attendees_emails, manual_join_url),
+        )
+
+    def add_attendee_to_event(self, virtual_meeting: VirtualMeeting, new_attendee_emails):
+        self._queue(
+            virtual_meeting,
+            self.service.attendees_request(virtual_meeting.external_calendar_event_id, new_attendee_emails),
+        )
+
+    def update_event_details(self, virtual_meeting: VirtualMeeting, changes, manual_join_url=None):
+        request = self.service.update_request(
+            virtual_meeting.event, changes, virtual_meeting.external_calendar_event_id, manual_join_url
+        )
+        if request is not None:
+            self._queue(virtual_meeting, request)
+
+    def delete_event(self, virtual_meeting: VirtualMeeting):
+        self._queue(virtual_meeting, self.service.delete_request(virtual_meeting.external_calendar_event_id))
+
+    def _queue(self, virtual_meeting, request):
+        # Inside a batch each request still carries its user's credentials.
+        request.http = self.service.http
+        self.queued.append((virtual_meeting, request))
+
+    def execute(self):
+        queued, self.queued = self.queued, []
+        results = []
+        errors = []
+
+        for start in range(0, len(queued), settings.CALENDAR_BATCH_SIZE):
+            chunk = queued[start:start + settings.CALENDAR_BATCH_SIZE]
+
+            def collect(request_id, response, exception, chunk=chunk):
+                virtual_meeting, request = chunk[int(request_id)]
+                if exception is None or self._already_deleted(request, exception):
+                    self._apply(virtual_meeting, request, response)
+                    results.append((virtual_meeting, response))
+                else:
+                    logger.error(f"Google Calendar batch error for {virtual_meeting}: {exception}")
+                    errors.append((virtual_meeting, exception))
+
+            batch = new_calendar_batch(collect)
+            for index, (_, request) in enumerate(chunk):
+                batch.add(request, request_id=str(index))
+
+            try:
+                batch.execute(http=self.service.http)
+            except HttpError as e:
+                # The whole round trip was rejected, so every item in it failed.
+                logger.error(f"Google Calendar batch request failed: {e}")
+                errors.extend((virtual_meeting, e) for virtual_meeting, _ in chunk)
+
+        return results, errors
+
+    @staticmethod
+    def _already_deleted(request, exception):
+        return request.method == 'DELETE' and isinstance(exception, HttpError) and exception.resp.status == 404
+
+    @staticmethod
+    def _apply(virtual_meeting, request, response):
+        if request.method != 'POST':
+            return
+        virtual_meeting.external_calendar_event_id = response.get('id')
+        if virtual_meeting.platform == VirtualMeeting.Platform.GOOGLE_MEET:
+            virtual_meeting.join_url = response.get('hangoutLink')
+
+
 def get_user_credentials(user: User, redirect_after_auth=None):
     creds_data = user.google_credentials
     google_auth_url = build_google_auth_url(user.sqid, redirect_after_auth)
@@ -0,0 +1,13 @@
+from . import calendar_sync, reservations, ticket_emails
+
+
+def reconcile_ticket_stock_task():
+    return reservations.reconcile()
+
+
+def sync_calendar_attendees_task(event_id):
+    return calendar_sync.sync_attendees(event_id)
+
+
+def send_ticket_email_task(ticket_uid):
+    return ticket_emails.send(ticket_uid)
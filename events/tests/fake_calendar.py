@@ -0,0 +1,99 @@
+"""
+A local stand-in for the Google Calendar v3 API.
+
+``FakeCalendarAPI`` is an httplib2-compatible transport that keeps events in
+memory and records every request, so ``GoogleCalendarService`` can run its
+real googleapiclient request building against it. Batch requests are
+unpacked and each part is handled (and recorded) like a direct call. ``patch_http`` makes the
+service's per-user transport send its requests here instead of the network.
+"""
+
+import email
+import json
+import re
+from http.client import responses
+from unittest.mock import patch
+from urllib.parse import urlsplit
+
+import httplib2
+
+BATCH_PATH = "/batch/calendar/v3"
+BATCH_BOUNDARY = "fake_calendar_batch"
+EVENT_PATH = re.compile(r"/calendar/v3/calendars/(?P<calendar>[^/]+)/events(?:/(?P<event_id>[^/?]+))?$")
+
+
+class FakeCalendarAPI:
+    def __init__(self):
+        self.events = {}
+        self.requests = []
+
+    def add_event(self, event_id, **fields):
+        self.events[event_id] = {"id": event_id, **fields}
+
+    def calls(self, method):
+        return [request for request in self.requests if request["method"] == method]
+
+    def batches(self):
+        return [request for request in self.requests if request["path"] == BATCH_PATH]
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        url = urlsplit(uri)
+        if url.path == BATCH_PATH:
+            self.requests.append({"method": method, "path": url.path, "query": url.query, "body": None})
+            return self._batch(body, headers)
+
+        status, content = self._handle(method, uri, body)
+        response = httplib2.Response({"status": status, "content-type": "application/json"})
+        return response, json.dumps(content).encode() if content is not None else b""
+
+    def _handle(self, method, uri, body):
+        url = urlsplit(uri)
+        payload = json.loads(body) if body else None
+        self.requests.append({"method": method, "path": url.path, "query": url.query, "body": payload})
+
+        match = EVENT_PATH.match(url.path)
+        if not match:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+
+        event_id = match.group("event_id")
+        if method == "POST" and event_id is None:
+            event_id = f"evt{len(self.events) + 1}"
+            self.events[event_id] = {"id": event_id, **payload}
+            return 200, self.events[event_id]
+
+        if event_id not in self.events:
+            return 404, {"error": {"code": 404, "message": "Not Found"}}
+
+        if method == "PATCH":
+            self.events[event_id].update(payload)
+        elif method == "DELETE":
+            del self.events[event_id]
+            return 204, None
+
+        return 200, self.events[event_id]
+
+    def _batch(self, body, headers):
+        batch = email.message_from_string(f"content-type: {headers['content-type']}\r\n\r\n{body}")
+        parts = []
+        for part in batch.get_payload():
+            request_line, _, rest = part.get_payload().partition("\n")
+            method, path, _ = request_line.split(" ")
+            status, content = self._handle(method, path, email.message_from_string(rest).get_payload())
+            parts.append(
+                f"--{BATCH_BOUNDARY}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: <response-{part['Content-ID'][1:]}\r\n\r\n"
+                f"HTTP/1.1 {status} {responses[status]}\r\n"
+                "Content-Type: application/json\r\n\r\n"
+                f"{json.dumps(content) if content is not None else ''}\r\n"
+            )
+
+        response = httplib2.Response(
+            {"status": 200, "content-type": f"multipart/mixed; boundary={BATCH_BOUNDARY}"}
+        )
+        return response, ("".join(parts) + f"--{BATCH_BOUNDARY}--\r\n").encode()
+
+
+def patch_http(api):
+    """Patch ``events.services.authorized_http`` so every Calendar client talks to ``api``."""
+    return patch("events.services.authorized_http", return_value=api)
@@ -0,0 +1,89 @@
+from datetime import date, time
+
+from django.test import override_settings
+from google.oauth2.credentials import Credentials
+
+from events.models import Event, VirtualMeeting
+from events.services import GoogleCalendarService
+from events.tests.fake_calendar import FakeCalendarAPI, patch_http
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+class GoogleCalendarServiceTests(BaseAPITestCase):
+    def setUp(self):
+        self.api = FakeCalendarAPI()
+        self.api.add_event("evt-1", summary="Talk")
+        http_patcher = patch_http(self.api)
+        http_patcher.start()
+        self.addCleanup(http_patcher.stop)
+
+        self.alumnus = self._create_alumnus("alum@test.com")
+        self.event = self._event()
+        self.virtual_meeting = VirtualMeeting.objects.create(
+            event=self.event, platform="meet", join_url="https://meet.test/x", external_calendar_event_id="evt-1"
+        )
+
+    def _event(self):
+        return Event.objects.create(
+            creator=self.alumnus,
+            title="Talk",
+            description="d",
+            category="talk",
+            mode="virtual",
+            date=date(2026, 6, 1),
+            start_time=time(10, 0),
+        )
+
+    def test_clients_share_one_events_resource(self):
+        first = GoogleCalendarService(Credentials(token="a"))
+        second = GoogleCalendarService(Credentials(token="b"))
+
+        self.assertIs(first.events, second.events)
+
+    def test_requests_go_through_the_users_transport(self):
+        service = GoogleCalendarService(Credentials(token="a"))
+
+        service.update_event_details(self.event, {"title": "Renamed"})
+        self.assertTrue(service.delete_event("evt-1"))
+
+        self.assertEqual([request["method"] for request in self.api.requests], ["PATCH", "DELETE"])
+        self.assertEqual(self.api.requests[0]["body"], {"summary": "Renamed"})
+        self.assertNotIn("evt-1", self.api.events)
+
+    @override_settings(CALENDAR_BATCH_SIZE=50)
+    def test_batch_sends_one_round_trip_per_fifty_changes(self):
+        meetings = []
+        for i in range(120):
+            self.api.add_event(f"bulk-{i}", summary="Bulk")
+            meetings.append(VirtualMeeting(event=self.event, platform="jitsi", external_calendar_event_id=f"bulk-{i}"))
+
+        batch = GoogleCalendarService(Credentials(token="a")).batch()
+        for meeting in meetings:
+            batch.delete_event(meeting)
+        results, errors = batch.execute()
+
+        self.assertEqual(len(self.api.batches()), 3)
+        self.assertEqual(len(self.api.calls("DELETE")), 120)
+        self.assertEqual(len(results), 120)
+        self.assertEqual(errors, [])
+        self.assertEqual(list(self.api.events), ["evt-1"])
+
+    def test_batch_maps_each_outcome_to_its_meeting(self):
+        missing = VirtualMeeting(event=self._event(), platform="meet", external_calendar_event_id="gone")
+        new = VirtualMeeting(event=self._event(), platform="meet")
+
+        batch = GoogleCalendarService(Credentials(token="a")).batch()
+        batch.update_event_details(self.virtual_meeting, {"title": "Renamed"})
+        batch.update_event_details(missing, {"title": "Renamed"})
+        batch.create_event(new, ["a@test.com"])
+        batch.delete_event(missing)
+        results, errors = batch.execute()
+
+        self.assertEqual(len(self.api.batches()), 1)
+        self.assertEqual([meeting for meeting, _ in results], [self.virtual_meeting, new, missing])
+        self.assertEqual(len(errors), 1)
+        self.assertIs(errors[0][0], missing)
+        self.assertEqual(errors[0][1].resp.status, 404)
+
+        self.assertEqual(self.api.events["evt-1"]["summary"], "Renamed")
+        self.assertIn(new.external_calendar_event_id, self.api.events)
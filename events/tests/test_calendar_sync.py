@@ -0,0 +1,127 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import override_settings
+from django_q.models import Schedule
+
+from events import calendar_sync
+from events.models import Event, Ticket, TicketPurchase, VirtualMeeting
+from events.services import GoogleAuthRequired
+from events.tests.fake_calendar import FakeCalendarAPI, patch_http
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+@override_settings(CALENDAR_SYNC_DEBOUNCE_SECONDS=60)
+@patch("events.calendar_sync.get_user_credentials")
+@patch("events.views.EventService.send_ticket_email")
+class CalendarSyncTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.alumnus = self._create_alumnus("alum@test.com")
+        self.event = Event.objects.create(
+            creator=self.alumnus,
+            title="Talk",
+            description="d",
+            category="talk",
+            mode="virtual",
+            date="2026-06-01",
+            start_time="10:00:00",
+        )
+        VirtualMeeting.objects.create(
+            event=self.event, platform="meet", join_url="https://meet.test/x", external_calendar_event_id="evt-1"
+        )
+        self.ticket = Ticket.objects.create(event=self.event, name="Free", price=0, type=Ticket.Type.DEFAULT)
+        self.buyers = 0
+
+        self.api = FakeCalendarAPI()
+        self.api.add_event("evt-1", summary="Talk", attendees=[])
+        http_patcher = patch_http(self.api)
+        http_patcher.start()
+        self.addCleanup(http_patcher.stop)
+
+    def _buy(self, count):
+        for _ in range(count):
+            student = self._create_student(email=f"s{self.buyers}@test.com")
+            self.buyers += 1
+            with self.captureOnCommitCallbacks(execute=True):
+                resp = self.client.post(
+                    "/api/events/register", {"ticket": self.ticket.sqid}, format="json", **self._auth_header(student)
+                )
+            self.assertEqual(resp.status_code, 201)
+
+    def _scheduled_syncs(self):
+        return Schedule.objects.filter(func=calendar_sync.SYNC_TASK)
+
+    def test_burst_of_purchases_sends_one_patch_with_the_final_list(self, mock_email, mock_credentials):
+        self._buy(5)
+
+        # One debounced job for the whole burst, and nothing sent yet.
+        self.assertEqual(self._scheduled_syncs().count(), 1)
+        self.assertEqual(self.api.calls("PATCH"), [])
+
+        self.assertTrue(calendar_sync.sync_attendees(self.event.id))
+
+        patches = self.api.calls("PATCH")
+        self.assertEqual(len(patches), 1)
+        self.assertTrue(patches[0]["path"].endswith("/events/evt-1"))
+        self.assertIn("sendUpdates=all", patches[0]["query"])
+        self.assertEqual(
+            [attendee["email"] for attendee in self.api.events["evt-1"]["attendees"]],
+            [f"s{i}@test.com" for i in range(5)] + ["alum@test.com"],
+        )
+
+    def test_unchanged_list_is_not_sent_again(self, mock_email, mock_credentials):
+        self._buy(1)
+        calendar_sync.sync_attendees(self.event.id)
+
+        self.assertFalse(calendar_sync.sync_attendees(self.event.id))
+        self.assertEqual(len(self.api.calls("PATCH")), 1)
+
+    def test_purchases_after_a_sync_schedule_the_next_one(self, mock_email, mock_credentials):
+        self._buy(1)
+        calendar_sync.sync_attendees(self.event.id)
+        self._scheduled_syncs().delete()
+
+        self._buy(1)
+
+        self.assertEqual(self._scheduled_syncs().count(), 1)
+
+    @override_settings(CALENDAR_SYNC_DEBOUNCE_SECONDS=0)
+    def test_window_of_zero_syncs_right_away(self, mock_email, mock_credentials):
+        self._buy(2)
+
+        self.assertEqual(len(self.api.calls("PATCH")), 2)
+        self.assertFalse(self._scheduled_syncs().exists())
+
+    def test_unpaid_checkouts_are_not_attendees(self, mock_email, mock_credentials):
+        TicketPurchase.objects.create(ticket=self.ticket, email="pending@test.com", is_paid=False)
+
+        calendar_sync.sync_attendees(self.event.id)
+
+        self.assertEqual(
+            [attendee["email"] for attendee in self.api.events["evt-1"]["attendees"]], ["alum@test.com"]
+        )
+
+    def test_failed_patch_raises_for_retry_and_the_retry_sends(self, mock_email, mock_credentials):
+        self._buy(1)
+        event = self.api.events.pop("evt-1")
+
+        with self.assertRaises(calendar_sync.CalendarSyncFailed):
+            calendar_sync.sync_attendees(self.event.id)
+
+        # The retry still has the list to send: nothing was recorded as synced.
+        self.api.events["evt-1"] = event
+        self.assertTrue(calendar_sync.sync_attendees(self.event.id))
+        self.assertEqual(
+            [attendee["email"] for attendee in self.api.events["evt-1"]["attendees"]],
+            ["s0@test.com", "alum@test.com"],
+        )
+
+    def test_organizer_without_google_access_raises_for_retry(self, mock_email, mock_credentials):
+        self._buy(1)
+        mock_credentials.side_effect = GoogleAuthRequired("https://auth.test")
+
+        with self.assertRaises(calendar_sync.CalendarSyncFailed):
+            calendar_sync.sync_attendees(self.event.id)
+
+        self.assertEqual(self.api.calls("PATCH"), [])
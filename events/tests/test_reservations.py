@@ -0,0 +1,130 @@
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from uuid import uuid4
+
+import fakeredis
+from django.test import override_settings
+from rest_framework import status
+
+from events import reservations
+from events.models import Event, Ticket, TicketPurchase
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+class TicketFixtureMixin:
+    def setUp(self):
+        self.alumnus = self._create_alumnus("alum@test.com")
+        self.student = self._create_student()
+        self.event = Event.objects.create(
+            creator=self.alumnus,
+            title="Test Event",
+            description="d",
+            category="workshop",
+            mode="physical",
+            date="2026-06-01",
+            start_time="10:00:00",
+        )
+        self.ticket = Ticket.objects.create(
+            event=self.event, name="Free", price=0, quantity=2, type=Ticket.Type.DEFAULT
+        )
+
+
+@patch("events.views.EventService.send_ticket_email")
+class TicketPurchaseReservationTests(TicketFixtureMixin, BaseAPITestCase):
+    def _buy(self):
+        return self.client.post(
+            "/api/events/register",
+            {"ticket": self.ticket.sqid},
+            format="json",
+            **self._auth_header(self.student),
+        )
+
+    def test_free_sales_are_recorded_after_commit(self, mock_email):
+        with self.captureOnCommitCallbacks(execute=True):
+            resp = self._buy()
+
+        self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.quantity_sold, 1)
+
+    @patch("events.views.reservations.reserve", return_value=False)
+    def test_sold_out_reservation_rejects_the_purchase(self, mock_reserve, mock_email):
+        resp = self._buy()
+
+        self.assertEqual(resp.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(TicketPurchase.objects.exists())
+
+    @patch("events.views.reservations.release")
+    @patch("events.views.TicketPurchase.objects.create", side_effect=RuntimeError("db down"))
+    def test_failed_purchase_releases_its_seat(self, mock_create, mock_release, mock_email):
+        self.client.raise_request_exception = False
+        self._buy()
+
+        mock_release.assert_called_once()
+        self.assertEqual(mock_release.call_args.args[0], self.ticket)
+
+    def test_without_redis_availability_comes_from_quantity_sold(self, mock_email):
+        Ticket.objects.filter(id=self.ticket.id).update(quantity_sold=2)
+
+        self.assertFalse(reservations.reserve(self.ticket, uuid4()))
+
+
+@override_settings(TICKET_RESERVATION_TTL_SECONDS=60)
+class RedisReservationTests(TicketFixtureMixin, BaseAPITestCase):
+    def setUp(self):
+        super().setUp()
+        # fakeredis runs the Lua scripts (through lupa) one at a time per
+        # server, like Redis, so clients sharing a server see atomic scripts.
+        self.server = fakeredis.FakeServer()
+        self.redis = fakeredis.FakeRedis(server=self.server)
+
+    def _stock(self):
+        return int(self.redis.get(reservations.STOCK_KEY.format(ticket_id=self.ticket.id)))
+
+    def test_concurrent_buyers_never_oversell(self):
+        Ticket.objects.filter(id=self.ticket.id).update(quantity=50)
+        self.ticket.refresh_from_db()
+        reservations.seed(self.ticket, self.redis)
+
+        def buy(_):
+            # One client per thread, like separate web workers.
+            return reservations.reserve(self.ticket, uuid4(), client=fakeredis.FakeRedis(server=self.server))
+
+        with ThreadPoolExecutor(max_workers=32) as pool:
+            results = list(pool.map(buy, range(400)))
+
+        self.assertEqual(results.count(True), 50)
+        self.assertEqual(self._stock(), 0)
+
+    def test_released_and_expired_holds_go_back_on_sale(self):
+        first, second = uuid4(), uuid4()
+        self.assertTrue(reservations.reserve(self.ticket, first, client=self.redis))
+        self.assertTrue(reservations.reserve(self.ticket, second, client=self.redis))
+        self.assertFalse(reservations.reserve(self.ticket, uuid4(), client=self.redis))
+
+        reservations.release(self.ticket, first, client=self.redis)
+        self.assertTrue(reservations.reserve(self.ticket, uuid4(), client=self.redis))
+
+        # Expire the second hold: the next buyer gets its seat.
+        self.redis.zadd(reservations.HOLDS_KEY.format(ticket_id=self.ticket.id), {reservations.hold_id(second): 0})
+        self.assertTrue(reservations.reserve(self.ticket, uuid4(), client=self.redis))
+        self.assertEqual(self._stock(), 0)
+
+    def test_seed_counts_sales_and_pending_checkouts(self):
+        TicketPurchase.objects.create(ticket=self.ticket, email="a@test.com", is_paid=True)
+        TicketPurchase.objects.create(ticket=self.ticket, email="b@test.com", is_paid=False)
+
+        self.assertFalse(reservations.reserve(self.ticket, uuid4(), client=self.redis))
+        self.assertEqual(self._stock(), 0)
+
+    def test_reconcile_corrects_drift(self):
+        reservations.seed(self.ticket, self.redis)
+        self.redis.set(reservations.STOCK_KEY.format(ticket_id=self.ticket.id), 9)
+        TicketPurchase.objects.create(ticket=self.ticket, email="a@test.com", is_paid=True)
+
+        stats = reservations.reconcile(client=self.redis)
+
+        self.assertEqual(stats, {"checked": 1, "corrected": 1, "counters_fixed": 1})
+        self.assertEqual(self._stock(), 1)
+        self.ticket.refresh_from_db()
+        self.assertEqual(self.ticket.quantity_sold, 1)
@@ -0,0 +1,101 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.conf import settings
+from django.utils import timezone
+from rest_framework import status
+
+from events import ticket_emails
+from events.models import Event, Ticket, TicketPurchase
+from futaverse.tests_helpers import BaseAPITestCase
+from futaverse.utils.email_service import BrevoEmailError
+from payments.webhookshandler import handle_charge_success
+
+
+@patch("events.ticket_emails.EventService.send_ticket_email")
+class TicketEmailTests(BaseAPITestCase):
+    def setUp(self):
+        self.student = self._create_student()
+        self.event = Event.objects.create(
+            creator=self._create_alumnus("alum@test.com"),
+            title="Test Event",
+            description="d",
+            category="workshop",
+            mode="physical",
+            date="2026-06-01",
+            start_time="10:00:00",
+        )
+        self.ticket = Ticket.objects.create(event=self.event, name="Free", price=0, type=Ticket.Type.DEFAULT)
+
+    def _purchase(self, **kwargs):
+        return TicketPurchase.objects.create(ticket=self.ticket, email="student@test.com", **kwargs)
+
+    def test_registration_sends_the_email_only_after_commit(self, mock_send):
+        with self.captureOnCommitCallbacks() as callbacks:
+            resp = self.client.post(
+                "/api/events/register", {"ticket": self.ticket.sqid}, format="json", **self._auth_header(self.student)
+            )
+            self.assertEqual(resp.status_code, status.HTTP_201_CREATED)
+            mock_send.assert_not_called()
+
+        for callback in callbacks:
+            callback()
+
+        mock_send.assert_called_once()
+        purchase = TicketPurchase.objects.get()
+        self.assertEqual(mock_send.call_args.args[0], purchase)
+        self.assertIsNotNone(purchase.confirmation_sent_at)
+
+    def test_a_repeated_task_does_not_send_twice(self, mock_send):
+        purchase = self._purchase(is_paid=True)
+
+        self.assertTrue(ticket_emails.send(purchase.ticket_uid))
+        self.assertFalse(ticket_emails.send(purchase.ticket_uid))
+
+        mock_send.assert_called_once()
+
+    def test_failed_send_is_released_for_retry(self, mock_send):
+        purchase = self._purchase(is_paid=True)
+        mock_send.side_effect = BrevoEmailError("down")
+
+        with self.assertRaises(BrevoEmailError):
+            ticket_emails.send(purchase.ticket_uid)
+        purchase.refresh_from_db()
+        self.assertIsNone(purchase.confirmation_claimed_at)
+        self.assertIsNone(purchase.confirmation_sent_at)
+
+        mock_send.side_effect = None
+        self.assertTrue(ticket_emails.send(purchase.ticket_uid))
+
+    def test_claim_from_a_killed_worker_is_taken_again_after_the_timeout(self, mock_send):
+        timeout = timedelta(seconds=settings.TICKET_EMAIL_CLAIM_TIMEOUT_SECONDS)
+        purchase = self._purchase(is_paid=True, confirmation_claimed_at=timezone.now() - timeout / 2)
+
+        self.assertFalse(ticket_emails.send(purchase.ticket_uid))
+        mock_send.assert_not_called()
+
+        TicketPurchase.objects.filter(pk=purchase.pk).update(confirmation_claimed_at=timezone.now() - timeout * 2)
+        self.assertTrue(ticket_emails.send(purchase.ticket_uid))
+        mock_send.assert_called_once()
+
+    def test_sent_emails_are_not_resent_after_the_timeout(self, mock_send):
+        long_ago = timezone.now() - timedelta(days=1)
+        purchase = self._purchase(is_paid=True, confirmation_claimed_at=long_ago, confirmation_sent_at=long_ago)
+
+        self.assertFalse(ticket_emails.send(purchase.ticket_uid))
+        mock_send.assert_not_called()
+
+    def test_unpaid_purchases_are_not_emailed(self, mock_send):
+        purchase = self._purchase(is_paid=False)
+
+        self.assertFalse(ticket_emails.send(purchase.ticket_uid))
+        mock_send.assert_not_called()
+
+    def test_paystack_webhook_queues_the_email(self, mock_send):
+        purchase = self._purchase(is_paid=False)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            handle_charge_success({"reference": purchase.ticket_uid.hex})
+            mock_send.assert_not_called()
+
+        mock_send.assert_called_once()
@@ -0,0 +1,62 @@
+"""
+Ticket confirmation emails, sent from a django-q task after the purchase commits.
+
+``queue`` dispatches the task on commit, so registration and the Paystack
+webhook never wait on Brevo. The task claims the purchase by stamping
+``confirmation_claimed_at`` in one conditional UPDATE keyed on ticket_uid, so a
+duplicated or redelivered task sends nothing twice, and stamps
+``confirmation_sent_at`` once Brevo accepts the email. If the send fails the
+claim is released and the task raises; django-q leaves it unacknowledged and
+retries it (Q_CLUSTER retry / max_attempts). A claim older than
+TICKET_EMAIL_CLAIM_TIMEOUT_SECONDS belongs to a worker that was killed
+mid-send and can be taken again.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from .models import TicketPurchase
+from .services import EventService
+
+logger = logging.getLogger(__name__)
+
+SEND_TASK = "events.tasks.send_ticket_email_task"
+
+
+def queue(ticket_uid):
+    """Send the purchase's confirmation email after the current transaction commits."""
+    transaction.on_commit(lambda: async_task(SEND_TASK, str(ticket_uid)))
+
+
+def send(ticket_uid):
+    """Email the ticket unless it has been already; returns True if this call sent it."""
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.TICKET_EMAIL_CLAIM_TIMEOUT_SECONDS)
+    pending = TicketPurchase.objects.filter(
+        Q(confirmation_claimed_at__isnull=True) | Q(confirmation_claimed_at__lt=stale),
+        ticket_uid=ticket_uid,
+        is_paid=True,
+        confirmation_sent_at__isnull=True,
+    )
+    if not pending.update(confirmation_claimed_at=now):
+        return False
+
+    ticket_purchase = TicketPurchase.objects.select_related(
+        "user", "ticket__event__virtual_meeting"
+    ).get(ticket_uid=ticket_uid)
+
+    try:
+        EventService.send_ticket_email(ticket_purchase)
+    except Exception:
+        logger.warning("Ticket email for %s failed, releasing it for retry", ticket_uid)
+        TicketPurchase.objects.filter(ticket_uid=ticket_uid).update(confirmation_claimed_at=None)
+        raise
+
+    TicketPurchase.objects.filter(ticket_uid=ticket_uid).update(confirmation_sent_at=timezone.now())
+    return True
@@ -3,11 +3,10 @@ import uuid
 
 from django.core.cache import cache
 from django.db import transaction
-from django.db.models import F
 from django_q.tasks import async_task
 from drf_spectacular.utils import extend_schema
 from rest_framework import generics, status
-from rest_framework.exceptions import PermissionDenied
+from rest_framework.exceptions import PermissionDenied, ValidationError
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
@@ -17,6 +16,7 @@ from futaverse.utils.email_service import BrevoEmailService
 from payments.models import Subaccount
 from payments.requests import initialize_transaction
 
+from . import calendar_sync, reservations, ticket_emails
 from .models import Event, Ticket, TicketPurchase, VirtualMeeting
 from .serializers import (
     CreateTicketSerializer,
@@ -110,21 +110,31 @@ class CreateTicketPurchaseView(generics.CreateAPIView):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-    @transaction.atomic
     def perform_create(self, serializer):
+        ticket: Ticket = serializer.validated_data.get("ticket")
+        ticket_uid = uuid.uuid4().hex
+
+        # The seat is held before anything is written; see events.reservations.
+        if not reservations.reserve(ticket, ticket_uid):
+            raise ValidationError({"ticket": "Ticket is sold out"})
+
+        try:
+            return self.create_purchase(serializer, ticket, ticket_uid)
+        except Exception:
+            reservations.release(ticket, ticket_uid)
+            raise
+
+    @transaction.atomic
+    def create_purchase(self, serializer, ticket, ticket_uid):
         # Purchases can optionally be made by an unauthenticated guest via email only.
         # Currently all purchases require an authenticated user.
 
         user = self.request.user
-        validated_data = serializer.validated_data
-        ticket: Ticket = validated_data.get("ticket")
         event = ticket.event
 
-        ticket_uid = uuid.uuid4().hex
-
         is_free = ticket.sales_price == 0 or ticket.type == Ticket.Type.DEFAULT
 
-        ticket_purchase = TicketPurchase.objects.create(
+        TicketPurchase.objects.create(
             user=user,
             ticket=ticket,
             is_paid=is_free,
@@ -132,17 +142,14 @@ class CreateTicketPurchaseView(generics.CreateAPIView):
             email=user.email,
         )
 
-        event_service = EventService(event)
-
         if is_free:
-            Ticket.objects.filter(id=ticket.id).update(
-                quantity_sold=F("quantity_sold") + 1
-            )
+            # Everything after the INSERT runs once the purchase has committed.
+            transaction.on_commit(lambda: reservations.confirm(ticket, ticket_uid))
 
             if event.mode in [Event.Mode.VIRTUAL, Event.Mode.HYBRID]:
-                event_service.sync_to_calendar()
+                calendar_sync.mark_dirty(event.id)
 
-            event_service.send_ticket_email(ticket_purchase)
+            ticket_emails.queue(ticket_uid)
 
             return None
 
@@ -0,0 +1,61 @@
+"""
+Page-level diversity re-ranking.
+
+FeedCursorPagination hands over a window of candidates (a few times the page
+size) in ranking order. ``diversify`` makes one greedy pass over it, taking
+candidates while their event type and author are under the per-page caps and
+deferring the rest. If the window runs out before the page is full, deferred
+candidates fill the remaining slots in ranking order, so a homogeneous feed
+still returns full pages. Cost is linear in the window size.
+"""
+
+from collections import Counter
+
+
+def author_of(event):
+    # Rows from feed.rendering.as_rows carry the author pre-extracted.
+    if hasattr(event, "author"):
+        return event.author
+
+    data = event.data or {}
+    author = data.get("author") or data.get("alumni")
+
+    if isinstance(author, dict):
+        return author.get("sqid")
+
+    return None
+
+
+def diversify(candidates, page_size, max_per_type, max_per_author, skip=None):
+    """
+    Return up to ``page_size`` candidates for the page. ``skip`` marks candidates
+    that must not be shown (suppressed or already shown on an earlier page).
+    """
+    page = []
+    deferred = []
+    type_counts = Counter()
+    author_counts = Counter()
+
+    for candidate in candidates:
+        if len(page) == page_size:
+            break
+
+        if skip is not None and skip(candidate):
+            continue
+
+        author = author_of(candidate)
+        if type_counts[candidate.event_type] >= max_per_type or (
+            author is not None and author_counts[author] >= max_per_author
+        ):
+            deferred.append(candidate)
+            continue
+
+        page.append(candidate)
+        type_counts[candidate.event_type] += 1
+        if author is not None:
+            author_counts[author] += 1
+
+    # Not enough variety in the window: relax the caps in ranking order.
+    page.extend(deferred[: page_size - len(page)])
+
+    return page
@@ -0,0 +1,157 @@
+"""
+Buffered impression ingestion.
+
+Feed requests append ``user_id:event_id`` entries to a Redis list; the scheduled
+``flush_impressions_task`` drains it in large batches, dedupes in memory and
+writes each batch with a single ``bulk_create(ignore_conflicts=True)``. This keeps
+impression volume to one Q task per minute instead of one per feed page.
+
+Each batch is moved atomically onto a processing list and only deleted from
+there once it has been written, so a worker that dies mid-batch loses nothing:
+the next run writes the leftover batch first. Rewriting it is harmless since
+duplicate impressions are ignored.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.utils import timezone
+from django_q.tasks import async_task
+from redis.exceptions import RedisError
+
+from core.models import User
+from futaverse.utils.redis_client import get_redis
+
+from .models import FeedEvent, FeedImpression
+
+logger = logging.getLogger(__name__)
+
+# Moves up to ARGV[1] entries from the head of the buffer onto the processing
+# list (pushed in slices to stay under Lua's unpack limit) and returns them.
+TAKE_SCRIPT = """
+local entries = redis.call('LRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1)
+for i = 1, #entries, 1000 do
+    redis.call('RPUSH', KEYS[2], unpack(entries, i, math.min(i + 999, #entries)))
+end
+redis.call('LTRIM', KEYS[1], #entries, -1)
+return entries
+"""
+
+BUFFER_KEY = "feed:impressions:buffer"
+PROCESSING_KEY = "feed:impressions:processing"
+STATS_KEY = "feed:impressions:stats"
+
+
+def buffer_impressions(user_id, event_ids):
+    if not event_ids:
+        return
+
+    client = get_redis()
+    if client is not None:
+        try:
+            client.rpush(BUFFER_KEY, *[f"{user_id}:{event_id}" for event_id in event_ids])
+            return
+        except RedisError as e:
+            logger.warning("Impression buffer unavailable, writing through: %s", e)
+
+    async_task("feed.tasks.record_impressions_task", user_id, list(event_ids))
+
+
+def _take_batch(client, size):
+    # A batch left by a run that died before writing it goes first.
+    entries = client.lrange(PROCESSING_KEY, 0, -1)
+    if entries:
+        return entries
+
+    return client.register_script(TAKE_SCRIPT)(keys=[BUFFER_KEY, PROCESSING_KEY], args=[size])
+
+
+def _parse(entries):
+    pairs = set()
+
+    for entry in entries:
+        try:
+            user_id, event_id = entry.decode().split(":")
+            pairs.add((int(user_id), int(event_id)))
+        except ValueError:
+            logger.warning("Dropping malformed impression entry %r", entry)
+
+    return pairs
+
+
+def flush_impressions():
+    """
+    Drain up to FEED_IMPRESSION_FLUSH_MAX_BATCHES batches and return run stats.
+    A batch that fails to write stays on the processing list for the next run.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    started = time.perf_counter()
+    written = 0
+    batches = 0
+
+    while batches < settings.FEED_IMPRESSION_FLUSH_MAX_BATCHES:
+        entries = _take_batch(client, settings.FEED_IMPRESSION_FLUSH_BATCH)
+        if not entries:
+            break
+
+        pairs = _parse(entries)
+
+        # Drop pairs whose user or event is gone so one bad row can't fail the batch.
+        user_ids = set(User.objects.filter(id__in={u for u, _ in pairs}).values_list("id", flat=True))
+        event_ids = set(
+            FeedEvent.all_objects.filter(id__in={e for _, e in pairs}).values_list("id", flat=True)
+        )
+        pairs = {(u, e) for u, e in pairs if u in user_ids and e in event_ids}
+
+        try:
+            FeedImpression.objects.bulk_create(
+                [FeedImpression(user_id=user_id, event_id=event_id) for user_id, event_id in pairs],
+                ignore_conflicts=True,
+            )
+        except Exception:
+            logger.exception("Impression flush failed; %s entries kept for the next run", len(entries))
+            break
+
+        client.delete(PROCESSING_KEY)
+        written += len(pairs)
+        batches += 1
+
+    stats = {
+        "flushed_at": timezone.now().isoformat(),
+        "flush_ms": round((time.perf_counter() - started) * 1000, 2),
+        "written": written,
+        "batches": batches,
+        "backlog": client.llen(BUFFER_KEY) + client.llen(PROCESSING_KEY),
+    }
+    client.hset(STATS_KEY, mapping=stats)
+
+    logger.info(
+        "flush_impressions: wrote=%s batches=%s flush_ms=%s backlog=%s",
+        stats["written"],
+        stats["batches"],
+        stats["flush_ms"],
+        stats["backlog"],
+    )
+    return stats
+
+
+def impression_metrics():
+    """Current backlog depth plus the stats of the last flush run."""
+    client = get_redis()
+    if client is None:
+        return None
+
+    pipe = client.pipeline(transaction=False)
+    pipe.llen(BUFFER_KEY)
+    pipe.llen(PROCESSING_KEY)
+    pipe.hgetall(STATS_KEY)
+    backlog, processing, last_flush = pipe.execute()
+
+    return {
+        "backlog": backlog + processing,
+        "last_flush": {key.decode(): value.decode() for key, value in last_flush.items()},
+    }
@@ -0,0 +1,56 @@
+"""
+Management command: backfill_feed_tokens
+
+Copies existing FeedTarget rows into FeedEvent.target_tokens so personalized
+ranking can run with FEED_TARGET_STORAGE = "tokens". Safe to re-run: every
+event's tokens are rewritten from its current FeedTarget rows.
+Run: python manage.py backfill_feed_tokens [--chunk-size N]
+
+Options:
+  --chunk-size N   Events per bulk UPDATE (default 1000)
+"""
+
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from feed.models import FeedEvent, FeedTarget, target_token
+
+
+class Command(BaseCommand):
+    help = "Backfill FeedEvent.target_tokens from FeedTarget rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000, help="Events per bulk UPDATE")
+
+    def handle(self, *args, **options):
+        chunk_size = options["chunk_size"]
+        last_id = 0
+        updated = 0
+
+        while True:
+            events = list(
+                FeedEvent.all_objects.filter(id__gt=last_id).order_by("id").only("id")[:chunk_size]
+            )
+            if not events:
+                break
+
+            tokens = defaultdict(list)
+            targets = FeedTarget.objects.filter(event__in=events).order_by("id")
+            for event_id, target_type, target_value in targets.values_list(
+                "event_id", "target_type", "target_value"
+            ):
+                tokens[event_id].append(target_token(target_type, target_value))
+
+            for event in events:
+                event.target_tokens = tokens[event.id]
+
+            with transaction.atomic():
+                FeedEvent.all_objects.bulk_update(events, ["target_tokens"])
+
+            updated += len(events)
+            last_id = events[-1].id
+            self.stdout.write(f"  backfilled {updated} events")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled target tokens for {updated} feed events"))
@@ -0,0 +1,176 @@
+"""
+Management command: benchmark_feed
+
+Times FeedView end to end (query, serialization, rendering) against the data
+already in the database. Seed it first with ``python manage.py seed_data``.
+Run: python manage.py benchmark_feed [--users N] [--pages N] [--ranking score personalized]
+                                    [--storage table tokens] [--diversity on off]
+                                    [--render serializer prerendered]
+
+Personalized ranking is measured once per ``--storage`` layout so the FeedTarget
+join and the target_tokens overlap can be compared on the same data; run
+``backfill_feed_tokens`` first. Every mode is measured with the diversity
+re-ranker on and off to show its cost against plain DB ordering, and with
+FeedEventSerializer vs pre-rendered payloads (run ``render_feed_payloads`` first).
+
+Every variant sees the same feed: seen suppression is off, impressions are not
+recorded (no seen-filter writes, no FeedImpression rows feeding live scores),
+and the whole run is rolled back.
+"""
+
+import json
+import random
+import statistics
+import time
+from unittest.mock import patch
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import User
+from feed.models import FeedEvent
+from feed.services import FeedRanking, FeedTargetStorage
+from feed.views import FeedView
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark feed page latency for seeded users"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20, help="Number of users to sample")
+        parser.add_argument("--pages", type=int, default=3, help="Pages to follow per user")
+        parser.add_argument(
+            "--ranking",
+            nargs="+",
+            choices=FeedRanking.choices,
+            default=list(FeedRanking.choices),
+            help="Ranking modes to compare",
+        )
+        parser.add_argument(
+            "--storage",
+            nargs="+",
+            choices=FeedTargetStorage.choices,
+            default=list(FeedTargetStorage.choices),
+            help="Target storage layouts to compare for personalized ranking",
+        )
+        parser.add_argument(
+            "--diversity",
+            nargs="+",
+            choices=["on", "off"],
+            default=["on", "off"],
+            help="Run with the diversity re-ranker enabled and/or disabled",
+        )
+        parser.add_argument(
+            "--render",
+            nargs="+",
+            choices=["serializer", "prerendered"],
+            default=["serializer", "prerendered"],
+            help="Serialize items with FeedEventSerializer and/or pre-rendered payloads",
+        )
+
+    def handle(self, *args, **options):
+        total_events = FeedEvent.objects.count()
+        if not total_events:
+            self.stdout.write(self.style.ERROR("No feed events found. Run `python manage.py seed_data` first."))
+            return
+
+        users = list(
+            User.objects.filter(role__in=[User.Role.STUDENT, User.Role.ALUMNI])
+            .select_related("student_profile", "alumni_profile")
+            .order_by("?")[: options["users"]]
+        )
+        if not users:
+            self.stdout.write(self.style.ERROR("No student or alumni users found."))
+            return
+
+        self.stdout.write(
+            f"Benchmarking {len(users)} users x {options['pages']} pages over {total_events} feed events"
+        )
+
+        try:
+            with transaction.atomic(), patch.object(FeedView, "record_impressions"):
+                for ranking in options["ranking"]:
+                    self.run_ranking(ranking, users, options)
+
+                raise Rollback
+        except Rollback:
+            pass
+
+    def run_ranking(self, ranking, users, options):
+        storages = options["storage"] if ranking == FeedRanking.PERSONALIZED else [None]
+
+        variants = [
+            (storage, diversity, render)
+            for storage in storages
+            for diversity in options["diversity"]
+            for render in options["render"]
+        ]
+
+        for storage, diversity, render in variants:
+            overrides = {
+                # Timeout 0 turns the window cache off, so every request reads the feed.
+                "FEED_PAGE_CACHE_TTL": 0,
+                "FEED_SUPPRESS_SEEN": False,
+                "FEED_DIVERSITY_ENABLED": diversity == "on",
+                "FEED_PRERENDERED_PAYLOADS": render == "prerendered",
+            }
+            if storage is not None:
+                overrides["FEED_TARGET_STORAGE"] = storage
+
+            with override_settings(**overrides):
+                timings, query_counts = self.run_mode(users, ranking, options["pages"])
+
+            label = "/".join(filter(None, [ranking, storage, f"diversity-{diversity}", render]))
+            self.report(label, timings, query_counts)
+
+    def run_mode(self, users, ranking, pages):
+        factory = APIRequestFactory(SERVER_NAME="localhost")
+        view = FeedView.as_view()
+        timings = []
+        query_counts = []
+
+        random.shuffle(users)
+
+        for user in users:
+            url = f"/api/feed?ranking={ranking}"
+
+            for _ in range(pages):
+                request = factory.get(url)
+                force_authenticate(request, user=user)
+
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = view(request)
+                    if hasattr(response, "render"):
+                        response.render()
+                    timings.append((time.perf_counter() - started) * 1000)
+
+                query_counts.append(len(queries))
+
+                url = json.loads(response.content).get("next")
+                if not url:
+                    break
+
+        return timings, query_counts
+
+    def report(self, label, timings, query_counts):
+        if len(timings) > 1:
+            p95 = statistics.quantiles(timings, n=20)[-1]
+        else:
+            p95 = timings[0]
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  {label:<48} requests={len(timings):<4} "
+                f"mean={statistics.mean(timings):.2f}ms "
+                f"p50={statistics.median(timings):.2f}ms "
+                f"p95={p95:.2f}ms "
+                f"queries/request={statistics.mean(query_counts):.1f}"
+            )
+        )
@@ -0,0 +1,43 @@
+"""
+Management command: feed_impressions
+
+Shows the impression buffer backlog and the last flush stats.
+Run: python manage.py feed_impressions [--flush]
+
+Options:
+  --flush    Drain the buffer now instead of waiting for the scheduled task
+"""
+
+from django.core.management.base import BaseCommand
+
+from feed.impressions import flush_impressions, impression_metrics
+
+
+class Command(BaseCommand):
+    help = "Report (and optionally flush) the buffered feed impressions"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--flush", action="store_true", help="Flush the buffer now")
+
+    def handle(self, *args, **options):
+        if options["flush"]:
+            stats = flush_impressions()
+            if stats is None:
+                self.stdout.write(self.style.ERROR("Redis is not configured as the default cache."))
+                return
+
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Flushed {stats['written']} impressions in {stats['batches']} batches "
+                    f"({stats['flush_ms']}ms)"
+                )
+            )
+
+        metrics = impression_metrics()
+        if metrics is None:
+            self.stdout.write(self.style.ERROR("Redis is not configured as the default cache."))
+            return
+
+        self.stdout.write(f"Backlog: {metrics['backlog']}")
+        for key, value in sorted(metrics["last_flush"].items()):
+            self.stdout.write(f"  last {key}: {value}")
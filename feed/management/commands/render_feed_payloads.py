@@ -0,0 +1,52 @@
+"""
+Management command: render_feed_payloads
+
+Stores the pre-rendered JSON item (FeedEvent.rendered) for events created
+before payloads were written at creation time. Needed before turning on
+FEED_PRERENDERED_PAYLOADS; pages still render missing payloads on the fly.
+Run: python manage.py render_feed_payloads [--chunk-size N] [--all]
+
+Options:
+  --chunk-size N   Events per bulk UPDATE (default 500)
+  --all            Re-render every event, not only those without a payload
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from feed.models import FeedEvent
+from feed.rendering import render_event
+
+
+class Command(BaseCommand):
+    help = "Backfill pre-rendered feed item payloads"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=500, help="Events per bulk UPDATE")
+        parser.add_argument("--all", action="store_true", help="Re-render every event")
+
+    def handle(self, *args, **options):
+        events = FeedEvent.all_objects.order_by("id")
+        if not options["all"]:
+            events = events.filter(rendered="")
+
+        chunk_size = options["chunk_size"]
+        last_id = 0
+        rendered = 0
+
+        while True:
+            chunk = list(events.filter(id__gt=last_id)[:chunk_size])
+            if not chunk:
+                break
+
+            for event in chunk:
+                event.rendered = render_event(event)
+
+            with transaction.atomic():
+                FeedEvent.all_objects.bulk_update(chunk, ["rendered"])
+
+            rendered += len(chunk)
+            last_id = chunk[-1].id
+            self.stdout.write(f"  rendered {rendered} events")
+
+        self.stdout.write(self.style.SUCCESS(f"Rendered payloads for {rendered} feed events"))
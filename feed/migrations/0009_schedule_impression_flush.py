@@ -0,0 +1,17 @@
+# Registers the periodic django-q schedule that drains the Redis impression
+# buffer (see feed.impressions). One schedule means one flusher at a time.
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feed", "0008_fix_shuffle_seed"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("flush_feed_impressions", "feed.tasks.flush_impressions_task", minutes=1),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:02
+# Adds FeedEvent.target_tokens plus a GIN index for the jsonb ?| overlap lookup.
+# The index is created with raw SQL on PostgreSQL only so the sqlite test
+# database (and its table rebuilds) never sees a USING gin clause.
+
+from django.db import migrations
+
+import feed.models
+
+
+def create_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(
+        "CREATE INDEX IF NOT EXISTS feed_feedevent_target_tokens_gin "
+        "ON feed_feedevent USING gin (target_tokens)"
+    )
+
+
+def drop_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("DROP INDEX IF EXISTS feed_feedevent_target_tokens_gin")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0009_schedule_impression_flush'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedevent',
+            name='target_tokens',
+            field=feed.models.TokenListField(blank=True, default=list),
+        ),
+        migrations.RunPython(create_gin_index, drop_gin_index),
+    ]
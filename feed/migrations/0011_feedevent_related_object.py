@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0010_feedevent_target_tokens'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedevent',
+            name='related_model',
+            field=models.CharField(blank=True, default='', max_length=50),
+        ),
+        migrations.AddField(
+            model_name='feedevent',
+            name='related_object_id',
+            field=models.PositiveBigIntegerField(blank=True, null=True),
+        ),
+    ]
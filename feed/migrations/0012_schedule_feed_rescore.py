@@ -0,0 +1,17 @@
+# Registers the periodic django-q schedule that recomputes time-decayed scores
+# for events inside the scoring window (see feed.scoring).
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("feed", "0011_feedevent_related_object"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("rescore_feed_events", "feed.tasks.rescore_feed_events_task", minutes=15),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-17 23:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feed', '0012_schedule_feed_rescore'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='feedevent',
+            name='rendered',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
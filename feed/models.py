@@ -1,9 +1,51 @@
 import random
 
 from django.db import models
+from django.db.models import Func, IntegerField
 
 from core.models import User
 from futaverse.models import BaseModel
+from futaverse.utils.lookups import TokenOverlap
+
+
+class TokenListField(models.JSONField):
+    """
+    JSON list of ``"target_type:target_value"`` strings. Supports the ``overlap``
+    lookup, which on Postgres is the jsonb ``?|`` operator served by the GIN
+    index created in migration 0010.
+    """
+
+
+TokenListField.register_lookup(TokenOverlap)
+
+
+class TokenMatchCount(Func):
+    """Number of ``tokens`` present in a TokenListField, computed per row without joins."""
+
+    output_field = IntegerField()
+
+    def __init__(self, expression, tokens):
+        super().__init__(expression)
+        self.tokens = list(tokens)
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        return (
+            f"(SELECT COUNT(*) FROM jsonb_array_elements_text({lhs}) AS token WHERE token = ANY(%s))",
+            [*params, self.tokens],
+        )
+
+    def as_sql(self, compiler, connection, **extra_context):
+        lhs, params = compiler.compile(self.source_expressions[0])
+        placeholders = ", ".join(["%s"] * len(self.tokens))
+        return (
+            f"(SELECT COUNT(*) FROM json_each({lhs}) WHERE json_each.value IN ({placeholders}))",
+            [*params, *self.tokens],
+        )
+
+
+def target_token(target_type, target_value):
+    return f"{target_type}:{target_value}"
 
 
 class FeedEvent(BaseModel):
@@ -30,13 +72,19 @@ class FeedEvent(BaseModel):
     data = models.JSONField(default=dict)
     is_active = models.BooleanField(default=True)
     score = models.IntegerField(default=0)
-    # TEMPORARY STOPGAP: shuffle_seed is a one-time random float [0,1) assigned at creation.
-    # It acts as a tiebreaker within the same score bucket to prevent event-type
-    # clustering. This is NOT dynamic randomization — the order is fixed after creation.
-    # When a proper content-diversity/ranking algorithm is implemented (e.g. ML-based
-    # relevance, engagement-weighted scoring, or category-level capping), remove this
-    # field, restore the index to ["-score", "-created_at"], and simplify the sort.
+    # shuffle_seed is a one-time random float [0,1) assigned at creation, used as the
+    # tiebreaker within a score bucket. Content diversity is handled per page by
+    # feed.diversity; the seed stays because cursors and the Redis timelines
+    # (feed.timelines.timeline_score) need a stable total order.
     shuffle_seed = models.FloatField(null=True, blank=True)
+    # Denormalized copy of this event's FeedTarget rows, read when
+    # FEED_TARGET_STORAGE = "tokens". Backfill with `manage.py backfill_feed_tokens`.
+    target_tokens = TokenListField(default=list, blank=True)
+    # Source object, kept so feed.scoring can count its applications/purchases.
+    related_model = models.CharField(max_length=50, blank=True, default="")
+    related_object_id = models.PositiveBigIntegerField(null=True, blank=True)
+    # FeedEventSerializer output without score, as JSON text (see feed.rendering).
+    rendered = models.TextField(blank=True, default="")
 
     class Meta:
         indexes = [
@@ -0,0 +1,62 @@
+"""
+Feed candidate windows shared by every viewer in an audience.
+
+Score-ranked candidates don't depend on who is asking, so the windows
+FeedCursorPagination reads (``fetch(offset, position, limit)``) are cached per
+role: the events themselves, or the pre-rendered rows with their payloads.
+Seen suppression, diversity re-ranking and the cursor carry are applied to the
+cached window per viewer, in memory, so a warm page needs no Postgres or
+timeline reads whatever the viewer has already seen.
+
+Keys embed the role's generation counter, which ``create_feed_event_task``
+bumps: a new event moves readers to fresh keys and the old windows simply
+expire, with no key scans.
+"""
+
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+
+from .timelines import roles_for_audience
+
+GENERATION_KEY = "feed_page_generation_{role}"
+WINDOW_KEY = "feed_window_{role}_{generation}_{digest}"
+
+
+def get_generation(role):
+    return cache.get_or_set(GENERATION_KEY.format(role=role), 1, timeout=None)
+
+
+def bump_generation(audience):
+    for role in roles_for_audience(audience):
+        key = GENERATION_KEY.format(role=role)
+        cache.add(key, 1, timeout=None)
+        cache.incr(key)
+
+
+def window_key(role, kind, offset, position, limit):
+    digest = hashlib.blake2b(f"{kind}:{offset}:{position}:{limit}".encode(), digest_size=16).hexdigest()
+    return WINDOW_KEY.format(role=role, generation=get_generation(role), digest=digest)
+
+
+def cached_fetch(role, kind, fetch):
+    """
+    Wrap a paginator ``fetch`` so its windows are shared by every viewer with
+    ``role``. ``kind`` tells apart fetches returning different row types.
+    """
+    if not settings.FEED_PAGE_CACHE_TTL:
+        return fetch
+
+    def fetch_window(offset, position, limit):
+        key = window_key(role, kind, offset, position, limit)
+        candidates = cache.get(key)
+
+        if candidates is None:
+            candidates = fetch(offset, position, limit)
+            if candidates is not None:
+                cache.set(key, candidates, timeout=settings.FEED_PAGE_CACHE_TTL)
+
+        return candidates
+
+    return fetch_window
@@ -0,0 +1,65 @@
+"""
+Pre-rendered feed items.
+
+``create_feed_event_task`` stores each event's FeedEventSerializer output (minus
+``score``, which rescoring keeps changing) as JSON text in FeedEvent.rendered.
+With FEED_PRERENDERED_PAYLOADS on, FeedView pages over ``values_list`` rows and
+assembles the response by string concatenation: no model instances and no DRF
+field machinery per item.
+"""
+
+import json
+
+from django.db.models.fields.json import KT
+from django.db.models.functions import Coalesce
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import FeedEvent
+from .serializers import FeedEventSerializer
+
+ROW_FIELDS = ("id", "sqid", "event_type", "score", "shuffle_seed", "author", "rendered")
+
+
+def _dumps(value):
+    return json.dumps(value, cls=JSONEncoder, ensure_ascii=False, separators=(",", ":"))
+
+
+def render_event(event):
+    data = FeedEventSerializer(event).data
+    data.pop("score")
+    return _dumps(data)
+
+
+def as_rows(queryset):
+    """
+    Narrow a feed queryset to the named rows the paginator and re-ranker need.
+    Rows expose the same attribute names as FeedEvent, plus ``author``.
+    """
+    fields = list(ROW_FIELDS)
+    if "match_score" in queryset.query.annotations:
+        fields.append("match_score")
+
+    return queryset.annotate(
+        author=Coalesce(KT("data__alumni__sqid"), KT("data__author__sqid"))
+    ).values_list(*fields, named=True)
+
+
+def item(row, payload):
+    # payload is a JSON object; splice the live score in before its closing brace.
+    return f'{payload[:-1]},"score":{row.score}}}'
+
+
+def render_page(rows, next_link, previous_link):
+    # Rows written before payloads existed are rendered on the fly; see
+    # `manage.py render_feed_payloads` to backfill them.
+    missing = [row.id for row in rows if not row.rendered]
+    fallback = {}
+    if missing:
+        fallback = {
+            event.id: render_event(event) for event in FeedEvent.objects.filter(id__in=missing)
+        }
+
+    items = ",".join(item(row, row.rendered or fallback[row.id]) for row in rows)
+    return (
+        f'{{"next":{_dumps(next_link)},"previous":{_dumps(previous_link)},"results":[{items}]}}'
+    )
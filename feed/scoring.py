@@ -0,0 +1,164 @@
+"""
+Time-decayed feed scoring.
+
+An event's score combines a per-type base weight with engagement (feed
+impressions and applications/ticket purchases on the source object), decayed by
+age with a half-life. ``rescore_events`` recomputes scores for events created
+inside the sliding window only, in keyset-ordered chunks, and writes just the
+rows whose score changed with one bulk UPDATE per chunk. Older events keep the
+score they had when they left the window.
+"""
+
+import logging
+import math
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from events.models import TicketPurchase
+from internships.models import InternshipApplication
+from mentorships.models import MentorshipApplication
+
+from . import page_cache, timelines
+from .models import FeedEvent, FeedImpression
+
+logger = logging.getLogger(__name__)
+
+SCORE_SCALE = 100
+
+EVENT_TYPE_WEIGHTS = {
+    FeedEvent.EventType.INTERNSHIP_CREATED: 10,
+    FeedEvent.EventType.MENTORSHIP_CREATED: 9,
+    FeedEvent.EventType.EVENT_CREATED: 8,
+    FeedEvent.EventType.INTERNSHIP_COMPLETED: 6,
+    FeedEvent.EventType.MENTORSHIP_COMPLETED: 6,
+    FeedEvent.EventType.INTERNSHIP_STARTED: 4,
+    FeedEvent.EventType.MENTORSHIP_STARTED: 4,
+}
+
+IMPRESSION_WEIGHT = 0.5
+APPLICATION_WEIGHT = 2.0
+
+# related_model -> (model, field pointing at the source object) for application counts
+APPLICATION_SOURCES = {
+    "internship": (InternshipApplication, "internship_id"),
+    "mentorship": (MentorshipApplication, "mentorship_id"),
+    "event": (TicketPurchase, "ticket__event_id"),
+}
+
+
+def compute_score(event_type, age_hours, impressions=0, applications=0):
+    base = (
+        EVENT_TYPE_WEIGHTS.get(event_type, 1)
+        + IMPRESSION_WEIGHT * math.log1p(impressions)
+        + APPLICATION_WEIGHT * math.log1p(applications)
+    )
+    decay = 0.5 ** (max(age_hours, 0) / settings.FEED_SCORE_HALF_LIFE_HOURS)
+
+    return round(SCORE_SCALE * base * decay)
+
+
+def initial_score(event_type):
+    return compute_score(event_type, age_hours=0)
+
+
+def _impression_counts(event_ids):
+    rows = (
+        FeedImpression.objects.filter(event_id__in=event_ids)
+        .values("event_id")
+        .annotate(total=Count("id"))
+        .values_list("event_id", "total")
+    )
+    return dict(rows)
+
+
+def _application_counts(events):
+    counts = {}
+
+    for related_model, (model, field) in APPLICATION_SOURCES.items():
+        object_ids = {
+            event.related_object_id
+            for event in events
+            if event.related_model == related_model and event.related_object_id
+        }
+        if not object_ids:
+            continue
+
+        rows = (
+            model.objects.filter(**{f"{field}__in": object_ids})
+            .values(field)
+            .annotate(total=Count("id"))
+            .values_list(field, "total")
+        )
+        counts.update({(related_model, object_id): total for object_id, total in rows})
+
+    return counts
+
+
+def rescore_events(now=None):
+    """Rescore active events inside the window and return run stats."""
+    now = now or timezone.now()
+    window_start = now - timedelta(days=settings.FEED_SCORE_WINDOW_DAYS)
+    chunk_size = settings.FEED_SCORE_CHUNK_SIZE
+
+    started = time.perf_counter()
+    scanned = 0
+    updated = 0
+    last_id = 0
+
+    while True:
+        events = list(
+            FeedEvent.objects.filter(is_active=True, created_at__gte=window_start, id__gt=last_id)
+            .order_by("id")
+            .only("id", "event_type", "created_at", "score", "related_model", "related_object_id")[
+                :chunk_size
+            ]
+        )
+        if not events:
+            break
+
+        impressions = _impression_counts([event.id for event in events])
+        applications = _application_counts(events)
+
+        changed = []
+        for event in events:
+            score = compute_score(
+                event.event_type,
+                age_hours=(now - event.created_at).total_seconds() / 3600,
+                impressions=impressions.get(event.id, 0),
+                applications=applications.get((event.related_model, event.related_object_id), 0),
+            )
+            if score != event.score:
+                event.score = score
+                changed.append(event)
+
+        if changed:
+            with transaction.atomic():
+                FeedEvent.objects.bulk_update(changed, ["score"])
+
+        scanned += len(events)
+        updated += len(changed)
+        last_id = events[-1].id
+
+    if updated:
+        # Timelines and cached pages are ordered by the old scores.
+        for role in timelines.roles_for_audience(FeedEvent.Audience.PUBLIC):
+            timelines.schedule_rebuild(role)
+        page_cache.bump_generation(FeedEvent.Audience.PUBLIC)
+
+    stats = {
+        "scanned": scanned,
+        "updated": updated,
+        "rescore_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    logger.info(
+        "rescore_events: scanned=%s updated=%s rescore_ms=%s",
+        stats["scanned"],
+        stats["updated"],
+        stats["rescore_ms"],
+    )
+    return stats
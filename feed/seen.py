@@ -0,0 +1,187 @@
+"""
+Per-user Bloom filter of seen feed events, stored as Redis bitmaps.
+
+Bits ``0 .. FEED_SEEN_FILTER_BITS - 1`` hold the filter; the bit right after
+them marks the filter as built, so a user with no impressions is still "warm".
+A cold filter is rebuilt from FeedImpression in the background and suppression
+is skipped until then.
+
+A Bloom filter's false-positive rate climbs with the number of items in it, so
+each filter counts its items (a u32 in the byte after the marker) and holds at
+most FEED_SEEN_FILTER_CAPACITY. A full filter becomes the previous generation
+and a fresh one takes new items; an event counts as seen if either generation
+holds it, and the previous one expires on its own TTL. The rate therefore stays
+at about twice the rate at capacity, however many impressions a user has.
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django_q.tasks import async_task
+from redis.exceptions import RedisError
+
+from futaverse.utils.redis_client import get_redis
+
+from .models import FeedImpression
+
+logger = logging.getLogger(__name__)
+
+SEEN_KEY = "feed:seen:{user_id}"
+PREVIOUS_SEEN_KEY = "feed:seen:{user_id}:previous"
+REBUILD_LOCK_KEY = "feed_seen_rebuild_{user_id}"
+
+# Set bits only on a built filter; a cold one must be rebuilt from FeedImpression.
+# ARGV: ready bit, count offset, TTL, capacity, hashes, then ``hashes`` offsets
+# per item. An item is new if any of its bits was still clear.
+ADD_SCRIPT = """
+if redis.call('GETBIT', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+if redis.call('BITFIELD', KEYS[1], 'GET', 'u32', ARGV[2])[1] >= tonumber(ARGV[4]) then
+    redis.call('RENAME', KEYS[1], KEYS[2])
+    redis.call('SETBIT', KEYS[1], ARGV[1], 1)
+end
+local hashes = tonumber(ARGV[5])
+local added = 0
+for i = 6, #ARGV, hashes do
+    local new = 0
+    for j = i, i + hashes - 1 do
+        if redis.call('SETBIT', KEYS[1], ARGV[j], 1) == 0 then
+            new = 1
+        end
+    end
+    added = added + new
+end
+redis.call('BITFIELD', KEYS[1], 'INCRBY', 'u32', ARGV[2], added)
+redis.call('EXPIRE', KEYS[1], ARGV[3])
+return 1
+"""
+
+
+class SeenFilter:
+    def __init__(self, user_id, client=None):
+        self.user_id = user_id
+        self.key = SEEN_KEY.format(user_id=user_id)
+        self.previous_key = PREVIOUS_SEEN_KEY.format(user_id=user_id)
+        self.client = client if client is not None else get_redis()
+        self.bits = settings.FEED_SEEN_FILTER_BITS
+        self.hashes = settings.FEED_SEEN_FILTER_HASHES
+        self.capacity = settings.FEED_SEEN_FILTER_CAPACITY
+
+    @property
+    def ready_bit(self):
+        return self.bits
+
+    @property
+    def count_offset(self):
+        # First whole byte after the ready bit.
+        return (self.ready_bit // 8 + 1) * 8
+
+    def positions(self, event_id):
+        # Kirsch-Mitzenmacher double hashing: k positions from one 64-bit digest.
+        digest = hashlib.blake2b(str(event_id).encode(), digest_size=8).digest()
+        h1 = int.from_bytes(digest[:4], "big")
+        h2 = int.from_bytes(digest[4:], "big") | 1
+
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, event_ids):
+        if self.client is None or not event_ids:
+            return
+
+        offsets = [offset for event_id in dict.fromkeys(event_ids) for offset in self.positions(event_id)]
+
+        try:
+            add = self.client.register_script(ADD_SCRIPT)
+            add(
+                keys=[self.key, self.previous_key],
+                args=[
+                    self.ready_bit,
+                    self.count_offset,
+                    settings.FEED_SEEN_FILTER_TTL,
+                    self.capacity,
+                    self.hashes,
+                    *offsets,
+                ],
+            )
+        except RedisError as e:
+            logger.warning("Seen filter update failed for user %s: %s", self.user_id, e)
+
+    def seen(self, event_ids):
+        """
+        Return the subset of ``event_ids`` the user has (probably) seen, or None
+        when the filter is unavailable or still cold.
+        """
+        if self.client is None:
+            return None
+
+        event_ids = list(event_ids)
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in (self.key, self.previous_key):
+                bitfield = pipe.bitfield(key)
+                bitfield.get("u1", self.ready_bit)
+                for event_id in event_ids:
+                    for offset in self.positions(event_id):
+                        bitfield.get("u1", offset)
+                bitfield.execute()
+            current, previous = pipe.execute()
+        except RedisError as e:
+            logger.warning("Seen filter read failed for user %s: %s", self.user_id, e)
+            return None
+
+        if not current[0]:
+            self.schedule_rebuild()
+            return None
+
+        seen = set()
+        for index, event_id in enumerate(event_ids):
+            start = 1 + index * self.hashes
+            if all(current[start : start + self.hashes]) or all(previous[start : start + self.hashes]):
+                seen.add(event_id)
+
+        return seen
+
+    def exclude(self, candidates):
+        return self.seen(candidate.id for candidate in candidates) or set()
+
+    def bitmap(self, event_ids):
+        """A built filter holding ``event_ids``, as the bytes Redis stores."""
+        # Redis bit offset 0 is the most significant bit of the first byte.
+        bitmap = bytearray(self.count_offset // 8 + 4)
+        for event_id in event_ids:
+            for offset in self.positions(event_id):
+                bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+        bitmap[self.ready_bit >> 3] |= 0x80 >> (self.ready_bit & 7)
+        bitmap[self.count_offset // 8 :] = len(event_ids).to_bytes(4, "big")
+
+        return bytes(bitmap)
+
+    def rebuild(self):
+        """Rebuild both generations from the newest impressions, one SET each."""
+        if self.client is None:
+            return 0
+
+        event_ids = list(
+            FeedImpression.objects.filter(user_id=self.user_id)
+            .order_by("-seen_at", "-id")
+            .values_list("event_id", flat=True)[: 2 * self.capacity]
+        )
+        current, previous = event_ids[: self.capacity], event_ids[self.capacity :]
+
+        pipe = self.client.pipeline()
+        if previous:
+            pipe.set(self.previous_key, self.bitmap(previous), ex=settings.FEED_SEEN_FILTER_TTL)
+        else:
+            pipe.delete(self.previous_key)
+        pipe.set(self.key, self.bitmap(current), ex=settings.FEED_SEEN_FILTER_TTL)
+        pipe.execute()
+
+        return len(event_ids)
+
+    def schedule_rebuild(self):
+        if cache.add(REBUILD_LOCK_KEY.format(user_id=self.user_id), True, timeout=60):
+            async_task("feed.tasks.rebuild_seen_filter_task", self.user_id)
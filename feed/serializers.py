@@ -1,12 +1,226 @@
+from base64 import b64decode, b64encode
+from contextlib import contextmanager
+from urllib import parse
+
+from django.conf import settings
 from rest_framework import serializers
 from rest_framework.pagination import CursorPagination
+from rest_framework.utils.urls import replace_query_param
 
+from . import timelines
+from .diversity import diversify
 from .models import FeedEvent
 
 
 class FeedCursorPagination(CursorPagination):
+    """
+    Cursor pagination over a window of candidates. Forward pages fetch more rows
+    than they return so suppressed candidates (``exclude``) can be skipped and the
+    page can be re-ranked for diversity (see feed.diversity). When suppression
+    leaves a window short, the following windows are read too, up to
+    FEED_SEEN_MAX_WINDOWS.
+
+    The cursor advances to the first candidate that was neither shown nor
+    skipped. Candidates shown from beyond that point are carried in the cursor
+    (``d``, as sqids) and skipped on the next page, so nothing is lost or repeated.
+    """
+
     page_size = 20
     ordering = ("-score", "shuffle_seed", "id")
+    personalized_ordering = ("-match_score", "-score", "shuffle_seed", "id")
+
+    # Callable taking the candidate list and returning the ids to drop, set by the view.
+    exclude = None
+
+    # Callable wrapping ``fetch`` (e.g. to share windows, see feed.page_cache), set by the view.
+    wrap_fetch = None
+
+    # Sqids shown ahead of the cursor position: read from / written to the cursor.
+    carried = frozenset()
+    carry = frozenset()
+
+    def get_ordering(self, request, queryset, view):
+        # Personalized querysets carry a match_score annotation (see feed.services).
+        if "match_score" in queryset.query.annotations:
+            return self.personalized_ordering
+
+        return super().get_ordering(request, queryset, view)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        def fetch(offset, position, limit):
+            candidates = queryset.order_by(*self.ordering)
+
+            if position is not None:
+                order = self.ordering[0]
+                lookup = "__lt" if order.startswith("-") else "__gt"
+                candidates = candidates.filter(**{order.lstrip("-") + lookup: position})
+
+            return list(candidates[offset : offset + limit])
+
+        page = self.paginate_window(fetch, request)
+        if page is None:
+            # Reverse (previous-page) cursors use the stock implementation.
+            page = super().paginate_queryset(queryset, request, view)
+            self.consumed = self.page
+            self.window = self.page
+            self.excluded = set()
+
+        return page
+
+    def paginate_timeline(self, role, request, view=None, queryset=None):
+        """
+        Serve a forward page from the role's Redis timeline. Cursors are the same
+        ones the Postgres path produces. Returns None to fall back to Postgres.
+        """
+
+        def fetch(offset, position, limit):
+            event_ids = timelines.read_page(role, position, offset, limit)
+            if event_ids is None:
+                return None
+
+            return timelines.hydrate(event_ids, queryset)
+
+        return self.paginate_window(fetch, request)
+
+    def paginate_window(self, fetch, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+
+        if reverse:
+            return None
+
+        if self.wrap_fetch is not None:
+            fetch = self.wrap_fetch(fetch)
+
+        overfetch = 1
+        if self.exclude is not None:
+            overfetch = settings.FEED_SEEN_OVERFETCH
+        if settings.FEED_DIVERSITY_ENABLED:
+            overfetch = max(overfetch, settings.FEED_DIVERSITY_OVERFETCH)
+        window_size = self.page_size * overfetch
+
+        self.window = []
+        self.excluded = set()
+
+        def skip(candidate):
+            return candidate.id in self.excluded or candidate.sqid in self.carried
+
+        # A viewer who has seen the head of the feed would get a short (or empty)
+        # page from one window, so keep reading windows until the page can be
+        # filled, the rows run out, or FEED_SEEN_MAX_WINDOWS have been read.
+        max_windows = settings.FEED_SEEN_MAX_WINDOWS if self.exclude is not None else 1
+        for _ in range(max_windows):
+            # One extra candidate tells us whether more rows follow.
+            fetched = fetch(offset + len(self.window), current_position, window_size + 1)
+            if fetched is None:
+                return None
+
+            batch, lookahead = fetched[:window_size], fetched[window_size:]
+            self.window += batch
+            if self.exclude is not None:
+                self.excluded |= self.exclude(batch)
+
+            if not lookahead or sum(not skip(c) for c in self.window) >= self.page_size:
+                break
+
+        candidates = self.window + lookahead
+
+        if settings.FEED_DIVERSITY_ENABLED:
+            self.page = diversify(
+                self.window,
+                self.page_size,
+                max_per_type=settings.FEED_DIVERSITY_MAX_PER_TYPE,
+                max_per_author=settings.FEED_DIVERSITY_MAX_PER_AUTHOR,
+                skip=skip,
+            )
+        else:
+            self.page = [c for c in self.window if not skip(c)][: self.page_size]
+
+        shown = {candidate.id for candidate in self.page}
+        boundary = 0
+        while boundary < len(self.window) and (
+            self.window[boundary].id in shown or skip(self.window[boundary])
+        ):
+            boundary += 1
+
+        self.consumed = self.window[:boundary]
+        passed = {candidate.sqid for candidate in self.consumed}
+        self.carry = (self.carried - passed) | {
+            candidate.sqid for candidate in self.page if candidate.sqid not in passed
+        }
+
+        self.has_next = len(candidates) > len(self.consumed)
+        self.has_previous = (current_position is not None) or (offset > 0)
+        if self.has_next:
+            following = candidates[len(self.consumed)]
+            self.next_position = self._get_position_from_instance(following, self.ordering)
+        if self.has_previous:
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        self.carried = frozenset()
+
+        if cursor is not None and not cursor.reverse:
+            encoded = request.query_params[self.cursor_query_param]
+            tokens = parse.parse_qs(b64decode(encoded.encode("ascii")).decode("ascii"))
+            # Carried sqids always fall inside the next page's windows, which bounds them.
+            limit = (
+                self.page_size
+                * max(settings.FEED_SEEN_OVERFETCH, settings.FEED_DIVERSITY_OVERFETCH)
+                * settings.FEED_SEEN_MAX_WINDOWS
+            )
+            carried = tokens.get("d", [""])[0].split(",")
+            self.carried = frozenset(filter(None, carried[:limit]))
+
+        return cursor
+
+    def encode_cursor(self, cursor):
+        if cursor.reverse or not self.carry:
+            return super().encode_cursor(cursor)
+
+        tokens = {"d": ",".join(sorted(self.carry))}
+        if cursor.offset != 0:
+            tokens["o"] = str(cursor.offset)
+        if cursor.position is not None:
+            tokens["p"] = cursor.position
+
+        querystring = parse.urlencode(tokens, doseq=True)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    @contextmanager
+    def _consumed_as_page(self):
+        # DRF derives link positions and offsets from self.page; count every
+        # consumed candidate instead so excluded rows are not fetched again.
+        page, page_size = self.page, self.page_size
+        self.page, self.page_size = self.consumed, len(self.consumed)
+        try:
+            yield
+        finally:
+            self.page, self.page_size = page, page_size
+
+    def get_next_link(self):
+        with self._consumed_as_page():
+            return super().get_next_link()
+
+    def get_previous_link(self):
+        with self._consumed_as_page():
+            return super().get_previous_link()
 
 
 class FeedEventSerializer(serializers.ModelSerializer):
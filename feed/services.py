@@ -0,0 +1,123 @@
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Case, Count, IntegerField, Value, When
+from django.utils import timezone
+
+from core.models import feed_match_q
+
+from .models import FeedEvent, FeedTarget, TokenMatchCount, target_token
+
+
+class FeedRanking:
+    SCORE = "score"
+    PERSONALIZED = "personalized"
+
+    choices = (SCORE, PERSONALIZED)
+
+
+class FeedTargetStorage:
+    TABLE = "table"
+    TOKENS = "tokens"
+
+    choices = (TABLE, TOKENS)
+
+
+def feed_queryset_for(user):
+    return FeedEvent.objects.filter(
+        is_active=True, audience__in=[user.role, FeedEvent.Audience.PUBLIC]
+    )
+
+
+def personalize_feed(queryset, profile, storage=None):
+    """
+    Annotate each candidate event with ``match_score``: the number of its
+    targets matching the viewer's profile.
+
+    The scores are read up front in one grouped query that only visits the
+    matching targets: with the default "table" storage through the FeedTarget
+    (target_type, target_value) index, with one branch per target type rather
+    than one join per skill. The page query then sorts on those event ids (see
+    ``annotate_match_scores``), so its cost grows with the number of matching
+    events rather than with a subquery per candidate. "tokens" storage reads
+    FeedEvent.target_tokens instead; see ``personalize_feed_tokens``.
+
+    Common targets (department, faculty, level) match a large share of all
+    events, so only events inside the scoring window (FEED_SCORE_WINDOW_DAYS)
+    are boosted, and at most FEED_PERSONALIZED_MAX_MATCHES of them, best
+    matches first. Older events keep their place by score.
+    """
+    storage = storage or settings.FEED_TARGET_STORAGE
+    match_targets = getattr(profile, "feed_match_targets", None) or {}
+    match_filter = feed_match_q(match_targets, prefix="")
+
+    if match_filter is None:
+        return queryset.annotate(match_score=Value(0, output_field=IntegerField()))
+
+    if storage == FeedTargetStorage.TOKENS:
+        return personalize_feed_tokens(queryset, match_targets)
+
+    matches = (
+        FeedTarget.objects.filter(
+            match_filter,
+            event__in=queryset.values("pk"),
+            event__created_at__gte=match_window_start(),
+        )
+        .order_by()
+        .values("event")
+        .annotate(total=Count("pk"))
+        .order_by("-total", "-event")
+        .values_list("event", "total")[: settings.FEED_PERSONALIZED_MAX_MATCHES]
+    )
+
+    return annotate_match_scores(queryset, matches)
+
+
+def match_window_start():
+    return timezone.now() - timedelta(days=settings.FEED_SCORE_WINDOW_DAYS)
+
+
+def annotate_match_scores(queryset, matches):
+    """
+    Annotate ``match_score`` from ``(event_id, score)`` pairs; events not listed
+    score 0. Ids are grouped by score, so the CASE has one branch per distinct
+    score (at most the number of viewer targets), not one per event.
+    """
+    ids_by_score = defaultdict(list)
+    for event_id, score in matches:
+        ids_by_score[score].append(event_id)
+
+    if not ids_by_score:
+        return queryset.annotate(match_score=Value(0, output_field=IntegerField()))
+
+    return queryset.annotate(
+        match_score=Case(
+            *[When(pk__in=ids, then=Value(score)) for score, ids in ids_by_score.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+    )
+
+
+def personalize_feed_tokens(queryset, match_targets):
+    """
+    Token-storage variant of ``personalize_feed``. The matching events are
+    found by an ``overlap`` filter (jsonb ``?|``, served by the GIN index from
+    migration 0010), and only those count their matching tokens. The same
+    window and limit apply.
+    """
+    tokens = [
+        target_token(target_type, value)
+        for target_type, values in match_targets.items()
+        for value in values
+    ]
+
+    matches = (
+        queryset.filter(target_tokens__overlap=tokens, created_at__gte=match_window_start())
+        .annotate(total=TokenMatchCount("target_tokens", tokens))
+        .order_by("-total", "-id")
+        .values_list("id", "total")[: settings.FEED_PERSONALIZED_MAX_MATCHES]
+    )
+
+    return annotate_match_scores(queryset, matches)
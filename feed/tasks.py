@@ -1,10 +1,14 @@
 import logging
+import random
+from collections import defaultdict
 
 from django.db import transaction
 
 from futaverse.lib import MODELS
 
-from .models import FeedEvent, FeedImpression, FeedTarget
+from . import impressions, page_cache, rendering, scoring, timelines
+from .models import FeedEvent, FeedImpression, FeedTarget, target_token
+from .seen import SeenFilter
 
 logger = logging.getLogger(__name__)
 
@@ -16,39 +20,117 @@ def record_impressions_task(user_id, event_ids):
     FeedImpression.objects.bulk_create(impressions, ignore_conflicts=True)
 
 
+def flush_impressions_task():
+    return impressions.flush_impressions()
+
+
+ENTITY_TYPE_MAP = {
+    "internship": "internship",
+    "mentorship": "mentorship",
+    "event": "event",
+    "internship_engagement": "internship_engagement",
+    "mentorship_engagement": "mentorship_engagement",
+    "post": "engagement_post",
+}
+
+# Relations read while building an event's data, loaded with the related object.
+RELATED_SELECTS = {
+    "internship": ("alumnus",),
+    "mentorship": ("alumnus",),
+    "event": ("creator__student_profile", "creator__alumni_profile"),
+    "internship_engagement": ("alumnus",),
+    "mentorship_engagement": ("alumnus",),
+    "post": ("author__student_profile", "author__alumni_profile"),
+}
+
+
 def create_feed_event_task(
     event_type,
     related_object_id,
     related_model,
     data,
     audience="public",
-    score=0,
+    score=None,
     shuffle_seed=None,
 ):
-    model = MODELS.get(related_model)
-    if not model:
-        logger.error("create_feed_event_task: unknown model %s", related_model)
-        return
-
-    try:
-        related_object = model.objects.get(id=related_object_id)
-    except model.DoesNotExist:
-        logger.error(
-            "create_feed_event_task: %s %s not found", related_model, related_object_id
+    create_feed_events_task(
+        [
+            {
+                "event_type": event_type,
+                "related_object_id": related_object_id,
+                "related_model": related_model,
+                "data": data,
+                "audience": audience,
+                "score": score,
+                "shuffle_seed": shuffle_seed,  # see FeedEvent.shuffle_seed docs
+            }
+        ]
+    )
+
+
+def create_feed_events_task(events):
+    """
+    Batch variant of create_feed_event_task: ``events`` is a list of dicts of its
+    keyword arguments. Related objects are loaded with one in_bulk query per
+    model and all FeedEvent and FeedTarget rows are written with one bulk insert
+    each, so a burst costs a handful of queries rather than a task per row.
+    """
+    object_ids = defaultdict(set)
+    for spec in events:
+        object_ids[spec["related_model"]].add(spec["related_object_id"])
+
+    related_objects = {}
+    for related_model, ids in object_ids.items():
+        model = MODELS.get(related_model)
+        if not model:
+            logger.error("create_feed_events_task: unknown model %s", related_model)
+            continue
+
+        related_objects[related_model] = model.objects.select_related(
+            *RELATED_SELECTS.get(related_model, ())
+        ).in_bulk(ids)
+
+    pending = []
+    for spec in events:
+        related_model = spec["related_model"]
+        if related_model not in related_objects:
+            continue
+
+        related_object = related_objects[related_model].get(spec["related_object_id"])
+        if related_object is None:
+            logger.error(
+                "create_feed_events_task: %s %s not found",
+                related_model,
+                spec["related_object_id"],
+            )
+            continue
+
+        pending.append(build_feed_event(spec, related_object))
+
+    if not pending:
+        return []
+
+    with transaction.atomic():
+        created = FeedEvent.objects.bulk_create([event for event, _ in pending])
+
+        # Payloads embed the sqid, so they can only be rendered once ids exist.
+        for event in created:
+            event.rendered = rendering.render_event(event)
+        FeedEvent.objects.bulk_update(created, ["rendered"])
+
+        FeedTarget.objects.bulk_create(
+            [FeedTarget(event=event, **target) for event, targets in pending for target in targets]
         )
-        return
 
-    ENTITY_TYPE_MAP = {
-        "internship": "internship",
-        "mentorship": "mentorship",
-        "event": "event",
-        "internship_engagement": "internship_engagement",
-        "mentorship_engagement": "mentorship_engagement",
-        "post": "engagement_post",
-    }
+    transaction.on_commit(lambda: publish_feed_events(created))
+    return created
 
-    data = {**data}
 
+def build_feed_event(spec, related_object):
+    """Return an unsaved FeedEvent for ``spec`` plus its target dicts."""
+    related_model = spec["related_model"]
+
+    data = {**spec["data"]}
     data["type"] = ENTITY_TYPE_MAP.get(related_model)
     data["sqid"] = related_object.sqid
 
@@ -68,18 +150,41 @@ def create_feed_event_task(
             "full_name": alumnus.full_name,
         }
 
-    with transaction.atomic():
-        event = FeedEvent.objects.create(
-            event_type=event_type,
-            data=data,
-            audience=audience,
-            score=score,
-            shuffle_seed=shuffle_seed,  # see FeedEvent.shuffle_seed docs re: stopgap
-        )
+    targets = getattr(related_object, "feed_targets", [])
+    score = spec.get("score")
+    shuffle_seed = spec.get("shuffle_seed")
 
-        targets = getattr(related_object, "feed_targets", [])
+    event = FeedEvent(
+        event_type=spec["event_type"],
+        data=data,
+        audience=spec.get("audience", FeedEvent.Audience.PUBLIC),
+        score=scoring.initial_score(spec["event_type"]) if score is None else score,
+        # bulk_create skips FeedEvent.save, which would otherwise assign the seed.
+        shuffle_seed=random.random() if shuffle_seed is None else shuffle_seed,
+        target_tokens=[target_token(**target) for target in targets],
+        related_model=related_model,
+        related_object_id=related_object.id,
+    )
+    return event, targets
 
-        if targets:
-            FeedTarget.objects.bulk_create(
-                [FeedTarget(event=event, **target) for target in targets]
-            )
+
+def publish_feed_events(events):
+    for event in events:
+        timelines.push_to_timelines(event)
+
+    for audience in {event.audience for event in events}:
+        page_cache.bump_generation(audience)
+
+
+def rescore_feed_events_task():
+    return scoring.rescore_events()
+
+
+def rebuild_timeline_task(role):
+    count = timelines.rebuild_timeline(role)
+    logger.info("rebuild_timeline_task: loaded %s events into the %s timeline", count, role)
+
+
+def rebuild_seen_filter_task(user_id):
+    count = SeenFilter(user_id).rebuild()
+    logger.info("rebuild_seen_filter_task: loaded %s impressions for user %s", count, user_id)
@@ -0,0 +1,71 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from feed.models import FeedEvent, FeedTarget
+from feed.tasks import create_feed_events_task
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+class CreateFeedEventsTaskTests(BaseAPITestCase):
+    def setUp(self):
+        self.alumnus = self._create_alumnus()
+
+    def _specs(self, count):
+        specs = []
+        for index in range(count):
+            internship = self.make_internship(self.alumnus, skills_required=["python", f"skill-{index}"])
+            mentorship = self.make_mentorship(self.alumnus)
+            specs += [
+                {
+                    "event_type": FeedEvent.EventType.INTERNSHIP_CREATED,
+                    "related_object_id": internship.id,
+                    "related_model": "internship",
+                    "data": {"title": internship.title},
+                },
+                {
+                    "event_type": FeedEvent.EventType.MENTORSHIP_CREATED,
+                    "related_object_id": mentorship.id,
+                    "related_model": "mentorship",
+                    "data": {"title": mentorship.title},
+                    "audience": FeedEvent.Audience.STUDENT,
+                },
+            ]
+        return specs
+
+    def _count_queries(self, specs):
+        with CaptureQueriesContext(connection) as queries:
+            create_feed_events_task(specs)
+        return len(queries)
+
+    def test_query_count_does_not_grow_with_batch_size(self):
+        small = self._count_queries(self._specs(1))
+        large = self._count_queries(self._specs(5))
+
+        self.assertEqual(small, large)
+
+    def test_events_and_targets_are_written(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            created = create_feed_events_task(self._specs(2))
+
+        self.assertEqual(len(created), 4)
+        internship_event = FeedEvent.objects.filter(related_model="internship").first()
+        self.assertEqual(internship_event.data["alumni"]["sqid"], self.alumnus.sqid)
+        self.assertIn(internship_event.sqid, internship_event.rendered)
+        self.assertIsNotNone(internship_event.shuffle_seed)
+        self.assertEqual(
+            set(internship_event.target_tokens),
+            {f"{t.target_type}:{t.target_value}" for t in internship_event.targets.all()},
+        )
+        # two skills, industry and company_type per internship
+        self.assertEqual(FeedTarget.objects.filter(event__related_model="internship").count(), 2 * 4)
+
+    def test_missing_related_objects_are_skipped(self):
+        specs = self._specs(1)
+        specs.append({**specs[0], "related_object_id": 999999})
+        specs.append({**specs[0], "related_model": "unknown"})
+
+        with self.assertLogs("feed.tasks", level="ERROR") as logs:
+            created = create_feed_events_task(specs)
+
+        self.assertEqual(len(created), 2)
+        self.assertEqual(len(logs.output), 2)
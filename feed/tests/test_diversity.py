@@ -0,0 +1,106 @@
+from collections import Counter
+from types import SimpleNamespace
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+
+from feed.diversity import author_of, diversify
+from feed.models import FeedEvent
+from futaverse.tests_helpers import BaseAPITestCase
+
+INTERNSHIP = FeedEvent.EventType.INTERNSHIP_CREATED
+EVENT = FeedEvent.EventType.EVENT_CREATED
+TRAILING_TYPES = [EVENT, FeedEvent.EventType.MENTORSHIP_CREATED, FeedEvent.EventType.INTERNSHIP_COMPLETED]
+
+
+def candidate(index, event_type, author=None):
+    data = {"alumni": {"sqid": author}} if author else {}
+    return SimpleNamespace(id=index, event_type=event_type, data=data)
+
+
+class DiversifyTests(SimpleTestCase):
+    def test_event_type_cap_promotes_later_candidates(self):
+        candidates = [candidate(i, INTERNSHIP) for i in range(6)] + [candidate(6, EVENT)]
+
+        page = diversify(candidates, page_size=3, max_per_type=2, max_per_author=5)
+
+        self.assertEqual([c.id for c in page], [0, 1, 6])
+
+    def test_author_cap(self):
+        candidates = [candidate(i, INTERNSHIP, author="a1") for i in range(4)] + [
+            candidate(4, EVENT, author="a2")
+        ]
+
+        page = diversify(candidates, page_size=3, max_per_type=5, max_per_author=2)
+
+        self.assertEqual([c.id for c in page], [0, 1, 4])
+
+    def test_caps_relax_when_the_window_lacks_variety(self):
+        candidates = [candidate(i, INTERNSHIP) for i in range(5)]
+
+        page = diversify(candidates, page_size=4, max_per_type=2, max_per_author=5)
+
+        self.assertEqual([c.id for c in page], [0, 1, 2, 3])
+
+    def test_skipped_candidates_are_never_shown(self):
+        candidates = [candidate(i, EVENT) for i in range(4)]
+
+        page = diversify(candidates, page_size=2, max_per_type=5, max_per_author=5, skip=lambda c: c.id == 0)
+
+        self.assertEqual([c.id for c in page], [1, 2])
+
+    def test_author_of_reads_alumni_or_post_author(self):
+        self.assertEqual(author_of(SimpleNamespace(data={"author": {"sqid": "x"}})), "x")
+        self.assertIsNone(author_of(SimpleNamespace(data={})))
+
+
+@override_settings(FEED_DIVERSITY_MAX_PER_TYPE=8, FEED_DIVERSITY_MAX_PER_AUTHOR=3, FEED_SUPPRESS_SEEN=False)
+class DiversifiedFeedPaginationTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = self._create_student()
+        self.events = []
+        for score in range(60, 0, -1):
+            # The top of the feed is one author's internships; other events trail.
+            if score > 30:
+                event_type, author = INTERNSHIP, "prolific"
+            else:
+                event_type, author = TRAILING_TYPES[score % 3], f"author-{score % 10}"
+            self.events.append(
+                FeedEvent.objects.create(
+                    event_type=event_type, score=score, data={"alumni": {"sqid": author}}
+                )
+            )
+
+    def _walk(self):
+        headers = self._auth_header(self.student)
+        pages = []
+        url = "/api/feed"
+        while url:
+            resp = self.client.get(url, **headers)
+            pages.append(resp.data["results"])
+            url = resp.data["next"]
+        return pages
+
+    def test_first_page_respects_caps(self):
+        first = self._walk()[0]
+        sqids = [item["sqid"] for item in first]
+        by_sqid = {event.sqid: event for event in self.events}
+
+        types = Counter(by_sqid[sqid].event_type for sqid in sqids)
+        authors = Counter(by_sqid[sqid].data["alumni"]["sqid"] for sqid in sqids)
+        self.assertEqual(len(sqids), 20)
+        self.assertLessEqual(types[INTERNSHIP], 8)
+        self.assertLessEqual(authors["prolific"], 3)
+
+    def test_every_event_is_shown_exactly_once(self):
+        shown = [item["sqid"] for page in self._walk() for item in page]
+
+        self.assertEqual(len(shown), len(self.events))
+        self.assertEqual(set(shown), {event.sqid for event in self.events})
+
+    @override_settings(FEED_DIVERSITY_ENABLED=False)
+    def test_disabled_reranker_keeps_db_order(self):
+        shown = [item["sqid"] for page in self._walk() for item in page]
+
+        self.assertEqual(shown, [event.sqid for event in self.events])
@@ -0,0 +1,86 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import TestCase
+
+from core.models import User
+from feed import impressions
+from feed.models import FeedEvent, FeedImpression
+
+
+class BufferImpressionsTests(TestCase):
+    @patch("feed.impressions.async_task")
+    @patch("feed.impressions.get_redis")
+    def test_appends_entries_to_the_buffer(self, mock_get_redis, mock_async_task):
+        impressions.buffer_impressions(3, [10, 11])
+
+        mock_get_redis.return_value.rpush.assert_called_once_with(impressions.BUFFER_KEY, "3:10", "3:11")
+        mock_async_task.assert_not_called()
+
+    @patch("feed.impressions.async_task")
+    @patch("feed.impressions.get_redis", return_value=None)
+    def test_writes_through_without_redis(self, mock_get_redis, mock_async_task):
+        impressions.buffer_impressions(3, [10])
+
+        mock_async_task.assert_called_once_with("feed.tasks.record_impressions_task", 3, [10])
+
+
+class FlushImpressionsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(email="u@test.com", role=User.Role.STUDENT)
+        self.events = [
+            FeedEvent.objects.create(event_type=FeedEvent.EventType.EVENT_CREATED) for _ in range(2)
+        ]
+        self.client = MagicMock()
+        self.client.llen.return_value = 0
+        self.client.lrange.return_value = []
+
+    def _buffer(self, *batches):
+        take = self.client.register_script.return_value
+        take.side_effect = [*batches, []]
+
+    @patch("feed.impressions.get_redis")
+    def test_batch_is_deduped_and_written_once(self, mock_get_redis):
+        mock_get_redis.return_value = self.client
+        first, second = self.events
+        self._buffer(
+            [
+                f"{self.user.id}:{first.id}".encode(),
+                f"{self.user.id}:{first.id}".encode(),
+                f"{self.user.id}:{second.id}".encode(),
+                f"{self.user.id}:999999".encode(),
+                b"garbage",
+            ]
+        )
+
+        stats = impressions.flush_impressions()
+
+        self.assertEqual(stats["written"], 2)
+        self.assertEqual(stats["batches"], 1)
+        self.assertEqual(FeedImpression.objects.filter(user=self.user).count(), 2)
+        self.client.hset.assert_called_once()
+
+    @patch("feed.impressions.FeedImpression.objects.bulk_create", side_effect=Exception("db down"))
+    @patch("feed.impressions.get_redis")
+    def test_failed_batch_is_kept_for_the_next_run(self, mock_get_redis, mock_bulk_create):
+        mock_get_redis.return_value = self.client
+        entries = [f"{self.user.id}:{self.events[0].id}".encode()]
+        self._buffer(entries)
+
+        stats = impressions.flush_impressions()
+
+        self.assertEqual(stats["written"], 0)
+        # Left on the processing list for the next run.
+        self.client.delete.assert_not_called()
+
+    @patch("feed.impressions.get_redis")
+    def test_leftover_batch_is_written_before_new_ones(self, mock_get_redis):
+        mock_get_redis.return_value = self.client
+        self.client.lrange.side_effect = [[f"{self.user.id}:{self.events[0].id}".encode()], [], []]
+        self._buffer([f"{self.user.id}:{self.events[1].id}".encode()])
+
+        stats = impressions.flush_impressions()
+
+        self.assertEqual(stats["batches"], 2)
+        self.assertEqual(FeedImpression.objects.filter(user=self.user).count(), 2)
+        self.client.lrange.assert_called_with(impressions.PROCESSING_KEY, 0, -1)
+        self.assertEqual(self.client.delete.call_count, 2)
@@ -0,0 +1,110 @@
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from feed import page_cache, rendering
+from feed.models import FeedEvent
+from feed.tasks import create_feed_event_task
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+@patch("feed.views.SeenFilter")
+class FeedPageCacheTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = self._create_student()
+        self.events = [
+            FeedEvent.objects.create(event_type=FeedEvent.EventType.INTERNSHIP_CREATED, score=score)
+            for score in range(25, 0, -1)
+        ]
+
+    def _unseen(self, mock_filter_class):
+        seen_filter = mock_filter_class.return_value
+        seen_filter.seen.return_value = set()
+        seen_filter.exclude.return_value = set()
+        return seen_filter
+
+    def test_head_page_is_served_from_cache(self, mock_filter_class):
+        self._unseen(mock_filter_class)
+        headers = self._auth_header(self.student)
+        first = self.client.get("/api/feed", **headers)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get("/api/feed", **headers)
+
+        self.assertEqual(second.data, first.data)
+        self.assertFalse(any("feed_feedevent" in q["sql"] for q in queries.captured_queries))
+
+    def test_cached_hit_still_records_impressions(self, mock_filter_class):
+        seen_filter = self._unseen(mock_filter_class)
+        headers = self._auth_header(self.student)
+        self.client.get("/api/feed", **headers)
+        self.client.get("/api/feed", **headers)
+
+        self.assertEqual(seen_filter.add.call_count, 2)
+
+    def test_new_event_bumps_generation_and_invalidates(self, mock_filter_class):
+        self._unseen(mock_filter_class)
+        headers = self._auth_header(self.student)
+        self.client.get("/api/feed", **headers)
+
+        alumnus = self._create_alumnus()
+        internship = self.make_internship(alumnus)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_feed_event_task(
+                FeedEvent.EventType.INTERNSHIP_CREATED, internship.id, "internship", {}, score=100
+            )
+
+        resp = self.client.get("/api/feed", **headers)
+        self.assertEqual(resp.data["results"][0]["score"], 100)
+
+    def test_seen_events_are_suppressed_from_the_cached_window(self, mock_filter_class):
+        seen_filter = self._unseen(mock_filter_class)
+        headers = self._auth_header(self.student)
+        self.client.get("/api/feed", **headers)
+
+        seen_filter.exclude.return_value = {self.events[0].id}
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get("/api/feed", **headers)
+
+        self.assertFalse(any("feed_feedevent" in q["sql"] for q in queries.captured_queries))
+        self.assertEqual(
+            [item["sqid"] for item in resp.data["results"]], [event.sqid for event in self.events[1:21]]
+        )
+
+    def test_cursor_pages_are_served_from_cache(self, mock_filter_class):
+        self._unseen(mock_filter_class)
+        headers = self._auth_header(self.student)
+        first = self.client.get("/api/feed", **headers)
+        second = self.client.get(first.data["next"], **headers)
+
+        with CaptureQueriesContext(connection) as queries:
+            again = self.client.get(first.data["next"], **headers)
+
+        self.assertEqual(again.data, second.data)
+        self.assertFalse(any("feed_feedevent" in q["sql"] for q in queries.captured_queries))
+
+    @override_settings(FEED_PRERENDERED_PAYLOADS=True)
+    def test_prerendered_windows_are_cached(self, mock_filter_class):
+        self._unseen(mock_filter_class)
+        for event in self.events:
+            FeedEvent.objects.filter(pk=event.pk).update(rendered=rendering.render_event(event))
+        headers = self._auth_header(self.student)
+        first = self.client.get("/api/feed", **headers)
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get("/api/feed", **headers)
+
+        self.assertEqual(second.content, first.content)
+        self.assertFalse(any("feed_feedevent" in q["sql"] for q in queries.captured_queries))
+
+    def test_personalized_pages_are_not_cached(self, mock_filter_class):
+        self._unseen(mock_filter_class)
+
+        with patch.object(page_cache, "cached_fetch") as mock_cached_fetch:
+            self.client.get("/api/feed?ranking=personalized", **self._auth_header(self.student))
+
+        mock_cached_fetch.assert_not_called()
@@ -0,0 +1,138 @@
+from datetime import timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+from rest_framework import status
+
+from feed.models import FeedEvent, FeedTarget, target_token
+from feed.services import feed_queryset_for, personalize_feed
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+class PersonalizedFeedRankingTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = self._create_student(skills=["python", "django"], department="Computer Science")
+
+        self.unmatched = self._make_event(score=9)
+        self.one_match = self._make_event(score=1, targets=[("skill", "python")])
+        self.two_matches = self._make_event(
+            score=0, targets=[("skill", "django"), ("department", "Computer Science"), ("skill", "rust")]
+        )
+
+    def _make_event(self, score, targets=()):
+        event = FeedEvent.objects.create(
+            event_type=FeedEvent.EventType.INTERNSHIP_CREATED,
+            audience=FeedEvent.Audience.PUBLIC,
+            score=score,
+            target_tokens=[target_token(t, v) for t, v in targets],
+        )
+        FeedTarget.objects.bulk_create(
+            [FeedTarget(event=event, target_type=t, target_value=v) for t, v in targets]
+        )
+        return event
+
+    def _sqids(self, resp):
+        return [item["sqid"] for item in resp.data["results"]]
+
+    def test_default_ranking_orders_by_score(self):
+        resp = self.client.get("/api/feed", **self._auth_header(self.student))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._sqids(resp)[0], self.unmatched.sqid)
+
+    def test_personalized_ranking_orders_by_matching_targets(self):
+        resp = self.client.get("/api/feed?ranking=personalized", **self._auth_header(self.student))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self._sqids(resp), [self.two_matches.sqid, self.one_match.sqid, self.unmatched.sqid]
+        )
+
+    def test_personalized_ranking_paginates_with_cursor(self):
+        for score in range(25):
+            self._make_event(score=score, targets=[("skill", "python")] if score % 2 else [])
+
+        headers = self._auth_header(self.student)
+        first = self.client.get("/api/feed?ranking=personalized", **headers)
+        second = self.client.get(first.data["next"], **headers)
+
+        seen = self._sqids(first) + self._sqids(second)
+        self.assertEqual(len(seen), 28)
+        self.assertEqual(len(set(seen)), 28)
+        self.assertIsNone(second.data["next"])
+
+    def test_match_scores_are_read_once_not_per_candidate(self):
+        profile = self.student.profile
+
+        with self.assertNumQueries(1):
+            queryset = personalize_feed(feed_queryset_for(self.student), profile)
+
+        self.assertNotIn("feed_feedtarget", str(queryset.query))
+        self.assertEqual(
+            dict(queryset.values_list("id", "match_score")),
+            {self.unmatched.id: 0, self.one_match.id: 1, self.two_matches.id: 2},
+        )
+
+    def test_only_recent_events_are_boosted(self):
+        FeedEvent.objects.filter(pk=self.two_matches.pk).update(created_at=timezone.now() - timedelta(days=30))
+
+        queryset = personalize_feed(feed_queryset_for(self.student), self.student.profile)
+
+        self.assertEqual(dict(queryset.values_list("id", "match_score"))[self.two_matches.id], 0)
+
+    @override_settings(FEED_PERSONALIZED_MAX_MATCHES=1)
+    def test_boosted_events_are_capped_keeping_the_best_matches(self):
+        queryset = personalize_feed(feed_queryset_for(self.student), self.student.profile)
+
+        self.assertEqual(
+            dict(queryset.values_list("id", "match_score")),
+            {self.unmatched.id: 0, self.one_match.id: 0, self.two_matches.id: 2},
+        )
+
+    def test_user_without_profile_falls_back_to_zero_matches(self):
+        staff = self._create_user("staff@test.com", "staff")
+
+        resp = self.client.get("/api/feed?ranking=personalized", **self._auth_header(staff))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(self._sqids(resp)[0], self.unmatched.sqid)
+
+
+class FeedMatchFilterTests(BaseAPITestCase):
+    def test_filter_has_one_branch_per_target_type(self):
+        student = self._create_student(skills=["python", "django", "sql", "go"])
+        match_filter = student.student_profile.feed_match_filter
+
+        # skill, department, faculty, level — independent of the number of skills
+        self.assertEqual(len(match_filter.children), 4)
+
+
+@override_settings(FEED_TARGET_STORAGE="tokens")
+class TokenStorageRankingTests(PersonalizedFeedRankingTests):
+    """Re-runs the personalized ranking tests against FeedEvent.target_tokens."""
+
+    def test_overlap_lookup_matches_any_token(self):
+        matched = FeedEvent.objects.filter(target_tokens__overlap=["skill:python", "skill:go"])
+
+        self.assertEqual(list(matched), [self.one_match])
+
+
+class BackfillFeedTokensTests(BaseAPITestCase):
+    def test_backfill_copies_targets_into_tokens(self):
+        event = FeedEvent.objects.create(event_type=FeedEvent.EventType.INTERNSHIP_CREATED)
+        untargeted = FeedEvent.objects.create(
+            event_type=FeedEvent.EventType.INTERNSHIP_CREATED, target_tokens=["skill:stale"]
+        )
+        FeedTarget.objects.create(event=event, target_type="skill", target_value="python")
+        FeedTarget.objects.create(event=event, target_type="industry", target_value="fintech")
+
+        call_command("backfill_feed_tokens", "--chunk-size", "1", stdout=StringIO())
+
+        event.refresh_from_db()
+        untargeted.refresh_from_db()
+        self.assertEqual(event.target_tokens, ["skill:python", "industry:fintech"])
+        self.assertEqual(untargeted.target_tokens, [])
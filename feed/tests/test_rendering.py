@@ -0,0 +1,87 @@
+import json
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+
+from feed import rendering
+from feed.models import FeedEvent
+from feed.serializers import FeedEventSerializer
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+@override_settings(FEED_SUPPRESS_SEEN=False)
+class PrerenderedFeedTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = self._create_student()
+        self.events = []
+        for score in range(30, 0, -1):
+            event = FeedEvent.objects.create(
+                event_type=FeedEvent.EventType.EVENT_CREATED,
+                score=score,
+                data={"title": f"Event {score}", "alumni": {"sqid": f"a{score % 4}"}},
+            )
+            event.rendered = rendering.render_event(event)
+            event.save(update_fields=["rendered"])
+            self.events.append(event)
+
+    def _walk(self):
+        headers = self._auth_header(self.student)
+        pages = []
+        url = "/api/feed"
+        while url:
+            cache.clear()
+            body = json.loads(self.client.get(url, **headers).content)
+            pages.append(body["results"])
+            url = body["next"]
+        return pages
+
+    def test_item_matches_serializer_output(self):
+        event = self.events[0]
+
+        self.assertEqual(
+            json.loads(rendering.item(event, event.rendered)), FeedEventSerializer(event).data
+        )
+
+    def test_item_uses_live_score(self):
+        event = self.events[0]
+        FeedEvent.objects.filter(id=event.id).update(score=99)
+        row = rendering.as_rows(FeedEvent.objects.filter(id=event.id)).get()
+
+        self.assertEqual(json.loads(rendering.item(row, row.rendered))["score"], 99)
+
+    def test_pages_match_the_serializer_path(self):
+        expected = self._walk()
+
+        with override_settings(FEED_PRERENDERED_PAYLOADS=True):
+            actual = self._walk()
+
+        self.assertEqual(actual, expected)
+
+    @override_settings(FEED_PRERENDERED_PAYLOADS=True)
+    def test_missing_payloads_are_rendered_on_the_fly(self):
+        FeedEvent.objects.update(rendered="")
+
+        first = self._walk()[0]
+
+        self.assertEqual(first[0], FeedEventSerializer(self.events[0]).data)
+
+    @override_settings(FEED_PRERENDERED_PAYLOADS=True)
+    @patch("feed.timelines.read_page")
+    def test_timeline_pages_are_served_as_rows(self, mock_read_page):
+        mock_read_page.return_value = [event.id for event in self.events[:21]]
+
+        resp = self.client.get("/api/feed", **self._auth_header(self.student))
+
+        results = json.loads(resp.content)["results"]
+        self.assertEqual([item["sqid"] for item in results], [e.sqid for e in self.events[:20]])
+
+    def test_backfill_command_renders_missing_payloads(self):
+        FeedEvent.objects.update(rendered="")
+
+        call_command("render_feed_payloads", "--chunk-size", "7", stdout=StringIO())
+
+        self.assertFalse(FeedEvent.objects.filter(rendered="").exists())
@@ -0,0 +1,98 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from core.models import User
+from feed import scoring
+from feed.models import FeedEvent, FeedImpression
+from feed.tasks import create_feed_event_task
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+class ComputeScoreTests(TestCase):
+    def test_score_halves_every_half_life(self):
+        fresh = scoring.compute_score(FeedEvent.EventType.INTERNSHIP_CREATED, age_hours=0)
+        aged = scoring.compute_score(FeedEvent.EventType.INTERNSHIP_CREATED, age_hours=48)
+
+        self.assertEqual(aged, fresh // 2)
+
+    def test_engagement_raises_score(self):
+        quiet = scoring.compute_score(FeedEvent.EventType.EVENT_CREATED, age_hours=5)
+        busy = scoring.compute_score(
+            FeedEvent.EventType.EVENT_CREATED, age_hours=5, impressions=40, applications=6
+        )
+
+        self.assertGreater(busy, quiet)
+
+
+@override_settings(FEED_SCORE_CHUNK_SIZE=2)
+class RescoreEventsTests(TestCase):
+    def setUp(self):
+        self.now = timezone.now()
+        self.user = User.objects.create_user(email="u@test.com", role=User.Role.STUDENT)
+
+    def _make_event(self, age_hours, score=0):
+        event = FeedEvent.objects.create(event_type=FeedEvent.EventType.INTERNSHIP_CREATED, score=score)
+        FeedEvent.objects.filter(id=event.id).update(created_at=self.now - timedelta(hours=age_hours))
+        return event
+
+    def test_only_events_inside_the_window_are_rescored(self):
+        recent = self._make_event(age_hours=1)
+        old = self._make_event(age_hours=24 * 30, score=7)
+
+        scoring.rescore_events(now=self.now)
+
+        recent.refresh_from_db()
+        old.refresh_from_db()
+        self.assertEqual(
+            recent.score, scoring.compute_score(FeedEvent.EventType.INTERNSHIP_CREATED, age_hours=1)
+        )
+        self.assertEqual(old.score, 7)
+
+    def test_impressions_feed_into_the_score(self):
+        seen = self._make_event(age_hours=1)
+        unseen = self._make_event(age_hours=1)
+        FeedImpression.objects.create(user=self.user, event=seen)
+
+        scoring.rescore_events(now=self.now)
+
+        seen.refresh_from_db()
+        unseen.refresh_from_db()
+        self.assertGreater(seen.score, unseen.score)
+
+    def test_unchanged_scores_are_not_written(self):
+        for _ in range(3):
+            self._make_event(age_hours=2)
+        scoring.rescore_events(now=self.now)
+
+        with CaptureQueriesContext(connection) as queries:
+            stats = scoring.rescore_events(now=self.now)
+
+        self.assertEqual(stats["scanned"], 3)
+        self.assertEqual(stats["updated"], 0)
+        self.assertFalse(any(q["sql"].startswith("UPDATE") for q in queries.captured_queries))
+
+    @patch("feed.scoring.page_cache.bump_generation")
+    @patch("feed.scoring.timelines.schedule_rebuild")
+    def test_changed_scores_refresh_timelines_and_cached_pages(self, mock_rebuild, mock_bump):
+        self._make_event(age_hours=3)
+
+        scoring.rescore_events(now=self.now)
+
+        self.assertEqual(mock_rebuild.call_count, len(User.Role.values))
+        mock_bump.assert_called_once_with(FeedEvent.Audience.PUBLIC)
+
+
+class CreateFeedEventScoreTests(BaseAPITestCase):
+    def test_new_events_start_at_their_fresh_score(self):
+        internship = self.make_internship(self._create_alumnus())
+
+        create_feed_event_task(FeedEvent.EventType.INTERNSHIP_CREATED, internship.id, "internship", {})
+
+        event = FeedEvent.objects.get()
+        self.assertEqual(event.score, scoring.initial_score(FeedEvent.EventType.INTERNSHIP_CREATED))
+        self.assertEqual((event.related_model, event.related_object_id), ("internship", internship.id))
@@ -0,0 +1,150 @@
+from unittest.mock import MagicMock, patch
+
+import fakeredis
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from core.models import User
+from feed.models import FeedEvent, FeedImpression
+from feed.seen import SeenFilter
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+class SeenFilterTests(TestCase):
+    def setUp(self):
+        self.client = fakeredis.FakeRedis()
+        self.user = User.objects.create_user(email="u@test.com", role=User.Role.STUDENT)
+
+    def _filter(self):
+        return SeenFilter(self.user.id, client=self.client)
+
+    def _impressions(self, count):
+        events = FeedEvent.objects.bulk_create(
+            [FeedEvent(event_type=FeedEvent.EventType.EVENT_CREATED) for _ in range(count)]
+        )
+        FeedImpression.objects.bulk_create([FeedImpression(user=self.user, event=event) for event in events])
+        return [event.id for event in events]
+
+    def test_positions_are_deterministic_and_in_range(self):
+        seen_filter = SeenFilter(1, client=MagicMock())
+
+        positions = seen_filter.positions(42)
+
+        self.assertEqual(positions, seen_filter.positions(42))
+        self.assertEqual(len(positions), seen_filter.hashes)
+        self.assertTrue(all(0 <= p < seen_filter.bits for p in positions))
+
+    def test_rebuild_loads_impressions_and_marks_the_filter_built(self):
+        event_ids = self._impressions(3)
+        seen_filter = self._filter()
+
+        self.assertEqual(seen_filter.rebuild(), 3)
+
+        self.assertEqual(seen_filter.seen([*event_ids, 10**9]), set(event_ids))
+
+    def test_cold_filter_schedules_rebuild(self):
+        seen_filter = self._filter()
+
+        with patch.object(SeenFilter, "schedule_rebuild") as mock_rebuild:
+            self.assertIsNone(seen_filter.seen([1]))
+            seen_filter.add([1])
+
+        mock_rebuild.assert_called_once()
+        self.assertFalse(self.client.exists(seen_filter.key))
+
+    def test_added_events_are_seen_and_counted_once(self):
+        seen_filter = self._filter()
+        seen_filter.rebuild()
+
+        seen_filter.add([1, 2])
+        seen_filter.add([2, 3])
+
+        self.assertEqual(seen_filter.seen([1, 2, 3, 4]), {1, 2, 3})
+        count = self.client.bitfield(seen_filter.key).get("u32", seen_filter.count_offset).execute()
+        self.assertEqual(count, [3])
+
+    @override_settings(FEED_SEEN_FILTER_BITS=1024, FEED_SEEN_FILTER_CAPACITY=2)
+    def test_full_filter_rotates_into_the_previous_generation(self):
+        seen_filter = self._filter()
+        seen_filter.rebuild()
+
+        seen_filter.add([1, 2])
+        seen_filter.add([3])
+        self.assertEqual(seen_filter.seen([1, 2, 3]), {1, 2, 3})
+
+        # The second rotation drops the first generation.
+        seen_filter.add([4])
+        seen_filter.add([5])
+        self.assertEqual(seen_filter.seen([1, 2, 3, 4, 5]), {3, 4, 5})
+
+    @override_settings(FEED_SEEN_FILTER_CAPACITY=2)
+    def test_rebuild_splits_recent_impressions_into_two_generations(self):
+        self._impressions(5)
+        newest = list(
+            FeedImpression.objects.filter(user=self.user).order_by("-seen_at", "-id").values_list("event_id", flat=True)
+        )
+        seen_filter = self._filter()
+
+        self.assertEqual(seen_filter.rebuild(), 4)
+
+        self.assertEqual(seen_filter.seen(newest), set(newest[:4]))
+
+
+class SeenSuppressionFeedTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = self._create_student()
+        self.events = [
+            FeedEvent.objects.create(event_type=FeedEvent.EventType.INTERNSHIP_CREATED, score=score)
+            for score in range(45, 0, -1)
+        ]
+        # Every third event has been seen already.
+        self.seen_ids = {event.id for event in self.events[::3]}
+
+    @patch("feed.views.SeenFilter")
+    def test_seen_events_are_skipped_across_pages(self, mock_filter_class):
+        seen_filter = mock_filter_class.return_value
+        seen_filter.exclude = lambda candidates: {c.id for c in candidates if c.id in self.seen_ids}
+
+        headers = self._auth_header(self.student)
+        first = self.client.get("/api/feed", **headers)
+        second = self.client.get(first.data["next"], **headers)
+
+        shown = [item["sqid"] for item in first.data["results"] + second.data["results"]]
+        expected = [event.sqid for event in self.events if event.id not in self.seen_ids]
+        self.assertEqual(shown, expected)
+        self.assertIsNone(second.data["next"])
+
+    @patch("feed.views.SeenFilter")
+    def test_returning_viewer_gets_full_pages_past_a_seen_window(self, mock_filter_class):
+        older = [
+            FeedEvent.objects.create(event_type=FeedEvent.EventType.INTERNSHIP_CREATED, score=-score)
+            for score in range(1, 71)
+        ]
+        # The first window (page size x FEED_SEEN_OVERFETCH) has been seen entirely.
+        seen_ids = {event.id for event in self.events + older[:40]}
+        seen_filter = mock_filter_class.return_value
+        seen_filter.exclude = lambda candidates: {c.id for c in candidates if c.id in seen_ids}
+
+        headers = self._auth_header(self.student)
+        first = self.client.get("/api/feed", **headers)
+        second = self.client.get(first.data["next"], **headers)
+
+        self.assertEqual([item["sqid"] for item in first.data["results"]], [e.sqid for e in older[40:60]])
+        self.assertEqual([item["sqid"] for item in second.data["results"]], [e.sqid for e in older[60:]])
+        self.assertIsNone(second.data["next"])
+
+    @patch("feed.views.SeenFilter")
+    def test_shown_events_are_recorded(self, mock_filter_class):
+        self.client.get("/api/feed", **self._auth_header(self.student))
+
+        shown_ids = [event.id for event in self.events[:20]]
+        mock_filter_class.return_value.add.assert_called_once_with(shown_ids)
+        self.assertEqual(FeedImpression.objects.filter(user=self.student).count(), 20)
+
+    @override_settings(FEED_SUPPRESS_SEEN=False)
+    @patch("feed.views.SeenFilter")
+    def test_suppression_can_be_disabled(self, mock_filter_class):
+        resp = self.client.get("/api/feed", **self._auth_header(self.student))
+
+        self.assertEqual(resp.data["results"][0]["sqid"], self.events[0].sqid)
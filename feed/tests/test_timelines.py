@@ -0,0 +1,93 @@
+from base64 import b64decode
+from unittest.mock import MagicMock, patch
+from urllib import parse
+
+from django.core.cache import cache
+
+from core.models import User
+from feed import timelines
+from feed.models import FeedEvent
+from futaverse.tests_helpers import BaseAPITestCase
+
+
+class TimelineScoreTests(BaseAPITestCase):
+    def test_higher_score_sorts_first(self):
+        self.assertGreater(timelines.timeline_score(3, 0.9), timelines.timeline_score(2, 0.0))
+
+    def test_lower_seed_sorts_first_within_score(self):
+        self.assertGreater(timelines.timeline_score(3, 0.1), timelines.timeline_score(3, 0.8))
+
+    def test_bucket_stays_below_next_integer(self):
+        self.assertLess(timelines.timeline_score(3, 0.0), 4)
+        self.assertGreater(timelines.timeline_score(3, 0.999), 3)
+
+
+class TimelinePushTests(BaseAPITestCase):
+    @patch("feed.timelines.get_redis")
+    def test_public_event_fans_out_to_every_role(self, mock_get_redis):
+        push = MagicMock()
+        mock_get_redis.return_value.register_script.return_value = push
+        event = FeedEvent.objects.create(
+            event_type=FeedEvent.EventType.EVENT_CREATED, audience=FeedEvent.Audience.PUBLIC
+        )
+
+        timelines.push_to_timelines(event)
+
+        keys = {call.kwargs["keys"][0] for call in push.call_args_list}
+        self.assertEqual(keys, {timelines.timeline_key(role) for role in User.Role.values})
+
+    @patch("feed.timelines.get_redis")
+    def test_targeted_event_only_reaches_its_audience(self, mock_get_redis):
+        push = MagicMock()
+        mock_get_redis.return_value.register_script.return_value = push
+        event = FeedEvent.objects.create(
+            event_type=FeedEvent.EventType.EVENT_CREATED, audience=FeedEvent.Audience.STUDENT
+        )
+
+        timelines.push_to_timelines(event)
+
+        push.assert_called_once()
+        self.assertEqual(push.call_args.kwargs["keys"], ["feed:timeline:student"])
+
+
+class TimelineFeedViewTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.student = self._create_student()
+        self.events = [
+            FeedEvent.objects.create(
+                event_type=FeedEvent.EventType.INTERNSHIP_CREATED, score=score, shuffle_seed=0.5
+            )
+            for score in range(25)
+        ]
+
+    @patch("feed.timelines.read_page")
+    def test_page_is_hydrated_in_timeline_order(self, mock_read_page):
+        ordered = sorted(self.events, key=lambda e: -e.score)
+        mock_read_page.return_value = [e.id for e in ordered[:21]]
+
+        resp = self.client.get("/api/feed", **self._auth_header(self.student))
+
+        self.assertEqual([item["sqid"] for item in resp.data["results"]], [e.sqid for e in ordered[:20]])
+        mock_read_page.assert_called_once_with(User.Role.STUDENT, None, 0, 61)
+
+        cursor = parse.parse_qs(parse.urlparse(resp.data["next"]).query)["cursor"][0]
+        tokens = parse.parse_qs(b64decode(cursor).decode())
+        self.assertEqual(tokens["p"], [str(ordered[19].score)])
+
+    @patch("feed.timelines.read_page", return_value=None)
+    def test_cold_timeline_falls_back_to_postgres(self, mock_read_page):
+        resp = self.client.get("/api/feed", **self._auth_header(self.student))
+
+        self.assertEqual(len(resp.data["results"]), 20)
+        self.assertEqual(resp.data["results"][0]["score"], 24)
+
+    @patch("feed.timelines.remove_from_timelines")
+    @patch("feed.timelines.read_page")
+    def test_stale_ids_are_evicted_and_postgres_serves_the_page(self, mock_read_page, mock_remove):
+        mock_read_page.return_value = [self.events[0].id, 999999]
+
+        resp = self.client.get("/api/feed", **self._auth_header(self.student))
+
+        mock_remove.assert_called_once_with([999999])
+        self.assertEqual(len(resp.data["results"]), 20)
@@ -0,0 +1,180 @@
+"""
+Materialized feed timelines kept in Redis sorted sets.
+
+Each viewer role gets one sorted set holding the ids of the events it may see
+(its own audience plus public). Members are scored so that ZREVRANGEBYSCORE
+returns them in the same (-score, shuffle_seed) order FeedCursorPagination uses,
+which lets a DRF cursor be served from either Redis or Postgres.
+"""
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django_q.tasks import async_task
+from redis.exceptions import RedisError
+
+from core.models import User
+from futaverse.utils.redis_client import get_redis
+
+from .models import FeedEvent
+
+logger = logging.getLogger(__name__)
+
+TIMELINE_KEY = "feed:timeline:{role}"
+REBUILD_LOCK_KEY = "feed_timeline_rebuild_{role}"
+
+# Only add to timelines that already exist: a cold key must be rebuilt in full,
+# otherwise it would look warm while holding just the newest events.
+PUSH_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[2])
+    redis.call('ZREMRANGEBYRANK', KEYS[1], 0, -(tonumber(ARGV[3]) + 1))
+    return 1
+end
+return 0
+"""
+
+
+def timeline_key(role):
+    return TIMELINE_KEY.format(role=role)
+
+
+def timeline_score(score, shuffle_seed):
+    """
+    Pack (score, shuffle_seed) into one float in (score, score + 0.5]. A lower
+    seed sorts first within a score bucket, and every member of bucket ``n`` stays
+    below ``n + 1`` so a DRF ``score < position`` filter maps to ``(position``.
+    """
+    return score + (1 - (shuffle_seed or 0)) / 2
+
+
+def roles_for_audience(audience):
+    if audience == FeedEvent.Audience.PUBLIC:
+        return list(User.Role.values)
+
+    return [audience]
+
+
+def push_to_timelines(event):
+    client = get_redis()
+    if client is None:
+        return
+
+    push = client.register_script(PUSH_SCRIPT)
+    member_score = timeline_score(event.score, event.shuffle_seed)
+
+    try:
+        for role in roles_for_audience(event.audience):
+            push(
+                keys=[timeline_key(role)],
+                args=[member_score, event.id, settings.FEED_TIMELINE_MAX_LENGTH],
+            )
+    except RedisError as e:
+        logger.warning("Feed timeline push failed for event %s: %s", event.id, e)
+
+
+def remove_from_timelines(event_ids, roles=None):
+    client = get_redis()
+    if client is None or not event_ids:
+        return
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        for role in roles or User.Role.values:
+            pipe.zrem(timeline_key(role), *event_ids)
+        pipe.execute()
+    except RedisError as e:
+        logger.warning("Feed timeline removal failed: %s", e)
+
+
+def rebuild_timeline(role):
+    client = get_redis()
+    if client is None:
+        return 0
+
+    rows = (
+        FeedEvent.objects.filter(
+            is_active=True, audience__in=[role, FeedEvent.Audience.PUBLIC]
+        )
+        .order_by("-score", "shuffle_seed", "id")
+        .values_list("id", "score", "shuffle_seed")[: settings.FEED_TIMELINE_MAX_LENGTH]
+    )
+    mapping = {event_id: timeline_score(score, seed) for event_id, score, seed in rows}
+
+    if not mapping:
+        return 0
+
+    key = timeline_key(role)
+    staging_key = f"{key}:rebuild"
+
+    pipe = client.pipeline()
+    pipe.delete(staging_key)
+    pipe.zadd(staging_key, mapping)
+    pipe.rename(staging_key, key)
+    pipe.execute()
+
+    return len(mapping)
+
+
+def schedule_rebuild(role):
+    # cache.add is atomic, so concurrent cold reads enqueue a single rebuild.
+    if cache.add(REBUILD_LOCK_KEY.format(role=role), True, timeout=60):
+        async_task("feed.tasks.rebuild_timeline_task", role)
+
+
+def read_page(role, position, offset, limit):
+    """
+    Return up to ``limit`` event ids after the cursor, or None when the page
+    can't be served from Redis (unavailable, cold, or past the trimmed tail).
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    try:
+        max_score = f"({int(position)}" if position is not None else "+inf"
+    except ValueError:
+        return None
+
+    key = timeline_key(role)
+
+    try:
+        pipe = client.pipeline(transaction=False)
+        pipe.exists(key)
+        pipe.zcard(key)
+        pipe.zrevrangebyscore(key, max_score, "-inf", start=offset, num=limit)
+        exists, size, members = pipe.execute()
+    except RedisError as e:
+        logger.warning("Feed timeline read failed for %s: %s", role, e)
+        return None
+
+    if not exists:
+        schedule_rebuild(role)
+        return None
+
+    if len(members) < limit and size >= settings.FEED_TIMELINE_MAX_LENGTH:
+        # The page runs past what the timeline retains; Postgres has the rest.
+        return None
+
+    return [int(member) for member in members]
+
+
+def hydrate(event_ids, queryset=None):
+    """
+    Load events for ``event_ids`` with one ``id__in`` query, preserving order.
+    ``queryset`` narrows what is loaded (e.g. to rows); it defaults to active
+    events. Returns None if any id is stale (deactivated or removed) after
+    evicting it.
+    """
+    if queryset is None:
+        queryset = FeedEvent.objects.filter(is_active=True)
+
+    events = {event.id: event for event in queryset.filter(id__in=event_ids)}
+    stale = [event_id for event_id in event_ids if event_id not in events]
+
+    if stale:
+        remove_from_timelines(stale)
+        return None
+
+    return [events[event_id] for event_id in event_ids]
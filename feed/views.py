@@ -1,42 +1,89 @@
-from drf_spectacular.utils import extend_schema
+from functools import cached_property, partial
+
+from django.conf import settings
+from django.http import HttpResponse
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
-from .models import FeedEvent
+from . import page_cache, rendering
+from .impressions import buffer_impressions
+from .seen import SeenFilter
 from .serializers import FeedCursorPagination, FeedEventSerializer
+from .services import FeedRanking, feed_queryset_for, personalize_feed
 
 
-@extend_schema(tags=["Feed"], summary="Get feed for user (student, alumnus)")
+@extend_schema(
+    tags=["Feed"],
+    summary="Get feed for user (student, alumnus)",
+    parameters=[
+        OpenApiParameter(
+            name="ranking",
+            type=str,
+            enum=FeedRanking.choices,
+            required=False,
+            description="'personalized' ranks events matching the viewer's profile first",
+        ),
+    ],
+)
 class FeedView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     pagination_class = FeedCursorPagination
     serializer_class = FeedEventSerializer
 
+    def get_ranking(self):
+        ranking = self.request.query_params.get("ranking", settings.FEED_DEFAULT_RANKING)
+        return ranking if ranking in FeedRanking.choices else FeedRanking.SCORE
+
     def get_queryset(self):
         user = self.request.user
-        queryset = FeedEvent.objects.filter(
-            is_active=True, audience__in=[user.role, FeedEvent.Audience.PUBLIC]
+        queryset = feed_queryset_for(user)
+
+        if self.get_ranking() == FeedRanking.PERSONALIZED:
+            queryset = personalize_feed(queryset, user.profile)
+
+        return queryset
+
+    def paginate_queryset(self, queryset):
+        if settings.FEED_SUPPRESS_SEEN and self.seen_filter.client is not None:
+            self.paginator.exclude = self.seen_filter.exclude
+
+        # Score-ranked pages come from the role's Redis timeline when it's warm,
+        # and their candidate windows are shared by the role (see feed.page_cache).
+        if self.get_ranking() == FeedRanking.SCORE:
+            kind = "rows" if settings.FEED_PRERENDERED_PAYLOADS else "events"
+            self.paginator.wrap_fetch = partial(page_cache.cached_fetch, self.request.user.role, kind)
+
+            page = self.paginator.paginate_timeline(
+                self.request.user.role, self.request, view=self, queryset=queryset
+            )
+            if page is not None:
+                return page
+
+        return super().paginate_queryset(queryset)
+
+    def list(self, request, *args, **kwargs):
+        if settings.FEED_PRERENDERED_PAYLOADS:
+            response = self.list_prerendered()
+        else:
+            response = super().list(request, *args, **kwargs)
+
+        self.record_impressions([event.id for event in self.paginator.page])
+        return response
+
+    def list_prerendered(self):
+        queryset = rendering.as_rows(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        content = rendering.render_page(
+            page, self.paginator.get_next_link(), self.paginator.get_previous_link()
         )
-        return queryset.order_by("-score", "shuffle_seed")
-
-    # def list(self, request, *args, **kwargs):
-    #     response = super().list(request, *args, **kwargs)
-    #
-    #     print(response.data)
-    #
-    #     ids = [item['sqid'] for item in response.data['results']]
-    #     if ids:
-    #         record_impressions_task.delay(request.user.id, ids)
-    #
-    #     return response
-
-    # def list(self, request, *args, **kwargs):
-    #     queryset = self.filter_queryset(self.get_queryset())
-    #     page = self.paginate_queryset(queryset)
-
-    #     ids = [event.id for event in page]
-    #     if ids:
-    #         async_task("feed.tasks.record_impressions_task", request.user.id, ids)
-
-    #     serializer = self.get_serializer(page, many=True)
-    #     return self.get_paginated_response(serializer.data)
+        return HttpResponse(content, content_type="application/json")
+
+    def record_impressions(self, event_ids):
+        if event_ids:
+            self.seen_filter.add(event_ids)
+            buffer_impressions(self.request.user.id, event_ids)
+
+    @cached_property
+    def seen_filter(self):
+        return SeenFilter(self.request.user.id)
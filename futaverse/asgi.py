@@ -3,6 +3,14 @@ ASGI config for futaverse project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+This is the deployment profile for the server-sent event stream mounted at
+``/events/`` (``start-events.sh``, the ``events`` compose service and the
+``futaverse-events`` Render service). Each stream is a coroutine on the
+process's event loop instead of a pinned gunicorn sync worker, and all streams
+in a process share one Redis pub/sub subscription (see
+futaverse.utils.sse_listener). The API itself keeps running under gunicorn
+with futaverse.wsgi.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -14,3 +22,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'futaverse.settings')
 
 application = get_asgi_application()
+
+# Imported once settings are configured.
+from futaverse.utils import sse_listener
+
+sse_listener.install()
@@ -238,3 +238,114 @@ Q_CLUSTER = {
 # Engagement auto-acknowledgement delays
 ENGAGEMENT_ACKNOWLEDGEMENT_REMINDER_HOURS = 1 if ENVIRONMENT == "development" else 24
 ENGAGEMENT_AUTO_ACKNOWLEDGE_HOURS = 1 if ENVIRONMENT == "development" else 48
+
+# Feed ranking: "score" (global -score order) or "personalized" (profile target matches first)
+FEED_DEFAULT_RANKING = os.getenv("FEED_DEFAULT_RANKING", "score")
+
+# Where personalized ranking reads event targets: "table" (FeedTarget rows) or "tokens"
+# (FeedEvent.target_tokens + GIN index). Run `manage.py backfill_feed_tokens` before "tokens".
+FEED_TARGET_STORAGE = os.getenv("FEED_TARGET_STORAGE", "table")
+
+# Feed scoring: type weight + engagement, halved every FEED_SCORE_HALF_LIFE_HOURS. The
+# scheduled rescore only touches events created within FEED_SCORE_WINDOW_DAYS.
+FEED_SCORE_HALF_LIFE_HOURS = 48
+FEED_SCORE_WINDOW_DAYS = 14
+FEED_SCORE_CHUNK_SIZE = 500
+
+# Personalized ranking boosts at most this many matching events (best matches first, all
+# created within FEED_SCORE_WINDOW_DAYS), so its cost doesn't grow with feed history
+FEED_PERSONALIZED_MAX_MATCHES = 1000
+
+# Diversity re-ranking: per-page caps on one event type / one author, applied greedily
+# over a window of FEED_DIVERSITY_OVERFETCH x page size candidates
+FEED_DIVERSITY_ENABLED = True
+FEED_DIVERSITY_OVERFETCH = 3
+FEED_DIVERSITY_MAX_PER_TYPE = 8
+FEED_DIVERSITY_MAX_PER_AUTHOR = 3
+
+# Serve feed pages from FeedEvent.rendered (values_list + string assembly) instead of
+# FeedEventSerializer. Run `manage.py render_feed_payloads` before enabling.
+FEED_PRERENDERED_PAYLOADS = os.getenv("FEED_PRERENDERED_PAYLOADS", "false").lower() == "true"
+
+# Max event ids kept per role in the Redis feed timelines; deeper pages read Postgres
+FEED_TIMELINE_MAX_LENGTH = 1000
+
+# Score-ranked candidate windows cached per role and cursor (0 disables); seen suppression
+# and diversity are applied per viewer. New events bump a per-role generation so this TTL
+# only bounds staleness from edits and deactivations
+FEED_PAGE_CACHE_TTL = 60
+
+# Seen-item suppression: per-user Bloom filter in Redis (2**16 bits = 8 KiB, ~0.5% false
+# positives at 5k impressions with 4 hashes). A filter holding FEED_SEEN_FILTER_CAPACITY items
+# is rotated out as the previous generation, so two are checked (~1% false positives).
+# Pages over-fetch to backfill suppressed rows, reading up to FEED_SEEN_MAX_WINDOWS windows
+# when most of one has been seen.
+FEED_SUPPRESS_SEEN = True
+FEED_SEEN_FILTER_BITS = 2**16
+FEED_SEEN_FILTER_HASHES = 4
+FEED_SEEN_FILTER_CAPACITY = 5000
+FEED_SEEN_FILTER_TTL = 60 * 60 * 24 * 30
+FEED_SEEN_OVERFETCH = 3
+FEED_SEEN_MAX_WINDOWS = 5
+
+# Impression ingestion: requests append to a Redis list, a scheduled task drains it
+FEED_IMPRESSION_FLUSH_BATCH = 5000
+FEED_IMPRESSION_FLUSH_MAX_BATCHES = 20
+
+# Unread notification counters in Redis: idle counters expire and are rebuilt on read;
+# the scheduled drift check compares live counters with Postgres in batches
+NOTIFICATION_UNREAD_COUNTER_TTL = 60 * 60 * 24 * 7
+NOTIFICATION_DRIFT_CHECK_BATCH = 500
+
+# Broadcast fan-out: recipients are inserted and published in chunks, one transaction each;
+# unfinished broadcasts with no progress for the stall timeout are re-enqueued
+NOTIFICATION_BROADCAST_CHUNK_SIZE = 1000
+NOTIFICATION_BROADCAST_STALL_MINUTES = 10
+
+# SSE: one frame per user channel per batch, published in one Redis pipeline. A window > 0
+# buffers notification ids in Redis and flushes them after it, collapsing per-user bursts
+NOTIFICATION_SSE_COALESCE_SECONDS = int(os.getenv("NOTIFICATION_SSE_COALESCE_SECONDS", "0"))
+
+# Notification coalescing: an unread repeat (same user and title) inside the window bumps the
+# existing row's count instead of adding a row. 0 disables it
+NOTIFICATION_COALESCE_WINDOW_SECONDS = int(os.getenv("NOTIFICATION_COALESCE_WINDOW_SECONDS", "600"))
+
+# Optional email digest of unread low-priority notifications, sent by a scheduled task
+NOTIFICATION_DIGEST_ENABLED = os.getenv("NOTIFICATION_DIGEST_ENABLED", "false").lower() == "true"
+
+# Notification retention: read rows expire N days after being read, unread rows N days after
+# creation. The hourly purge deletes (or archives) them in small id ranges, sleeping between
+# ranges, and stops after the time budget (under the django-q task timeout) to resume next run
+NOTIFICATION_RETENTION_READ_DAYS = 90
+NOTIFICATION_RETENTION_UNREAD_DAYS = 365
+NOTIFICATION_RETENTION_MODE = os.getenv("NOTIFICATION_RETENTION_MODE", "delete")
+NOTIFICATION_PURGE_CHUNK_SIZE = 1000
+NOTIFICATION_PURGE_SLEEP_SECONDS = 0.1
+NOTIFICATION_PURGE_MAX_SECONDS = 45
+
+# "Mark all read" moves a per-user watermark; a background job then stores is_read for the
+# covered rows in chunks. The sweep for pending watermarks stops after the time budget
+NOTIFICATION_READ_MARK_CHUNK_SIZE = 1000
+NOTIFICATION_READ_MARK_MAX_SECONDS = 45
+
+# SSE replay: each notification channel keeps its last N events in a capped Redis stream, so a
+# reconnecting client with Last-Event-ID gets only what it missed; idle buffers expire
+EVENTSTREAM_STORAGE_CLASS = "futaverse.utils.sse_storage.RedisStreamStorage"
+EVENTSTREAM_CHANNELMANAGER_CLASS = "futaverse.utils.sse_storage.ReplayChannelManager"
+EVENTSTREAM_REPLAY_MAXLEN = 100
+EVENTSTREAM_REPLAY_TTL_SECONDS = 60 * 60
+
+# Ticket inventory: seats are reserved atomically in Redis. A paid checkout holds its seat this
+# long before it goes back on sale; the scheduled reconciliation rebuilds stock from purchases
+TICKET_RESERVATION_TTL_SECONDS = 15 * 60
+
+# Google Calendar attendee sync: purchases mark the event dirty and one job per window sends
+# the final attendee list in a single PATCH
+CALENDAR_SYNC_DEBOUNCE_SECONDS = int(os.getenv("CALENDAR_SYNC_DEBOUNCE_SECONDS", "60"))
+
+# Google Calendar batch requests: changes sent per round trip (Google's documented limit is 50)
+CALENDAR_BATCH_SIZE = 50
+
+# Ticket confirmation emails: a claim older than this belongs to a worker killed mid-send
+# and may be taken again. Keep it at or above the django-q task timeout.
+TICKET_EMAIL_CLAIM_TIMEOUT_SECONDS = Q_CLUSTER["timeout"]
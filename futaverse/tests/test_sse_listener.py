@@ -0,0 +1,24 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from django.test import SimpleTestCase
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from futaverse.utils.sse_listener import SupervisedRedisListener
+
+
+class SupervisedRedisListenerTests(SimpleTestCase):
+    def test_resubscribes_with_backoff_after_connection_errors(self):
+        listener = SupervisedRedisListener()
+        listener.redis_client = MagicMock()
+        listener.listen = AsyncMock(
+            side_effect=[RedisConnectionError("gone"), ConnectionError("reset"), asyncio.CancelledError()]
+        )
+
+        with patch("futaverse.utils.sse_listener.asyncio.sleep", new=AsyncMock()) as sleep:
+            with self.assertRaises(asyncio.CancelledError):
+                asyncio.run(listener.start())
+
+        self.assertEqual(listener.listen.await_count, 3)
+        self.assertEqual([call.args[0] for call in sleep.await_args_list], [1, 2])
+        self.assertEqual(listener.redis_client.pubsub.call_count, 2)
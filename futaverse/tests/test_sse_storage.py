@@ -0,0 +1,63 @@
+from unittest.mock import MagicMock, patch
+
+from django.test import SimpleTestCase
+from django_eventstream.storage import EventDoesNotExist
+
+from futaverse.utils.sse_storage import RedisStreamStorage, ReplayChannelManager
+
+
+class RedisStreamStorageTests(SimpleTestCase):
+    def setUp(self):
+        self.client = MagicMock()
+        patcher = patch("futaverse.utils.sse_storage.eventstream.redis_client", self.client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.storage = RedisStreamStorage()
+
+    def _stream(self, current_id, entry_ids):
+        self.client.get.return_value = str(current_id).encode() if current_id else None
+        self.client.xrange.return_value = [
+            (f"{entry_id}-0".encode(), {b"type": b"new_notification", b"data": f'{{"n": {entry_id}}}'.encode()})
+            for entry_id in entry_ids
+        ]
+
+    def test_replays_only_events_after_last_id(self):
+        self._stream(5, [4, 5])
+
+        events = self.storage.get_events("user-abc", 3)
+
+        self.assertEqual([(e.id, e.type, e.data) for e in events], [(4, "new_notification", '{"n": 4}'), (5, "new_notification", '{"n": 5}')])
+        self.client.xrange.assert_called_once_with("eventstream:{user-abc}:events", min="4-0", count=100)
+
+    def test_caught_up_client_skips_the_stream_read(self):
+        self._stream(5, [])
+
+        self.assertEqual(self.storage.get_events("user-abc", 5), [])
+        self.client.xrange.assert_not_called()
+
+    def test_trimmed_or_expired_history_resets_the_stream(self):
+        # Oldest retained event is 4: events after 1 can't all be replayed.
+        self._stream(5, [4, 5])
+        with self.assertRaises(EventDoesNotExist) as ctx:
+            self.storage.get_events("user-abc", 1)
+        self.assertEqual(ctx.exception.current_id, 5)
+
+        # Counter expired and restarted below the client's id.
+        self._stream(2, [1, 2])
+        with self.assertRaises(EventDoesNotExist):
+            self.storage.get_events("user-abc", 9)
+
+    def test_append_events_numbers_frames_in_one_pipeline(self):
+        pipe = self.client.pipeline.return_value
+        pipe.execute.return_value = [3, 1]
+
+        ids = self.storage.append_events([("user-a", "new_notification", "{}"), ("user-b", "new_notification", "{}")])
+
+        self.assertEqual(ids, [3, 1])
+        pipe.execute.assert_called_once_with()
+
+    def test_only_notification_channels_are_reliable(self):
+        manager = ReplayChannelManager()
+
+        self.assertTrue(manager.is_channel_reliable("user-abc"))
+        self.assertFalse(manager.is_channel_reliable("loadtest-1"))
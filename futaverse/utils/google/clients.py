@@ -0,0 +1,51 @@
+"""
+Google Calendar API clients without discovery in the request path.
+
+``build("calendar", "v3", credentials=...)`` reads and parses the discovery
+document bundled with googleapiclient on every call, and every ``events()``
+on the result generates the resource's methods from it again. Neither
+depends on the user: the methods only turn arguments into an HttpRequest,
+and the HTTP transport is chosen when the request is executed.
+
+So the service is built once per process from the bundled document, and a
+per-user client is just an authorized transport passed to
+``execute(http=...)``.
+"""
+
+import threading
+from functools import cache
+
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.http import build_http
+
+# Generating a resource's methods fixes up the parsed document in place, so
+# the first builds must not run side by side.
+_build_lock = threading.RLock()
+
+
+@cache
+def calendar_service():
+    document = get_static_doc("calendar", "v3")
+    with _build_lock:
+        if document is None:
+            return build("calendar", "v3", http=build_http(), static_discovery=False)
+        return build_from_document(document, http=build_http())
+
+
+@cache
+def calendar_events():
+    """The shared Calendar v3 ``events`` resource. Build requests with it, never execute without ``http=``."""
+    with _build_lock:
+        return calendar_service().events()
+
+
+def new_calendar_batch(callback=None):
+    """A BatchHttpRequest for the Calendar API's batch endpoint."""
+    return calendar_service().new_batch_http_request(callback=callback)
+
+
+def authorized_http(credentials):
+    """An HTTP transport that signs requests with ``credentials`` (one per client; not thread-safe)."""
+    return AuthorizedHttp(credentials, http=build_http())
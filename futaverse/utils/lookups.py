@@ -0,0 +1,24 @@
+from django.db.models import Lookup
+
+
+class TokenOverlap(Lookup):
+    """
+    True when a JSON list of strings contains any of the given strings. On
+    Postgres this is the jsonb ``?|`` operator, which a GIN index can serve;
+    elsewhere it falls back to ``json_each``.
+    """
+
+    lookup_name = "overlap"
+    prepare_rhs = False
+
+    def as_postgresql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        return f"{lhs} ?| %s", [*lhs_params, list(self.rhs)]
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        placeholders = ", ".join(["%s"] * len(self.rhs))
+        return (
+            f"EXISTS (SELECT 1 FROM json_each({lhs}) WHERE json_each.value IN ({placeholders}))",
+            [*lhs_params, *self.rhs],
+        )
@@ -0,0 +1,17 @@
+import logging
+
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+
+def get_redis():
+    """
+    Return the raw Redis client behind the default cache, or None when the cache
+    is not Redis-backed (e.g. LocMemCache in tests). Callers treat None as
+    "Redis unavailable" and fall back to Postgres.
+    """
+    try:
+        return get_redis_connection("default")
+    except NotImplementedError:
+        return None
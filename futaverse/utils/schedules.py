@@ -0,0 +1,65 @@
+"""
+django-q schedule helpers: the migration operation that registers a periodic
+schedule, and debounced one-off tasks.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import migrations
+from django.utils import timezone
+from django_q.models import Schedule
+from django_q.tasks import async_task, schedule
+
+# Migrations that touch Schedule rows must run after django_q's own.
+DJANGO_Q_MIGRATION = ("django_q", "0019_alter_task_options_alter_ormq_key_alter_ormq_lock_and_more")
+
+
+def ensure_schedule(name, func, minutes):
+    """A RunPython operation that runs ``func`` every ``minutes``; reversing it deletes the schedule."""
+
+    def create_schedule(apps, schema_editor):
+        Schedule = apps.get_model("django_q", "Schedule")
+        Schedule.objects.update_or_create(
+            name=name,
+            defaults={
+                "func": func,
+                "schedule_type": "I",
+                "minutes": minutes,
+                "repeats": -1,
+            },
+        )
+
+    def delete_schedule(apps, schema_editor):
+        Schedule = apps.get_model("django_q", "Schedule")
+        Schedule.objects.filter(name=name).delete()
+
+    return migrations.RunPython(create_schedule, delete_schedule)
+
+
+def debounce(key, func, *args, window):
+    """
+    Run the task ``func(*args)`` once, ``window`` seconds after the first call
+    with ``key``; later calls inside the window ride along. Returns True if this
+    call scheduled the run. The task must ``clear_debounce(key)`` before reading
+    its input, so a call arriving while it runs schedules the next one. A window
+    of 0 runs the task right away.
+
+    The django-q scheduler polls on its own interval, so the effective window is
+    never shorter than that.
+    """
+    if not window:
+        async_task(func, *args)
+        return True
+
+    # cache.add is atomic (SET NX on Redis), so only the first call schedules.
+    # The flag outlives the run so a late scheduler doesn't get a second one.
+    if not cache.add(key, 1, timeout=window * 2):
+        return False
+
+    schedule(func, *args, schedule_type=Schedule.ONCE, next_run=timezone.now() + timedelta(seconds=window))
+    return True
+
+
+def clear_debounce(key):
+    cache.delete(key)
@@ -0,0 +1,54 @@
+"""
+Process-wide Redis listener for django_eventstream.
+
+django_eventstream keeps one pub/sub listener per process and fans each
+published event out to the in-process connections subscribed to its channel.
+The stock listener is started once, on the loop of the first streaming request,
+and stops for good if its Redis connection drops. Under the ASGI profile (one
+event loop per process, see futaverse.asgi) ``install()`` swaps in a listener
+that resubscribes with exponential backoff, so every connection keeps sharing
+the single subscription.
+"""
+
+import asyncio
+import logging
+import time
+
+from django_eventstream.views import RedisListener, get_listener_manager
+from redis.exceptions import RedisError
+
+logger = logging.getLogger(__name__)
+
+MAX_BACKOFF_SECONDS = 30
+# A subscription that lived this long was healthy; restart the backoff from 1s.
+HEALTHY_SECONDS = 60
+
+
+class SupervisedRedisListener(RedisListener):
+    async def start(self):
+        delay = 1
+        while True:
+            started = time.monotonic()
+            try:
+                await self.listen()
+            except asyncio.CancelledError:
+                raise
+            except (RedisError, OSError) as e:
+                logger.warning("Eventstream Redis listener lost its subscription: %s", e)
+
+            if time.monotonic() - started >= HEALTHY_SECONDS:
+                delay = 1
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, MAX_BACKOFF_SECONDS)
+            self.pubsub = self.redis_client.pubsub()
+
+
+def install():
+    """Replace the process's eventstream Redis listener before it is first started."""
+    manager = get_listener_manager()
+    if manager.redis_listener is None or manager.redis_listener_started:
+        return
+
+    if not isinstance(manager.redis_listener, SupervisedRedisListener):
+        manager.redis_listener = SupervisedRedisListener()
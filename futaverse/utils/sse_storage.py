@@ -0,0 +1,99 @@
+"""
+Replay buffer for the server-sent event stream.
+
+django_eventstream storage (EVENTSTREAM_STORAGE_CLASS) that keeps the last
+EVENTSTREAM_REPLAY_MAXLEN events of each reliable channel in a capped Redis
+stream, numbered by a per-channel counter. A reconnecting client sends
+``Last-Event-ID`` and gets only the events after it, replayed from the
+stream; if that id has already been trimmed or expired, django_eventstream
+sends ``stream-reset`` instead and only then does the client need to refetch
+its inbox. Both keys expire after EVENTSTREAM_REPLAY_TTL_SECONDS of silence.
+
+Only per-user notification channels are reliable (``ReplayChannelManager``),
+so ad-hoc channels are never buffered.
+"""
+
+from django.conf import settings
+from django_eventstream import eventstream
+from django_eventstream.channelmanager import DefaultChannelManager
+from django_eventstream.event import Event
+from django_eventstream.storage import EventDoesNotExist, StorageBase
+
+STREAM_KEY = "eventstream:{{{channel}}}:events"
+COUNTER_KEY = "eventstream:{{{channel}}}:id"
+
+# Number the event, append it to the capped stream and refresh both TTLs. A
+# stream that outlived its counter is dropped so ids never run backwards.
+APPEND_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    redis.call('DEL', KEYS[1])
+end
+local id = redis.call('INCR', KEYS[2])
+redis.call('XADD', KEYS[1], 'MAXLEN', '~', ARGV[1], id .. '-0', 'type', ARGV[2], 'data', ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+redis.call('EXPIRE', KEYS[2], ARGV[4])
+return id
+"""
+
+# Notification channels, see notifications.sse.channel_for.
+REPLAY_CHANNEL_PREFIX = "user-"
+
+
+class ReplayChannelManager(DefaultChannelManager):
+    def is_channel_reliable(self, channel):
+        return channel.startswith(REPLAY_CHANNEL_PREFIX)
+
+
+class RedisStreamStorage(StorageBase):
+    # django_eventstream caches one storage instance per thread; look the
+    # client up on use so it always follows the configured listener client.
+    @property
+    def client(self):
+        return eventstream.redis_client
+
+    def _append(self, channel, event_type, data, client=None):
+        return self.client.register_script(APPEND_SCRIPT)(
+            keys=[STREAM_KEY.format(channel=channel), COUNTER_KEY.format(channel=channel)],
+            args=[
+                settings.EVENTSTREAM_REPLAY_MAXLEN,
+                event_type,
+                data,
+                settings.EVENTSTREAM_REPLAY_TTL_SECONDS,
+            ],
+            client=client,
+        )
+
+    def append_event(self, channel, event_type, data):
+        return Event(channel, event_type, data, id=int(self._append(channel, event_type, data)))
+
+    def append_events(self, events):
+        """Append ``[(channel, event_type, data)]`` in one pipeline; returns their ids."""
+        pipe = self.client.pipeline(transaction=False)
+        for channel, event_type, data in events:
+            self._append(channel, event_type, data, client=pipe)
+        return [int(event_id) for event_id in pipe.execute()]
+
+    def get_current_id(self, channel):
+        return int(self.client.get(COUNTER_KEY.format(channel=channel)) or 0)
+
+    def get_events(self, channel, last_id, limit=100):
+        current_id = self.get_current_id(channel)
+        if last_id == current_id:
+            return []
+        if last_id > current_id:
+            # The counter expired and restarted since the client's last event.
+            raise EventDoesNotExist(f"No such event {last_id}", current_id)
+
+        entries = self.client.xrange(
+            STREAM_KEY.format(channel=channel), min=f"{last_id + 1}-0", count=limit
+        )
+        events = [
+            Event(channel, fields[b"type"].decode(), fields[b"data"].decode(), id=int(entry_id.split(b"-")[0]))
+            for entry_id, fields in entries
+        ]
+
+        # The event right after last_id was trimmed: the gap can't be replayed.
+        if not events or events[0].id != last_id + 1:
+            raise EventDoesNotExist(f"No such event {last_id}", current_id)
+
+        return events
@@ -0,0 +1,295 @@
+"""
+Chunked notification broadcasts.
+
+Recipients are paged in id order by a generator, and each chunk is inserted,
+counted and published in its own short transaction. The chunk's last user id is
+committed with it, so a crashed broadcast resumes after the last committed
+chunk; ``resume_stalled_broadcasts`` re-enqueues runs that stopped making
+progress.
+
+Audience broadcasts (a role plus profile filters such as department or skills)
+skip the Python round trip: one ``INSERT ... SELECT`` materializes every
+notification inside the database, then the rows are published in the same
+resumable user-id chunks. Those rows are already committed when a chunk is
+published, so a counter rebuilt from Postgres in between would count them
+already; their users' counters are dropped and rebuilt rather than
+incremented.
+"""
+
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from core.models import User
+from futaverse.utils.lookups import TokenOverlap
+
+from . import counters, sse
+from .coalescing import coalesce
+from .models import Notification, NotificationBroadcast
+
+logger = logging.getLogger(__name__)
+
+
+# role -> (profile relation, filters an audience may use)
+AUDIENCE_FIELDS = {
+    User.Role.STUDENT: ("student_profile", {"department", "faculty", "level", "skills"}),
+    User.Role.ALUMNI: ("alumni_profile", {"department", "faculty", "industry", "grad_year"}),
+}
+
+
+class BroadcastConflict(Exception):
+    """Another runner advanced the broadcast past the chunk being written."""
+
+
+def start_broadcast(
+    title, content, role="", user_ids=None, audience=None, priority=Notification.Priority.NORMAL
+):
+    """
+    Create a broadcast and enqueue it. ``audience`` maps profile attributes to
+    lists of accepted values, e.g. ``{"department": ["Computer Science"],
+    "level": [400]}``; a user matches when every attribute matches one value.
+    """
+    if audience is not None:
+        audience = {attribute: list(values) for attribute, values in audience.items()}
+        audience_queryset(role, audience)  # validate before queueing
+
+    broadcast = NotificationBroadcast.objects.create(
+        title=title,
+        content=content,
+        role=role,
+        user_ids=list(user_ids or []),
+        audience=audience,
+        priority=priority,
+    )
+    transaction.on_commit(
+        lambda: async_task("notifications.tasks.run_broadcast_task", broadcast.id)
+    )
+    return broadcast
+
+
+def audience_queryset(role, audience):
+    if role not in AUDIENCE_FIELDS:
+        raise ValueError(f"Audience broadcasts need a student or alumni role, got {role!r}")
+
+    profile, allowed = AUDIENCE_FIELDS[role]
+    unknown = set(audience) - allowed
+    if unknown:
+        raise ValueError(f"Unknown audience filters for {role}: {', '.join(sorted(unknown))}")
+
+    queryset = User.objects.filter(role=role, is_active=True, **{f"{profile}__is_deleted": False})
+    for attribute, values in audience.items():
+        values = list(values)
+        if not values:
+            raise ValueError(f"Audience filter {attribute!r} needs at least one value")
+
+        if attribute == "skills":
+            queryset = queryset.filter(TokenOverlap(F(f"{profile}__skills"), values))
+        else:
+            queryset = queryset.filter(**{f"{profile}__{attribute}__in": values})
+
+    return queryset
+
+
+def recipients(broadcast):
+    if broadcast.audience is not None:
+        return audience_queryset(broadcast.role, broadcast.audience)
+
+    if broadcast.role:
+        return User.objects.filter(role=broadcast.role, is_active=True)
+
+    return User.objects.filter(id__in=broadcast.user_ids)
+
+
+def recipient_chunks(broadcast, chunk_size):
+    """Yield lists of recipients (id only) after ``broadcast.last_user_id``."""
+    queryset = recipients(broadcast).order_by("id").only("id")
+    last_id = broadcast.last_user_id
+
+    while True:
+        users = list(queryset.filter(id__gt=last_id)[:chunk_size])
+        if not users:
+            return
+
+        yield users
+        last_id = users[-1].id
+
+
+def notification_chunks(broadcast, chunk_size):
+    """Yield a materialized broadcast's notifications after ``last_user_id``, by user id."""
+    queryset = (
+        Notification.objects.filter(broadcast=broadcast).select_related("user").order_by("user_id")
+    )
+    last_id = broadcast.last_user_id
+
+    while True:
+        notifications = list(queryset.filter(user_id__gt=last_id)[:chunk_size])
+        if not notifications:
+            return
+
+        yield notifications
+        last_id = notifications[-1].user_id
+
+
+def materialize_audience(broadcast):
+    """
+    Insert one notification per audience member with a single
+    ``INSERT ... SELECT`` and return the number of rows written.
+    """
+    select_sql, select_params = (
+        audience_queryset(broadcast.role, broadcast.audience).values("id").query.sql_with_params()
+    )
+
+    values = {
+        "broadcast": broadcast.id,
+        "title": broadcast.title,
+        "content": broadcast.content,
+        "priority": broadcast.priority,
+        "created_at": timezone.now(),
+    }
+    columns = []
+    expressions = []
+    params = []
+    for field in Notification._meta.concrete_fields:
+        if field.primary_key:
+            continue
+
+        columns.append(connection.ops.quote_name(field.column))
+        if field.name == "user":
+            expressions.append("recipients.id")
+        else:
+            value = values[field.name] if field.name in values else field.get_default()
+            expressions.append("%s")
+            params.append(field.get_db_prep_save(value, connection))
+
+    sql = (
+        f"INSERT INTO {connection.ops.quote_name(Notification._meta.db_table)} ({', '.join(columns)}) "
+        f"SELECT {', '.join(expressions)} FROM ({select_sql}) AS recipients"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*params, *select_params])
+        return cursor.rowcount
+
+
+def send_chunk(broadcast, users, previous_last_id):
+    with transaction.atomic():
+        recipient_ids = {user.id for user in users}
+        if broadcast.user_ids:
+            # Explicit lists come from send_notifications_task, which coalesces
+            # repeats into recent unread rows; large lists do it per chunk.
+            recipient_ids = set(coalesce(recipient_ids, broadcast.title, broadcast.content))
+
+        notifications = [
+            Notification(
+                user=user,
+                broadcast=broadcast,
+                title=broadcast.title,
+                content=broadcast.content,
+                priority=broadcast.priority,
+            )
+            for user in users
+            if user.id in recipient_ids
+        ]
+
+        # Advancing from the expected resume point doubles as an optimistic
+        # lock: a second runner on the same broadcast rolls back here, along
+        # with anything it coalesced.
+        advanced = NotificationBroadcast.objects.filter(
+            id=broadcast.id, last_user_id=previous_last_id
+        ).update(
+            last_user_id=users[-1].id,
+            sent_count=F("sent_count") + len(notifications),
+            status=NotificationBroadcast.Status.RUNNING,
+            updated_at=timezone.now(),
+        )
+        if not advanced:
+            raise BroadcastConflict(broadcast.id)
+
+        Notification.objects.bulk_create(notifications)
+
+        transaction.on_commit(lambda: publish_chunk(notifications))
+
+
+def publish_materialized_chunk(broadcast, notifications, previous_last_id):
+    with transaction.atomic():
+        advanced = NotificationBroadcast.objects.filter(
+            id=broadcast.id, last_user_id=previous_last_id
+        ).update(last_user_id=notifications[-1].user_id, updated_at=timezone.now())
+        if not advanced:
+            raise BroadcastConflict(broadcast.id)
+
+        transaction.on_commit(lambda: publish_chunk(notifications, materialized=True))
+
+
+def claim_and_materialize(broadcast):
+    """Materialize an audience broadcast once; the PENDING -> RUNNING claim commits with the rows."""
+    with transaction.atomic():
+        claimed = NotificationBroadcast.objects.filter(
+            id=broadcast.id, status=NotificationBroadcast.Status.PENDING
+        ).update(status=NotificationBroadcast.Status.RUNNING, updated_at=timezone.now())
+        if not claimed:
+            return
+
+        sent = materialize_audience(broadcast)
+        NotificationBroadcast.objects.filter(id=broadcast.id).update(sent_count=sent)
+
+
+def publish_chunk(notifications, materialized=False):
+    user_ids = [notification.user_id for notification in notifications]
+    if materialized:
+        counters.invalidate(user_ids)
+    else:
+        counters.increment(user_ids)
+    sse.emit_notifications(notifications)
+
+
+def run_broadcast(broadcast_id):
+    broadcast = NotificationBroadcast.objects.get(id=broadcast_id)
+    if broadcast.status == NotificationBroadcast.Status.COMPLETED:
+        return broadcast
+
+    chunk_size = settings.NOTIFICATION_BROADCAST_CHUNK_SIZE
+    last_id = broadcast.last_user_id
+    try:
+        if broadcast.audience is not None:
+            claim_and_materialize(broadcast)
+            for notifications in notification_chunks(broadcast, chunk_size):
+                publish_materialized_chunk(broadcast, notifications, last_id)
+                last_id = notifications[-1].user_id
+        else:
+            for users in recipient_chunks(broadcast, chunk_size):
+                send_chunk(broadcast, users, last_id)
+                last_id = users[-1].id
+    except BroadcastConflict:
+        logger.warning("run_broadcast: broadcast %s is being sent by another runner", broadcast_id)
+        return broadcast
+
+    NotificationBroadcast.objects.filter(id=broadcast.id).update(
+        status=NotificationBroadcast.Status.COMPLETED, completed_at=timezone.now()
+    )
+    broadcast.refresh_from_db()
+    logger.info("run_broadcast: broadcast %s sent to %s users", broadcast_id, broadcast.sent_count)
+    return broadcast
+
+
+def resume_stalled_broadcasts():
+    """Re-enqueue unfinished broadcasts with no progress for the stall timeout."""
+    stalled_before = timezone.now() - timedelta(minutes=settings.NOTIFICATION_BROADCAST_STALL_MINUTES)
+    stalled = list(
+        NotificationBroadcast.objects.exclude(status=NotificationBroadcast.Status.COMPLETED)
+        .filter(updated_at__lt=stalled_before)
+        .values_list("id", flat=True)
+    )
+
+    # Touch them so the next sweep doesn't enqueue them again before they start.
+    NotificationBroadcast.objects.filter(id__in=stalled).update(updated_at=timezone.now())
+
+    for broadcast_id in stalled:
+        logger.warning("resume_stalled_broadcasts: resuming broadcast %s", broadcast_id)
+        async_task("notifications.tasks.run_broadcast_task", broadcast_id)
+
+    return stalled
@@ -0,0 +1,47 @@
+"""
+Notification coalescing.
+
+A notification whose user already has an unread notification with the same
+title from inside NOTIFICATION_COALESCE_WINDOW_SECONDS is folded into that row:
+one UPDATE bumps its ``count`` and replaces its content, and no new row, unread
+count change or SSE frame is produced for it. The row keeps its inbox position.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Notification
+from .read_marks import unread_filter
+
+
+def coalesce(user_ids, title, content):
+    """
+    Merge into recent unread duplicates and return the user ids that still
+    need a new notification.
+    """
+    window = settings.NOTIFICATION_COALESCE_WINDOW_SECONDS
+    if not window:
+        return list(user_ids)
+
+    now = timezone.now()
+    # Latest matching row per user; later ids overwrite earlier ones.
+    existing = dict(
+        Notification.objects.filter(
+            unread_filter(),
+            user_id__in=user_ids,
+            title=title,
+            broadcast__isnull=True,
+            created_at__gte=now - timedelta(seconds=window),
+        )
+        .order_by("id")
+        .values_list("user_id", "id")
+    )
+    if existing:
+        Notification.objects.filter(id__in=existing.values()).update(
+            count=F("count") + 1, content=content, last_received_at=now
+        )
+
+    return [user_id for user_id in user_ids if user_id not in existing]
@@ -0,0 +1,192 @@
+"""
+Per-user unread notification counters kept in Redis.
+
+Writers only adjust counters that already exist; a missing counter is rebuilt
+from Postgres the next time it is read (one grouped COUNT for every missing
+user). ``check_drift`` periodically compares live counters with Postgres and
+corrects any that wandered. Without Redis every read is a grouped COUNT.
+"""
+
+import logging
+from collections import Counter
+
+from django.conf import settings
+from django.db.models import Count
+from redis.exceptions import RedisError
+
+from futaverse.utils.redis_client import get_redis
+
+from .models import Notification
+from .read_marks import unread_filter
+
+logger = logging.getLogger(__name__)
+
+UNREAD_KEY = "notifications:unread:{user_id}"
+
+# Adjust a counter only if it exists, never below zero, and refresh its TTL.
+ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return nil
+end
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if value < 0 then
+    redis.call('SET', KEYS[1], 0)
+    value = 0
+end
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return value
+"""
+
+
+def unread_key(user_id):
+    return UNREAD_KEY.format(user_id=user_id)
+
+
+def count_unread(user_ids):
+    """Unread counts from Postgres with one grouped query; users with none are 0."""
+    rows = (
+        Notification.objects.filter(unread_filter(), user_id__in=user_ids)
+        .values("user_id")
+        .annotate(total=Count("id"))
+        .values_list("user_id", "total")
+    )
+    counts = dict.fromkeys(user_ids, 0)
+    counts.update(rows)
+    return counts
+
+
+def adjust(deltas):
+    """Apply ``{user_id: delta}`` to the counters that exist, in one pipeline."""
+    client = get_redis()
+    if client is None or not deltas:
+        return
+
+    try:
+        script = client.register_script(ADJUST_SCRIPT)
+        pipe = client.pipeline(transaction=False)
+        for user_id, delta in deltas.items():
+            script(
+                keys=[unread_key(user_id)],
+                args=[delta, settings.NOTIFICATION_UNREAD_COUNTER_TTL],
+                client=pipe,
+            )
+        pipe.execute()
+    except RedisError as e:
+        logger.warning("Unread counter update failed: %s", e)
+
+
+def increment(user_ids):
+    adjust(Counter(user_ids))
+
+
+def decrement(user_id, by=1):
+    adjust({user_id: -by})
+
+
+def invalidate(user_ids):
+    """Drop the users' counters so their next read rebuilds them from Postgres."""
+    client = get_redis()
+    keys = [unread_key(user_id) for user_id in user_ids]
+    if client is None or not keys:
+        return
+
+    try:
+        client.delete(*keys)
+    except RedisError as e:
+        logger.warning("Unread counter invalidation failed: %s", e)
+
+
+def reset(user_id):
+    client = get_redis()
+    if client is None:
+        return
+
+    try:
+        client.set(unread_key(user_id), 0, ex=settings.NOTIFICATION_UNREAD_COUNTER_TTL)
+    except RedisError as e:
+        logger.warning("Unread counter reset failed for user %s: %s", user_id, e)
+
+
+def get_unread_counts(user_ids):
+    """Return ``{user_id: unread}``, rebuilding missing counters from Postgres."""
+    user_ids = list(dict.fromkeys(user_ids))
+    client = get_redis()
+    if client is None:
+        return count_unread(user_ids)
+
+    try:
+        values = client.mget([unread_key(user_id) for user_id in user_ids])
+    except RedisError as e:
+        logger.warning("Unread counter read failed: %s", e)
+        return count_unread(user_ids)
+
+    counts = {
+        user_id: int(value) for user_id, value in zip(user_ids, values) if value is not None
+    }
+    missing = [user_id for user_id in user_ids if user_id not in counts]
+
+    if missing:
+        rebuilt = count_unread(missing)
+        counts.update(rebuilt)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for user_id, total in rebuilt.items():
+                # nx: don't clobber a counter another request rebuilt meanwhile.
+                pipe.set(
+                    unread_key(user_id), total, ex=settings.NOTIFICATION_UNREAD_COUNTER_TTL, nx=True
+                )
+            pipe.execute()
+        except RedisError as e:
+            logger.warning("Unread counter rebuild failed: %s", e)
+
+    return counts
+
+
+def get_unread_count(user_id):
+    return get_unread_counts([user_id])[user_id]
+
+
+def check_drift():
+    """
+    Compare every live counter with Postgres, fix the ones that differ, and
+    return ``{"checked", "corrected"}``.
+    """
+    client = get_redis()
+    if client is None:
+        return None
+
+    batch_size = settings.NOTIFICATION_DRIFT_CHECK_BATCH
+    checked = 0
+    corrected = 0
+
+    batch = []
+    for key in client.scan_iter(match=UNREAD_KEY.format(user_id="*"), count=batch_size):
+        batch.append(key)
+        if len(batch) == batch_size:
+            corrected += _check_batch(client, batch)
+            checked += len(batch)
+            batch = []
+
+    if batch:
+        corrected += _check_batch(client, batch)
+        checked += len(batch)
+
+    logger.info("check_unread_drift: checked=%s corrected=%s", checked, corrected)
+    return {"checked": checked, "corrected": corrected}
+
+
+def _check_batch(client, keys):
+    user_ids = [int(key.decode().rsplit(":", 1)[1]) for key in keys]
+    cached = client.mget(keys)
+    actual = count_unread(user_ids)
+
+    pipe = client.pipeline(transaction=False)
+    corrected = 0
+    for user_id, value in zip(user_ids, cached):
+        if value is not None and int(value) != actual[user_id]:
+            pipe.set(unread_key(user_id), actual[user_id], ex=settings.NOTIFICATION_UNREAD_COUNTER_TTL)
+            corrected += 1
+    if corrected:
+        pipe.execute()
+
+    return corrected
@@ -0,0 +1,106 @@
+"""
+Email digest of low-priority notifications.
+
+The scheduled job gathers every unread low-priority notification that hasn't
+been emailed yet and builds one digest per user (titles with their counts).
+Users whose digests render identically share a single
+``BrevoEmailService.send_bulk`` call, so the number of email API calls follows
+the number of distinct digests rather than the number of users. Notifications
+are stamped ``emailed_at`` only after their batch was accepted.
+"""
+
+import logging
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.db.models import Sum
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from futaverse.utils.email_service import BrevoEmailError, BrevoEmailService
+
+from .models import Notification
+from .read_marks import unread_filter
+
+logger = logging.getLogger(__name__)
+
+# Brevo accepts at most this many message versions per transactional send.
+MAX_BULK_RECIPIENTS = 1000
+
+
+def pending_digest_items(created_before):
+    """Return ``{user_id: (email, ((title, count), ...))}`` for users with pending items."""
+    rows = (
+        Notification.objects.filter(
+            unread_filter(),
+            priority=Notification.Priority.LOW,
+            emailed_at__isnull=True,
+            created_at__lte=created_before,
+            user__email__isnull=False,
+        )
+        .values("user_id", "user__email", "title")
+        .annotate(total=Sum("count"))
+        .order_by("user_id", "title")
+    )
+
+    items = defaultdict(Counter)
+    emails = {}
+    for row in rows:
+        items[row["user_id"]][row["title"]] += row["total"]
+        emails[row["user_id"]] = row["user__email"]
+
+    return {user_id: (emails[user_id], tuple(sorted(counts.items()))) for user_id, counts in items.items()}
+
+
+def send_digests():
+    """Send pending digests and return ``{"users", "emails_sent", "failed"}``."""
+    if not settings.NOTIFICATION_DIGEST_ENABLED:
+        return None
+
+    started_at = timezone.now()
+    by_digest = defaultdict(list)
+    for user_id, (email, items) in pending_digest_items(started_at).items():
+        by_digest[items].append((user_id, email))
+
+    mailer = BrevoEmailService()
+    users = 0
+    calls = 0
+    failed = 0
+
+    for items, recipients in by_digest.items():
+        body = render_to_string(
+            "emails/notification_digest.html",
+            {
+                "items": items,
+                "total": sum(count for _, count in items),
+                "notifications_url": f"{settings.FRONTEND_BASE_URL}/notifications",
+            },
+        )
+
+        for start in range(0, len(recipients), MAX_BULK_RECIPIENTS):
+            batch = recipients[start:start + MAX_BULK_RECIPIENTS]
+            try:
+                mailer.send_bulk(
+                    subject="Your FutaVerse notification digest",
+                    body=body,
+                    recipients=[email for _, email in batch],
+                    is_html=True,
+                )
+            except BrevoEmailError as e:
+                logger.warning("Notification digest send failed for %s users: %s", len(batch), e)
+                failed += len(batch)
+                continue
+
+            Notification.objects.filter(
+                unread_filter(),
+                user_id__in=[user_id for user_id, _ in batch],
+                priority=Notification.Priority.LOW,
+                emailed_at__isnull=True,
+                created_at__lte=started_at,
+            ).update(emailed_at=timezone.now())
+            users += len(batch)
+            calls += 1
+
+    stats = {"users": users, "emails_sent": calls, "failed": failed}
+    logger.info("send_digests: users=%s emails_sent=%s failed=%s", users, calls, failed)
+    return stats
@@ -0,0 +1,161 @@
+"""
+Management command: benchmark_broadcast
+
+Compares the three ways of materializing one notification per recipient:
+pulling the ids into Python and bulk-inserting them all at once (the original
+send_notifications_task), the chunked broadcast, and the audience broadcast's
+single INSERT ... SELECT. Only the writes are timed; SSE publishing runs on
+commit and the whole run is rolled back, so the database is left untouched.
+(The chunked run's peak memory includes its pending on-commit publish
+callbacks, which pile up because the run never commits.)
+Run: python manage.py benchmark_broadcast [--recipients N] [--chunk-size N]
+
+Options:
+    --recipients   Throwaway students to create for the run (default 50000)
+    --chunk-size   Chunk size for the chunked broadcast (default NOTIFICATION_BROADCAST_CHUNK_SIZE)
+"""
+
+import time
+import tracemalloc
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from core.models import StudentProfile, User
+from notifications import broadcasts
+from notifications.models import Notification, NotificationBroadcast
+
+BENCH_DEPARTMENT = "Broadcast Benchmark"
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark notification broadcast materialization strategies"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--recipients", type=int, default=50000, help="Recipients to create")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Chunked broadcast chunk size")
+
+    def handle(self, *args, **options):
+        recipients = options["recipients"]
+        chunk_size = options["chunk_size"] or settings.NOTIFICATION_BROADCAST_CHUNK_SIZE
+
+        try:
+            with transaction.atomic():
+                self.seed(recipients)
+                self.stdout.write(f"Benchmarking broadcasts to {recipients} recipients")
+
+                with override_settings(NOTIFICATION_BROADCAST_CHUNK_SIZE=chunk_size):
+                    self.measure("bulk_create (ids in Python)", self.bulk_create_all)
+                    self.measure(f"chunked (chunk={chunk_size})", self.chunked)
+                    self.measure("INSERT ... SELECT", self.insert_select)
+
+                raise Rollback
+        except Rollback:
+            pass
+
+    def seed(self, count):
+        users = User.objects.bulk_create(
+            [
+                User(
+                    email=f"broadcast-bench-{i}@example.invalid",
+                    role=User.Role.STUDENT,
+                    is_active=True,
+                    password="!",
+                )
+                for i in range(count)
+            ],
+            batch_size=5000,
+        )
+
+        StudentProfile.objects.bulk_create(
+            [
+                StudentProfile(
+                    user=user,
+                    phone_num="08000000000",
+                    gender="male",
+                    firstname="Bench",
+                    lastname=str(i),
+                    address="-",
+                    state="-",
+                    country="-",
+                    department=BENCH_DEPARTMENT,
+                    faculty="-",
+                    level=400,
+                    cgpa=4,
+                    expected_grad_year="2027",
+                )
+                for i, user in enumerate(users)
+            ],
+            batch_size=5000,
+        )
+
+    def audience(self):
+        return {"department": [BENCH_DEPARTMENT]}
+
+    def bulk_create_all(self):
+        user_ids = list(
+            broadcasts.audience_queryset(User.Role.STUDENT, self.audience()).values_list("id", flat=True)
+        )
+        Notification.objects.bulk_create(
+            [Notification(user_id=user_id, title="Bench", content="Bench") for user_id in user_ids]
+        )
+
+    def chunked(self):
+        broadcast = NotificationBroadcast.objects.create(
+            title="Bench", content="Bench", role=User.Role.STUDENT
+        )
+        # Same recipients as the audience, paged through Python in id order.
+        last_id = 0
+        queryset = (
+            broadcasts.audience_queryset(User.Role.STUDENT, self.audience()).order_by("id").only("id")
+        )
+        while True:
+            users = list(queryset.filter(id__gt=last_id)[: settings.NOTIFICATION_BROADCAST_CHUNK_SIZE])
+            if not users:
+                break
+
+            broadcasts.send_chunk(broadcast, users, last_id)
+            last_id = users[-1].id
+
+    def insert_select(self):
+        broadcast = NotificationBroadcast.objects.create(
+            title="Bench", content="Bench", role=User.Role.STUDENT, audience=self.audience()
+        )
+        broadcasts.claim_and_materialize(broadcast)
+
+    def measure(self, label, run):
+        # Timed and memory-traced separately: tracemalloc slows allocation-heavy paths.
+        with CaptureQueriesContext(connection) as queries:
+            elapsed, created = self.rolled_back(run)
+        tracemalloc.start()
+        try:
+            self.rolled_back(run)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"  {label:<32} rows={created:<7} time={elapsed:.0f}ms "
+                f"queries={len(queries) - 1:<5} peak_python_mem={peak / 1024 / 1024:.2f}MiB"
+            )
+        )
+
+    def rolled_back(self, run):
+        try:
+            with transaction.atomic():
+                started = time.perf_counter()
+                run()
+                elapsed = (time.perf_counter() - started) * 1000
+                created = Notification.objects.filter(title="Bench").count()
+                raise Rollback
+        except Rollback:
+            pass
+
+        return elapsed, created
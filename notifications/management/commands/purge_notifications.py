@@ -0,0 +1,45 @@
+"""
+Management command: purge_notifications
+
+Runs the notification retention purge (notifications.retention) on demand,
+with the same TTLs as the scheduled job. Unlike the scheduled job it runs to
+completion unless --max-seconds is given.
+Run: python manage.py purge_notifications [--mode delete|archive] [--chunk-size N]
+                                         [--sleep SECONDS] [--max-seconds N]
+
+Options:
+  --mode          delete, or archive into ArchivedNotification first (default NOTIFICATION_RETENTION_MODE)
+  --chunk-size    Primary-key range per transaction (default NOTIFICATION_PURGE_CHUNK_SIZE)
+  --sleep         Pause between ranges in seconds (default NOTIFICATION_PURGE_SLEEP_SECONDS)
+  --max-seconds   Stop after this long and resume from there next run (default 0, no limit)
+"""
+
+from django.core.management.base import BaseCommand
+
+from notifications.retention import RetentionMode, purge_expired
+
+
+class Command(BaseCommand):
+    help = "Purge notifications past their retention TTL"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--mode", choices=RetentionMode.choices, default=None, help="Delete or archive")
+        parser.add_argument("--chunk-size", type=int, default=None, help="Ids per range")
+        parser.add_argument("--sleep", type=float, default=None, help="Seconds between ranges")
+        parser.add_argument("--max-seconds", type=float, default=0, help="Time budget (0 = none)")
+
+    def handle(self, *args, **options):
+        stats = purge_expired(
+            mode=options["mode"],
+            chunk_size=options["chunk_size"],
+            sleep_seconds=options["sleep"],
+            max_seconds=options["max_seconds"],
+        )
+
+        status = "complete" if stats["complete"] else "stopped at time budget"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Purged {stats['purged']} notifications ({stats['mode']}) in {stats['chunks']} chunks, "
+                f"{stats['elapsed_ms']}ms, {status}"
+            )
+        )
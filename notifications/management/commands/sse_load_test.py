@@ -0,0 +1,189 @@
+"""
+Management command: sse_load_test
+
+Load harness for the ASGI event stream (futaverse/asgi.py). Opens N concurrent
+SSE clients against a running server, publishes timestamped events to their
+channels through django_eventstream (the same Redis pub/sub path notifications
+use), and reports delivery latency. With --server-pid, it also reports the
+server's resident memory (the process plus its children) before and after the
+clients connect, and the difference per connection.
+
+Clients are plain asyncio sockets speaking HTTP/1.0, so no extra dependencies
+are needed. Raise the open-file limit (ulimit -n) for large client counts on
+both sides.
+Run: python manage.py sse_load_test [--url URL] [--clients N] [--channels N]
+                                    [--events N] [--interval SECONDS] [--server-pid PID]
+
+Options:
+  --url          Event stream base URL (default http://127.0.0.1:8000/events/)
+  --clients      Concurrent connections (default 2000)
+  --channels     Distinct channels, spread round-robin over clients (default: one per client)
+  --events       Publish rounds; each round sends one event to every channel (default 20)
+  --interval     Seconds between rounds (default 0.5)
+  --server-pid   Server process id for memory readings (Linux /proc only)
+"""
+
+import asyncio
+import json
+import os
+import resource
+import statistics
+import time
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand
+from django_eventstream import send_event
+
+EVENT_TYPE = "loadtest"
+
+
+def rss_kib(pid):
+    """Resident memory of ``pid`` and its direct children, in KiB."""
+    pids = [pid]
+    for entry in os.listdir("/proc"):
+        if entry.isdigit():
+            try:
+                with open(f"/proc/{entry}/stat") as f:
+                    # Field 4 is the parent pid; the command name may contain spaces.
+                    if int(f.read().rsplit(")", 1)[1].split()[1]) == pid:
+                        pids.append(int(entry))
+            except (OSError, IndexError, ValueError):
+                continue
+
+    total = 0
+    for process_id in pids:
+        try:
+            with open(f"/proc/{process_id}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1])
+        except OSError:
+            continue
+    return total
+
+
+class Client:
+    def __init__(self, host, port, path, channel):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.channel = channel
+        self.opened = asyncio.Event()
+        self.latencies = []
+        self.writer = None
+
+    async def run(self):
+        reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        self.writer.write(
+            (
+                f"GET {self.path}?channel={self.channel} HTTP/1.0\r\n"
+                f"Host: {self.host}\r\nAccept: text/event-stream\r\n\r\n"
+            ).encode()
+        )
+        await self.writer.drain()
+
+        event_type = None
+        data = []
+        while line := await reader.readline():
+            line = line.decode().rstrip("\r\n")
+            if line.startswith("event:"):
+                event_type = line[6:].strip()
+            elif line.startswith("data:"):
+                data.append(line[5:].strip())
+            elif not line:
+                self.dispatch(event_type, "\n".join(data))
+                event_type = None
+                data = []
+
+    def dispatch(self, event_type, data):
+        if event_type == "stream-open":
+            self.opened.set()
+        elif event_type == EVENT_TYPE:
+            self.latencies.append(time.time() - json.loads(data)["sent_at"])
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+class Command(BaseCommand):
+    help = "Open many concurrent SSE clients and measure delivery latency and server memory"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--url", default="http://127.0.0.1:8000/events/", help="Event stream URL")
+        parser.add_argument("--clients", type=int, default=2000, help="Concurrent connections")
+        parser.add_argument("--channels", type=int, default=None, help="Distinct channels")
+        parser.add_argument("--events", type=int, default=20, help="Publish rounds")
+        parser.add_argument("--interval", type=float, default=0.5, help="Seconds between rounds")
+        parser.add_argument("--server-pid", type=int, default=None, help="Server pid for memory readings")
+
+    def handle(self, *args, **options):
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft < options["clients"] + 100:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (min(hard, options["clients"] + 100), hard))
+
+        asyncio.run(self.run(options))
+
+    async def run(self, options):
+        url = urlsplit(options["url"])
+        channel_count = options["channels"] or options["clients"]
+        channels = [f"loadtest-{i}" for i in range(channel_count)]
+        server_pid = options["server_pid"]
+
+        rss_before = rss_kib(server_pid) if server_pid else None
+
+        clients = [
+            Client(url.hostname, url.port or 80, url.path, channels[i % channel_count])
+            for i in range(options["clients"])
+        ]
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(client.run()) for client in clients]
+        await asyncio.wait(
+            [asyncio.create_task(client.opened.wait()) for client in clients], timeout=60
+        )
+        connect_seconds = time.perf_counter() - started
+
+        opened = sum(client.opened.is_set() for client in clients)
+        failed = sum(task.done() and task.exception() is not None for task in tasks)
+        self.stdout.write(f"Connected {opened}/{len(clients)} clients in {connect_seconds:.1f}s ({failed} failed)")
+
+        rss_after = rss_kib(server_pid) if server_pid else None
+
+        for seq in range(options["events"]):
+            for channel in channels:
+                await asyncio.to_thread(
+                    send_event, channel, EVENT_TYPE, {"seq": seq, "sent_at": time.time()}
+                )
+            await asyncio.sleep(options["interval"])
+
+        # Give in-flight deliveries a moment before tearing down.
+        await asyncio.sleep(2)
+        for client in clients:
+            client.close()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        self.report(clients, channel_count, options["events"], rss_before, rss_after, opened)
+
+    def report(self, clients, channel_count, rounds, rss_before, rss_after, opened):
+        latencies = sorted(latency * 1000 for client in clients for latency in client.latencies)
+        expected = opened * rounds
+
+        self.stdout.write(f"Delivered {len(latencies)}/{expected} events over {channel_count} channels")
+        if latencies:
+            quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"  latency p50={quantiles[49]:.1f}ms p95={quantiles[94]:.1f}ms "
+                    f"p99={quantiles[98]:.1f}ms max={latencies[-1]:.1f}ms"
+                )
+            )
+
+        if rss_before is not None and opened:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"  server rss before={rss_before / 1024:.1f}MiB after={rss_after / 1024:.1f}MiB "
+                    f"per_connection={(rss_after - rss_before) / opened:.1f}KiB"
+                )
+            )
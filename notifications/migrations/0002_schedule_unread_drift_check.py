@@ -0,0 +1,17 @@
+# Registers the periodic django-q schedule that reconciles the Redis unread
+# counters with Postgres (see notifications.counters.check_drift).
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0001_initial"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("check_unread_notification_drift", "notifications.tasks.check_unread_drift_task", minutes=60),
+    ]
@@ -0,0 +1,17 @@
+# Registers the periodic django-q schedule that re-enqueues notification
+# broadcasts that stopped making progress (see notifications.broadcasts).
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0003_notificationbroadcast"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("resume_stalled_broadcasts", "notifications.tasks.resume_stalled_broadcasts_task", minutes=5),
+    ]
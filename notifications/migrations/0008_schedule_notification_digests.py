@@ -0,0 +1,18 @@
+# Registers the periodic django-q schedule that sends the low-priority
+# notification email digest (see notifications.digests). The task is a no-op
+# unless NOTIFICATION_DIGEST_ENABLED is set.
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0007_notification_coalescing_digest"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("send_notification_digests", "notifications.tasks.send_notification_digests_task", minutes=60 * 24),
+    ]
@@ -0,0 +1,17 @@
+# Registers the periodic django-q schedule that purges expired
+# notifications (see notifications.retention).
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0009_archivednotification"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("purge_expired_notifications", "notifications.tasks.purge_expired_notifications_task", minutes=60),
+    ]
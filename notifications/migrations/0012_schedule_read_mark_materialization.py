@@ -0,0 +1,17 @@
+# Registers the periodic django-q schedule that materializes pending
+# "mark all read" watermarks (see notifications.read_marks).
+
+from django.db import migrations
+
+from futaverse.utils.schedules import DJANGO_Q_MIGRATION, ensure_schedule
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("notifications", "0011_notificationreadmark"),
+        DJANGO_Q_MIGRATION,
+    ]
+
+    operations = [
+        ensure_schedule("materialize_read_marks", "notifications.tasks.materialize_read_marks_task", minutes=10),
+    ]
@@ -6,16 +6,156 @@ from core.models import User
 from futaverse.models import BaseModel
 
 class Notification(BaseModel):
-    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications')
+    class Priority(models.TextChoices):
+        NORMAL = 'normal', 'Normal'
+        # Also collected into the periodic email digest (see notifications.digests).
+        LOW = 'low', 'Low'
+
+    # Indexed by the composite (user, id) indexes below.
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='notifications', db_index=False)
+    broadcast = models.ForeignKey(
+        'NotificationBroadcast', on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='notifications', db_index=False,
+    )
     
     title = models.CharField(max_length=255)
     content = models.TextField()
     
     is_read = models.BooleanField(default=False)
     read_at = models.DateTimeField(null=True, blank=True)
-    
-    def mark_as_read(self):
+
+    priority = models.CharField(max_length=10, choices=Priority.choices, default=Priority.NORMAL)
+    # Repeats of an unread notification (same user and title) inside the coalescing
+    # window bump ``count`` on the existing row instead of adding a new one.
+    count = models.PositiveIntegerField(default=1)
+    last_received_at = models.DateTimeField(null=True, blank=True)
+    emailed_at = models.DateTimeField(null=True, blank=True)
+
+    def is_read_by(self, read_before):
+        """Whether the row is read, either stored or covered by the user's read watermark."""
+        return self.is_read or (read_before is not None and self.created_at <= read_before)
+
+    def mark_as_read(self, read_before=None):
+        """
+        Mark the notification read; returns False if it already was (including
+        rows under the ``read_before`` watermark, which are stored as read here).
+        """
+        if self.is_read:
+            return False
+
+        covered = self.is_read_by(read_before)
         self.is_read = True
-        self.read_at = timezone.now()
+        self.read_at = read_before if covered else timezone.now()
         self.save(update_fields=['is_read', 'read_at'])
+        return not covered
+
+    class Meta:
+        constraints = [
+            # One notification per recipient per broadcast; also serves the
+            # broadcast publisher's (broadcast, user) keyset scan.
+            models.UniqueConstraint(fields=['broadcast', 'user'], name='notification_broadcast_user_uniq'),
+        ]
+        indexes = [
+            # Inbox pages: keyset range scans in id order (see NotificationCursorPagination).
+            models.Index(fields=['user', 'id'], name='notification_user_id_idx'),
+            # unread_only pages and unread counts touch only the unread rows.
+            models.Index(
+                fields=['user', 'id'],
+                condition=models.Q(is_read=False, is_deleted=False),
+                name='notification_unread_idx',
+            ),
+            # Low-priority rows still waiting for the email digest.
+            models.Index(
+                fields=['user', 'id'],
+                condition=models.Q(priority='low', emailed_at__isnull=True),
+                name='notification_digest_idx',
+            ),
+        ]
         
+
+
+class NotificationBroadcast(BaseModel):
+    """
+    One notification sent to many users, delivered in chunks by
+    notifications.broadcasts. ``last_user_id`` is the resume point: recipients
+    are processed in id order and every chunk commits together with it.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = 'pending', 'Pending'
+        RUNNING = 'running', 'Running'
+        COMPLETED = 'completed', 'Completed'
+
+    title = models.CharField(max_length=255)
+    content = models.TextField()
+
+    # Recipients: every active user with ``role``, or the explicit ``user_ids``.
+    role = models.CharField(max_length=20, choices=User.Role.choices, blank=True)
+    user_ids = models.JSONField(default=list, blank=True)
+    # Optional profile filters on top of ``role`` (see notifications.broadcasts.AUDIENCE_FIELDS).
+    # Audience broadcasts are materialized with one INSERT ... SELECT.
+    audience = models.JSONField(null=True, blank=True)
+    # Copied onto every notification; LOW ones are left for the email digest.
+    priority = models.CharField(
+        max_length=10, choices=Notification.Priority.choices, default=Notification.Priority.NORMAL
+    )
+
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
+    last_user_id = models.PositiveBigIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.title} ({self.status}, {self.sent_count} sent)"
+
+
+class ArchivedNotification(models.Model):
+    """
+    A notification moved out of the live table by the retention job
+    (notifications.retention) when NOTIFICATION_RETENTION_MODE is "archive".
+    Keeps the original primary key, so re-archiving a row is a no-op.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_notifications')
+
+    title = models.CharField(max_length=255)
+    content = models.TextField()
+    count = models.PositiveIntegerField(default=1)
+    is_read = models.BooleanField(default=False)
+
+    created_at = models.DateTimeField()
+    read_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.title} (archived)"
+
+
+class NotificationReadMark(models.Model):
+    """
+    A user's "mark all read" watermark: every notification created at or before
+    ``read_before`` counts as read, whatever its stored ``is_read``. The
+    endpoint only moves this row; notifications.read_marks copies the state
+    into ``is_read`` in chunks afterwards and then sets ``materialized``.
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name='notification_read_mark'
+    )
+    read_before = models.DateTimeField()
+    materialized = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['updated_at'],
+                condition=models.Q(materialized=False),
+                name='notification_read_mark_todo',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} read before {self.read_before}"
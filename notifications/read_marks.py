@@ -0,0 +1,120 @@
+"""
+"Mark all read" watermarks.
+
+Marking every notification read only moves the user's
+``NotificationReadMark.read_before`` to now: one upsert, however large the
+inbox. A notification is unread when ``is_read`` is false AND it was created
+after its user's watermark; ``unread_filter``/``user_unread_filter`` are the
+queryset forms every unread query uses (counters, inbox, coalescing, digest,
+retention). ``materialize`` then copies the watermark into ``is_read`` in
+chunks of NOTIFICATION_READ_MARK_CHUNK_SIZE rows, one short UPDATE each, so no
+statement locks a whole inbox. Until it has run, reads stay correct through
+the watermark.
+"""
+
+import logging
+import time
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from django_q.tasks import async_task
+
+from .models import Notification, NotificationReadMark
+
+logger = logging.getLogger(__name__)
+
+
+def unread_filter():
+    """Unread notifications across users, joined to each user's watermark."""
+    return Q(is_read=False) & (
+        Q(user__notification_read_mark__isnull=True)
+        | Q(created_at__gt=F("user__notification_read_mark__read_before"))
+    )
+
+
+def get_read_before(user_id):
+    return (
+        NotificationReadMark.objects.filter(user_id=user_id)
+        .values_list("read_before", flat=True)
+        .first()
+    )
+
+
+def user_unread_filter(read_before):
+    """Unread notifications of one user whose watermark is ``read_before`` (or None)."""
+    if read_before is None:
+        return Q(is_read=False)
+    return Q(is_read=False, created_at__gt=read_before)
+
+
+def mark_all_read(user_id):
+    """
+    Move the user's watermark to now and queue its materialization. The caller
+    resets the unread counter.
+    """
+    now = timezone.now()
+    NotificationReadMark.objects.update_or_create(
+        user_id=user_id, defaults={"read_before": now, "materialized": False}
+    )
+    transaction.on_commit(
+        lambda: async_task("notifications.tasks.materialize_read_mark_task", user_id)
+    )
+    return now
+
+
+def materialize(user_id, chunk_size=None):
+    """Store ``is_read`` for the rows under the user's watermark; returns the rows updated."""
+    chunk_size = chunk_size or settings.NOTIFICATION_READ_MARK_CHUNK_SIZE
+    mark = NotificationReadMark.objects.filter(user_id=user_id, materialized=False).first()
+    if mark is None:
+        return 0
+
+    updated = 0
+    last_id = 0
+    while True:
+        # Unread-index range scan; every chunk commits on its own.
+        ids = list(
+            Notification.objects.filter(
+                user_id=user_id, is_read=False, created_at__lte=mark.read_before, id__gt=last_id
+            )
+            .order_by("id")
+            .values_list("id", flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+
+        updated += Notification.objects.filter(id__in=ids, is_read=False).update(
+            is_read=True, read_at=mark.read_before
+        )
+        last_id = ids[-1]
+
+    # A newer "mark all read" meanwhile leaves the row pending for its own run.
+    NotificationReadMark.objects.filter(user_id=user_id, read_before=mark.read_before).update(
+        materialized=True
+    )
+    return updated
+
+
+def materialize_pending(max_seconds=None):
+    """Materialize watermarks left pending (e.g. a lost task); returns run stats."""
+    if max_seconds is None:
+        max_seconds = settings.NOTIFICATION_READ_MARK_MAX_SECONDS
+
+    started = time.perf_counter()
+    users = 0
+    updated = 0
+    pending = (
+        NotificationReadMark.objects.filter(materialized=False)
+        .order_by("updated_at")
+        .values_list("user_id", flat=True)
+    )
+    for user_id in pending.iterator():
+        if max_seconds and time.perf_counter() - started >= max_seconds:
+            break
+        updated += materialize(user_id)
+        users += 1
+
+    logger.info("materialize_read_marks: users=%s updated=%s", users, updated)
+    return {"users": users, "updated": updated}
@@ -0,0 +1,141 @@
+"""
+Notification retention.
+
+Read notifications expire NOTIFICATION_RETENTION_READ_DAYS after they were read
+(or soft-deleted), unread ones NOTIFICATION_RETENTION_UNREAD_DAYS after they
+were created. ``purge_expired`` walks the table in primary-key ranges of
+NOTIFICATION_PURGE_CHUNK_SIZE, deleting (or archiving, then deleting) the
+expired rows of one range per short transaction and sleeping between ranges,
+so no statement holds locks on more than one small id range. Ids grow with
+created_at, so the walk stops at the first range that starts after the later
+cutoff. Runs also stop after NOTIFICATION_PURGE_MAX_SECONDS and leave the
+next range start in the cache, so the following run resumes there instead of
+rescanning from the first id.
+"""
+
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import counters
+from .models import ArchivedNotification, Notification
+from .read_marks import unread_filter
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionMode:
+    DELETE = "delete"
+    ARCHIVE = "archive"
+
+    choices = [DELETE, ARCHIVE]
+
+
+CURSOR_KEY = "notifications:purge:cursor"
+
+ARCHIVED_FIELDS = ("id", "user_id", "title", "content", "count", "is_read", "created_at", "read_at")
+
+
+def expired_filter(now):
+    read_cutoff = now - timedelta(days=settings.NOTIFICATION_RETENTION_READ_DAYS)
+    unread_cutoff = now - timedelta(days=settings.NOTIFICATION_RETENTION_UNREAD_DAYS)
+
+    expired = (
+        Q(is_read=True, read_at__lt=read_cutoff)
+        | Q(is_read=True, read_at__isnull=True, created_at__lt=read_cutoff)
+        | Q(is_read=False, created_at__lt=unread_cutoff)
+        | Q(is_deleted=True, deleted_at__lt=read_cutoff)
+    )
+    return expired, max(read_cutoff, unread_cutoff)
+
+
+def purge_range(start, end, expired, mode):
+    """Purge the expired rows with ``start <= id < end``; returns the number removed."""
+    with transaction.atomic():
+        rows = Notification.all_objects.filter(expired, id__gte=start, id__lt=end)
+
+        if mode == RetentionMode.ARCHIVE:
+            ArchivedNotification.objects.bulk_create(
+                [ArchivedNotification(**row) for row in rows.values(*ARCHIVED_FIELDS)],
+                ignore_conflicts=True,
+            )
+
+        # Unread rows still count towards the Redis unread counters.
+        unread = Counter(rows.filter(unread_filter(), is_deleted=False).values_list("user_id", flat=True))
+        purged, _ = rows.delete()
+
+    if unread:
+        counters.adjust({user_id: -total for user_id, total in unread.items()})
+
+    return purged
+
+
+def purge_expired(now=None, mode=None, chunk_size=None, sleep_seconds=None, max_seconds=None):
+    """Purge expired notifications and return run stats. ``max_seconds=0`` runs to completion."""
+    now = now or timezone.now()
+    mode = mode or settings.NOTIFICATION_RETENTION_MODE
+    chunk_size = chunk_size or settings.NOTIFICATION_PURGE_CHUNK_SIZE
+    if sleep_seconds is None:
+        sleep_seconds = settings.NOTIFICATION_PURGE_SLEEP_SECONDS
+    if max_seconds is None:
+        max_seconds = settings.NOTIFICATION_PURGE_MAX_SECONDS
+
+    expired, latest_cutoff = expired_filter(now)
+    started = time.perf_counter()
+    purged = 0
+    chunks = 0
+    start = cache.get(CURSOR_KEY, 0)
+    complete = True
+
+    while True:
+        if max_seconds and time.perf_counter() - started >= max_seconds:
+            complete = False
+            break
+
+        # Primary-key lookup for the next live row; nothing at or past the
+        # later cutoff can have expired yet.
+        head = (
+            Notification.all_objects.filter(id__gte=start)
+            .order_by("id")
+            .values_list("id", "created_at")
+            .first()
+        )
+        if head is None or head[1] >= latest_cutoff:
+            break
+
+        start = head[0]
+        purged += purge_range(start, start + chunk_size, expired, mode)
+        chunks += 1
+        start += chunk_size
+
+        if sleep_seconds:
+            time.sleep(sleep_seconds)
+
+    if complete:
+        cache.delete(CURSOR_KEY)
+    else:
+        cache.set(CURSOR_KEY, start, timeout=None)
+
+    stats = {
+        "mode": mode,
+        "purged": purged,
+        "chunks": chunks,
+        "complete": complete,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    logger.info(
+        "purge_expired_notifications: mode=%s purged=%s chunks=%s complete=%s elapsed_ms=%s",
+        stats["mode"],
+        stats["purged"],
+        stats["chunks"],
+        stats["complete"],
+        stats["elapsed_ms"],
+    )
+    return stats
@@ -1,11 +1,39 @@
 from rest_framework import serializers
+from rest_framework.pagination import CursorPagination
 
 from .models import Notification
 
+
+class NotificationCursorPagination(CursorPagination):
+    """
+    Keyset pagination for the inbox: each page is an index range scan on
+    ``(user, id)`` (or the partial unread index), with no OFFSET and no COUNT.
+    Orders by id rather than created_at because a broadcast inserts all of its
+    rows with one timestamp, and ties on the cursor field fall back to offsets.
+    """
+
+    ordering = "-id"
+    page_size_query_param = "size"
+    max_page_size = 100
+
 class NotificationSerializer(serializers.ModelSerializer):
-    
+    """
+    Reports rows under the user's read watermark (``read_before`` in the
+    context) as read, before the background job has stored it.
+    """
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        read_before = self.context.get("read_before")
+
+        if not instance.is_read and instance.is_read_by(read_before):
+            data["is_read"] = True
+            data["read_at"] = self.fields["read_at"].to_representation(read_before)
+
+        return data
+
     class Meta:
         model = Notification
-        fields = ['sqid', 'title', 'content', 'is_read', 'created_at', 'read_at']
-        read_only_fields = ['sqid', 'created_at', 'is_read', 'read_at']
+        fields = ['sqid', 'title', 'content', 'count', 'priority', 'is_read', 'created_at', 'last_received_at', 'read_at']
+        read_only_fields = ['sqid', 'created_at', 'count', 'priority', 'is_read', 'last_received_at', 'read_at']
     
\ No newline at end of file
@@ -0,0 +1,171 @@
+"""
+Server-sent notification frames.
+
+Notifications are grouped by ``user-<sqid>`` channel and each channel gets one
+frame per batch: a single notification keeps the ``new_notification`` shape,
+several become one ``new_notifications`` frame carrying a list. With the
+eventstream Redis listener and the replay buffer (futaverse.utils.sse_storage)
+configured, a batch costs two pipelined round trips: one appending every frame
+to its channel's replay stream, one publishing them with their event ids.
+
+With NOTIFICATION_SSE_COALESCE_SECONDS > 0, notification ids are buffered in
+Redis and flushed by a debounced django-q task (futaverse.utils.schedules), so
+a burst to one user inside the window collapses into one frame.
+"""
+
+import json
+import logging
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils import timezone
+from django_eventstream import eventstream, send_event
+from django_eventstream.utils import get_storage, publish_event
+from redis.exceptions import RedisError
+
+from futaverse.utils.redis_client import get_redis
+from futaverse.utils.schedules import clear_debounce, debounce
+
+from . import counters
+from .models import Notification
+from .serializers import NotificationSerializer
+
+logger = logging.getLogger(__name__)
+
+EVENT_TYPE = "new_notification"
+BATCH_EVENT_TYPE = "new_notifications"
+
+# Must match the pub/sub channel django_eventstream's Redis listener subscribes to.
+EVENTSTREAM_PUBSUB_CHANNEL = "events_channel"
+
+BUFFER_KEY = "notifications:sse:buffer"
+FLUSH_KEY = "notifications:sse:flush"
+FLUSH_TASK = "notifications.tasks.flush_notification_frames_task"
+
+
+def channel_for(user):
+    return f"user-{user.sqid}"
+
+
+def build_frames(notifications):
+    """Return ``[(channel, event_type, data)]`` with one frame per recipient channel."""
+    by_user = defaultdict(list)
+    for notification in notifications:
+        by_user[notification.user_id].append(notification)
+
+    unread_counts = counters.get_unread_counts(by_user)
+    timestamp = timezone.now().isoformat()
+
+    frames = []
+    for user_id, user_notifications in by_user.items():
+        serialized = NotificationSerializer(user_notifications, many=True).data
+        if len(serialized) == 1:
+            event_type, payload = EVENT_TYPE, serialized[0]
+        else:
+            event_type, payload = BATCH_EVENT_TYPE, serialized
+
+        frames.append((
+            channel_for(user_notifications[0].user),
+            event_type,
+            {
+                "data": payload,
+                "new_notifications": unread_counts[user_id],
+                "type": event_type,
+                "timestamp": timestamp,
+            },
+        ))
+
+    return frames
+
+
+def publish_frames(frames):
+    client = eventstream.redis_client
+    storage = get_storage()
+    if client is None or not hasattr(storage, "append_events"):
+        # Local listeners or another storage backend: let django_eventstream handle each frame.
+        for channel, event_type, data in frames:
+            send_event(channel, event_type=event_type, data=data)
+        return
+
+    encoded = [
+        (channel, event_type, json.dumps(data, cls=DjangoJSONEncoder))
+        for channel, event_type, data in frames
+    ]
+    try:
+        event_ids = storage.append_events(encoded)
+    except RedisError as e:
+        # Still deliver live; these frames just can't be replayed.
+        logger.warning("SSE replay buffer append failed for %s frames: %s", len(frames), e)
+        event_ids = [None] * len(encoded)
+
+    pipe = client.pipeline(transaction=False)
+    for (channel, event_type, data), event_id in zip(encoded, event_ids):
+        pub_id = str(event_id) if event_id is not None else None
+        prev_id = str(event_id - 1) if event_id is not None else None
+        pipe.publish(
+            EVENTSTREAM_PUBSUB_CHANNEL,
+            json.dumps({"channel": channel, "event_type": event_type, "data": data, "pub_id": pub_id}),
+        )
+        publish_event(channel, event_type, data, pub_id, prev_id)
+
+    try:
+        pipe.execute()
+    except RedisError as e:
+        logger.warning("SSE publish failed for %s frames: %s", len(frames), e)
+
+
+def emit_notifications(notifications):
+    if not notifications:
+        return
+
+    if settings.NOTIFICATION_SSE_COALESCE_SECONDS and buffer_notifications(notifications):
+        return
+
+    publish_frames(build_frames(notifications))
+
+
+def buffer_notifications(notifications):
+    """Queue notification ids for the next flush; returns False if Redis is unavailable."""
+    client = get_redis()
+    if client is None:
+        return False
+
+    try:
+        client.rpush(BUFFER_KEY, *(notification.id for notification in notifications))
+    except RedisError as e:
+        logger.warning("SSE buffering failed, publishing directly: %s", e)
+        return False
+
+    debounce(FLUSH_KEY, FLUSH_TASK, window=settings.NOTIFICATION_SSE_COALESCE_SECONDS)
+    return True
+
+
+def flush_buffered():
+    """Publish every buffered notification, one frame per channel; returns the frame count."""
+    client = get_redis()
+    if client is None:
+        return 0
+
+    # Clearing the flag first means anything buffered after this schedules a new flush.
+    clear_debounce(FLUSH_KEY)
+
+    try:
+        pipe = client.pipeline()
+        pipe.lrange(BUFFER_KEY, 0, -1)
+        pipe.delete(BUFFER_KEY)
+        buffered, _ = pipe.execute()
+    except RedisError as e:
+        logger.warning("SSE buffer flush failed: %s", e)
+        return 0
+
+    notification_ids = {int(notification_id) for notification_id in buffered}
+    notifications = list(
+        Notification.objects.filter(id__in=notification_ids).select_related("user").order_by("id")
+    )
+    if not notifications:
+        return 0
+
+    frames = build_frames(notifications)
+    publish_frames(frames)
+    return len(frames)
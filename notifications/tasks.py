@@ -1,33 +1,63 @@
+from django.conf import settings
 from django.db import transaction
-from django.utils import timezone
-
-from django_eventstream import send_event
 
+from . import broadcasts, counters, digests, read_marks, retention, sse
+from .coalescing import coalesce
 from .models import Notification
-from .serializers import NotificationSerializer
-
-def emit_notifications(notifications):
-    serialized = NotificationSerializer(notifications, many=True).data
-    
-    for notification, data in zip(notifications, serialized):
-        channel = f'user-{notification.user.sqid}'
-        new_notifications = Notification.objects.filter(user=notification.user, is_read=False).count()
-        
-        send_event(channel, event_type='new_notification', data={
-            'data': data,
-            'new_notifications': new_notifications,
-            'type': 'new_notification',
-            'timestamp': timezone.now().isoformat(),
-        })
-
-def send_notifications_task(user_ids, title, content):
+
+def send_notifications_task(user_ids, title, content, priority=Notification.Priority.NORMAL):
+    # Large recipient lists go through the chunked, resumable broadcast path.
+    if len(user_ids) > settings.NOTIFICATION_BROADCAST_CHUNK_SIZE:
+        broadcasts.start_broadcast(title, content, user_ids=user_ids, priority=priority)
+        return
+
     with transaction.atomic():
+        user_ids = coalesce(user_ids, title, content)
+        if not user_ids:
+            return
+
         notifications = Notification.objects.bulk_create(
-            [Notification(user_id=user_id, title=title, content=content) for user_id in user_ids]
+            [
+                Notification(user_id=user_id, title=title, content=content, priority=priority)
+                for user_id in user_ids
+            ]
         )
         
         notification_ids = [notification.id for notification in notifications]
         
         full_notifications = list(Notification.objects.filter(id__in=notification_ids).select_related('user'))
         
-    transaction.on_commit(lambda: emit_notifications(full_notifications)) 
\ No newline at end of file
+    transaction.on_commit(lambda: counters.increment(user_ids))
+    transaction.on_commit(lambda: sse.emit_notifications(full_notifications))
+
+
+def check_unread_drift_task():
+    return counters.check_drift()
+
+
+def run_broadcast_task(broadcast_id):
+    broadcasts.run_broadcast(broadcast_id)
+
+
+def resume_stalled_broadcasts_task():
+    return broadcasts.resume_stalled_broadcasts()
+
+
+def flush_notification_frames_task():
+    return sse.flush_buffered()
+
+
+def send_notification_digests_task():
+    return digests.send_digests()
+
+
+def purge_expired_notifications_task():
+    return retention.purge_expired()
+
+
+def materialize_read_mark_task(user_id):
+    return read_marks.materialize(user_id)
+
+
+def materialize_read_marks_task():
+    return read_marks.materialize_pending()
@@ -0,0 +1,296 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import User
+from futaverse.tests_helpers import BaseAPITestCase
+from notifications import broadcasts
+from notifications.models import Notification, NotificationBroadcast
+from notifications.tasks import send_notifications_task
+
+
+def published_frames(mock_publish_frames):
+    return sum(len(call.args[0]) for call in mock_publish_frames.call_args_list)
+
+
+@override_settings(NOTIFICATION_BROADCAST_CHUNK_SIZE=2)
+class BroadcastTests(TestCase):
+    def setUp(self):
+        self.students = [
+            User.objects.create_user(email=f"s{i}@test.com", role=User.Role.STUDENT, is_active=True)
+            for i in range(5)
+        ]
+        self.alumnus = User.objects.create_user(email="a@test.com", role=User.Role.ALUMNI, is_active=True)
+
+    def _broadcast(self, **kwargs):
+        kwargs.setdefault("role", User.Role.STUDENT)
+        return NotificationBroadcast.objects.create(title="Hello", content="World", **kwargs)
+
+    def test_recipient_chunks_page_in_id_order(self):
+        broadcast = self._broadcast()
+
+        chunks = [[user.id for user in chunk] for chunk in broadcasts.recipient_chunks(broadcast, 2)]
+
+        ids = [user.id for user in self.students]
+        self.assertEqual(chunks, [ids[0:2], ids[2:4], ids[4:5]])
+
+    @patch("notifications.sse.publish_frames")
+    def test_run_inserts_every_recipient_and_publishes_per_chunk(self, mock_publish_frames):
+        broadcast = self._broadcast()
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            broadcasts.run_broadcast(broadcast.id)
+
+        self.assertEqual(len(callbacks), 3)
+        self.assertEqual(mock_publish_frames.call_count, 3)
+        self.assertEqual(
+            set(Notification.objects.values_list("user_id", flat=True)),
+            {user.id for user in self.students},
+        )
+        self.assertEqual(published_frames(mock_publish_frames), 5)
+
+        broadcast.refresh_from_db()
+        self.assertEqual(broadcast.status, NotificationBroadcast.Status.COMPLETED)
+        self.assertEqual(broadcast.sent_count, 5)
+        self.assertEqual(broadcast.last_user_id, self.students[-1].id)
+        self.assertIsNotNone(broadcast.completed_at)
+
+    @patch("notifications.sse.publish_frames")
+    def test_resumes_after_last_committed_chunk(self, mock_publish_frames):
+        broadcast = self._broadcast()
+        original = broadcasts.send_chunk
+        calls = []
+
+        def crash_on_second_chunk(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("worker died")
+            return original(*args)
+
+        with patch("notifications.broadcasts.send_chunk", side_effect=crash_on_second_chunk):
+            with self.assertRaises(RuntimeError):
+                broadcasts.run_broadcast(broadcast.id)
+
+        broadcast.refresh_from_db()
+        self.assertEqual(broadcast.status, NotificationBroadcast.Status.RUNNING)
+        self.assertEqual(broadcast.last_user_id, self.students[1].id)
+        self.assertEqual(Notification.objects.count(), 2)
+
+        broadcasts.run_broadcast(broadcast.id)
+
+        broadcast.refresh_from_db()
+        self.assertEqual(broadcast.status, NotificationBroadcast.Status.COMPLETED)
+        self.assertEqual(broadcast.sent_count, 5)
+        self.assertEqual(Notification.objects.count(), 5)
+        self.assertEqual(Notification.objects.values("user_id").distinct().count(), 5)
+
+    def test_stale_resume_point_is_rejected(self):
+        broadcast = self._broadcast()
+        users = next(broadcasts.recipient_chunks(broadcast, 2))
+        broadcasts.send_chunk(broadcast, users, 0)
+
+        with self.assertRaises(broadcasts.BroadcastConflict):
+            broadcasts.send_chunk(broadcast, users, 0)
+
+        self.assertEqual(Notification.objects.count(), 2)
+
+    @patch("notifications.sse.publish_frames")
+    def test_explicit_user_ids(self, mock_publish_frames):
+        broadcast = self._broadcast(role="", user_ids=[self.alumnus.id, self.students[0].id])
+
+        broadcasts.run_broadcast(broadcast.id)
+
+        self.assertEqual(
+            set(Notification.objects.values_list("user_id", flat=True)),
+            {self.alumnus.id, self.students[0].id},
+        )
+
+    @patch("notifications.broadcasts.async_task")
+    def test_stalled_broadcasts_are_reenqueued_once(self, mock_async_task):
+        stalled = self._broadcast(status=NotificationBroadcast.Status.RUNNING)
+        self._broadcast(status=NotificationBroadcast.Status.COMPLETED)
+        self._broadcast()
+        NotificationBroadcast.objects.filter(status=NotificationBroadcast.Status.COMPLETED).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+        NotificationBroadcast.objects.filter(id=stalled.id).update(
+            updated_at=timezone.now() - timedelta(hours=1)
+        )
+
+        self.assertEqual(broadcasts.resume_stalled_broadcasts(), [stalled.id])
+        mock_async_task.assert_called_once_with("notifications.tasks.run_broadcast_task", stalled.id)
+
+        self.assertEqual(broadcasts.resume_stalled_broadcasts(), [])
+
+    @patch("notifications.broadcasts.async_task")
+    def test_large_send_becomes_a_broadcast(self, mock_async_task):
+        user_ids = [user.id for user in self.students]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            send_notifications_task(user_ids, "Hello", "World")
+
+        broadcast = NotificationBroadcast.objects.get()
+        self.assertEqual(broadcast.user_ids, user_ids)
+        self.assertFalse(Notification.objects.exists())
+        mock_async_task.assert_called_once_with("notifications.tasks.run_broadcast_task", broadcast.id)
+
+    @patch("notifications.sse.publish_frames")
+    def test_large_low_priority_send_keeps_its_priority(self, mock_publish_frames):
+        user_ids = [user.id for user in self.students]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            send_notifications_task(user_ids, "Hello", "World", priority=Notification.Priority.LOW)
+
+        broadcast = NotificationBroadcast.objects.get()
+        self.assertEqual(broadcast.priority, Notification.Priority.LOW)
+        self.assertEqual(
+            list(Notification.objects.values_list("priority", flat=True).distinct()),
+            [Notification.Priority.LOW],
+        )
+        self.assertEqual(Notification.objects.count(), len(user_ids))
+
+    @override_settings(NOTIFICATION_COALESCE_WINDOW_SECONDS=600)
+    @patch("notifications.sse.publish_frames")
+    def test_large_send_coalesces_into_recent_unread_rows(self, mock_publish_frames):
+        earlier = Notification.objects.create(user=self.students[3], title="Hello", content="Old")
+        user_ids = [user.id for user in self.students]
+
+        with self.captureOnCommitCallbacks(execute=True):
+            send_notifications_task(user_ids, "Hello", "World")
+
+        earlier.refresh_from_db()
+        self.assertEqual((earlier.count, earlier.content), (2, "World"))
+        self.assertEqual(Notification.objects.filter(user=self.students[3]).count(), 1)
+        self.assertEqual(Notification.objects.count(), len(user_ids))
+        # The merged repeat is not a new notification.
+        self.assertEqual(NotificationBroadcast.objects.get().sent_count, len(user_ids) - 1)
+
+
+@override_settings(NOTIFICATION_BROADCAST_CHUNK_SIZE=2)
+class AudienceBroadcastTests(BaseAPITestCase):
+    def setUp(self):
+        self.cs_400 = [
+            self._create_student(email=f"cs{i}@test.com", level=400, skills=["python", "sql"])
+            for i in range(3)
+        ]
+        self.cs_300 = self._create_student(email="cs300@test.com", level=300, skills=["go"])
+        self.law_400 = self._create_student(
+            email="law@test.com", department="Law", faculty="Law", level=400, skills=["python"]
+        )
+        self.alumnus = self._create_alumnus()
+
+    def _audience_broadcast(self, **audience):
+        return NotificationBroadcast.objects.create(
+            title="Hello", content="World", role=User.Role.STUDENT, audience=audience
+        )
+
+    def test_audience_filters_combine(self):
+        queryset = broadcasts.audience_queryset(
+            User.Role.STUDENT, {"department": ["Computer Science"], "level": [400]}
+        )
+        self.assertEqual(set(queryset), set(self.cs_400))
+
+        queryset = broadcasts.audience_queryset(User.Role.STUDENT, {"skills": ["python", "rust"]})
+        self.assertEqual(set(queryset), {*self.cs_400, self.law_400})
+
+    def test_unknown_filters_are_rejected(self):
+        with self.assertRaises(ValueError):
+            broadcasts.start_broadcast("t", "c", role=User.Role.STUDENT, audience={"industry": ["Tech"]})
+
+        with self.assertRaises(ValueError):
+            broadcasts.start_broadcast("t", "c", role="", audience={"level": [400]})
+
+        with self.assertRaises(ValueError):
+            broadcasts.start_broadcast("t", "c", role=User.Role.STUDENT, audience={"level": []})
+
+        self.assertFalse(NotificationBroadcast.objects.exists())
+
+    def test_materializes_with_one_insert_select(self):
+        broadcast = self._audience_broadcast(department=["Computer Science"], level=[400])
+
+        with self.assertNumQueries(1):
+            created = broadcasts.materialize_audience(broadcast)
+
+        self.assertEqual(created, 3)
+        notifications = Notification.objects.filter(broadcast=broadcast)
+        self.assertEqual({n.user_id for n in notifications}, {user.id for user in self.cs_400})
+        for notification in notifications:
+            self.assertEqual((notification.title, notification.content), ("Hello", "World"))
+            self.assertFalse(notification.is_read)
+            self.assertIsNotNone(notification.created_at)
+
+    def test_materialized_rows_keep_the_broadcast_priority(self):
+        broadcast = self._audience_broadcast(level=[300])
+        broadcast.priority = Notification.Priority.LOW
+        broadcast.save()
+
+        broadcasts.materialize_audience(broadcast)
+
+        self.assertEqual(Notification.objects.get(broadcast=broadcast).priority, Notification.Priority.LOW)
+
+    @patch("notifications.sse.publish_frames")
+    def test_run_materializes_once_and_publishes_in_chunks(self, mock_publish_frames):
+        broadcast = self._audience_broadcast(skills=["python"])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            broadcasts.run_broadcast(broadcast.id)
+
+        self.assertEqual(len(callbacks), 2)
+        self.assertEqual(published_frames(mock_publish_frames), 4)
+
+        broadcast.refresh_from_db()
+        self.assertEqual(broadcast.status, NotificationBroadcast.Status.COMPLETED)
+        self.assertEqual(broadcast.sent_count, 4)
+        self.assertEqual(broadcast.last_user_id, self.law_400.id)
+
+        NotificationBroadcast.objects.filter(id=broadcast.id).update(
+            status=NotificationBroadcast.Status.RUNNING
+        )
+        broadcasts.run_broadcast(broadcast.id)
+        self.assertEqual(Notification.objects.filter(broadcast=broadcast).count(), 4)
+
+    @patch("notifications.broadcasts.counters.increment")
+    @patch("notifications.broadcasts.counters.invalidate")
+    @patch("notifications.sse.publish_frames")
+    def test_materialized_rows_rebuild_counters_instead_of_incrementing(
+        self, mock_publish_frames, mock_invalidate, mock_increment
+    ):
+        broadcast = self._audience_broadcast(skills=["python"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            broadcasts.run_broadcast(broadcast.id)
+
+        invalidated = [user_id for call in mock_invalidate.call_args_list for user_id in call.args[0]]
+        self.assertEqual(invalidated, sorted(user.id for user in [*self.cs_400, self.law_400]))
+        mock_increment.assert_not_called()
+
+    @patch("notifications.sse.publish_frames")
+    def test_publish_resumes_after_crash(self, mock_publish_frames):
+        broadcast = self._audience_broadcast(skills=["python"])
+        original = broadcasts.publish_materialized_chunk
+        calls = []
+
+        def crash_on_second_chunk(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("worker died")
+            return original(*args)
+
+        with (
+            self.captureOnCommitCallbacks(execute=True),
+            patch("notifications.broadcasts.publish_materialized_chunk", side_effect=crash_on_second_chunk),
+            self.assertRaises(RuntimeError),
+        ):
+            broadcasts.run_broadcast(broadcast.id)
+
+        broadcast.refresh_from_db()
+        self.assertEqual(broadcast.last_user_id, self.cs_400[1].id)
+        self.assertEqual(published_frames(mock_publish_frames), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            broadcasts.run_broadcast(broadcast.id)
+
+        self.assertEqual(published_frames(mock_publish_frames), 4)
+        self.assertEqual(Notification.objects.filter(broadcast=broadcast).count(), 4)
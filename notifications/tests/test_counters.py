@@ -0,0 +1,121 @@
+from unittest.mock import MagicMock, patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework import status
+
+from core.models import User
+from futaverse.tests_helpers import BaseAPITestCase
+from notifications import counters
+from notifications.models import Notification
+from notifications.tasks import send_notifications_task
+
+
+class UnreadCountTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f"u{i}@test.com", role=User.Role.STUDENT) for i in range(3)
+        ]
+        Notification.objects.bulk_create(
+            [Notification(user=self.users[0], title="t", content="c") for _ in range(2)]
+            + [Notification(user=self.users[1], title="t", content="c", is_read=True)]
+        )
+
+    def test_counts_come_from_one_grouped_query_without_redis(self):
+        with self.assertNumQueries(1):
+            counts = counters.get_unread_counts(user.id for user in self.users)
+
+        self.assertEqual(counts, {self.users[0].id: 2, self.users[1].id: 0, self.users[2].id: 0})
+
+    @patch("notifications.counters.get_redis")
+    def test_missing_counters_are_rebuilt_and_stored(self, mock_get_redis):
+        client = mock_get_redis.return_value
+        client.mget.return_value = [b"7", None]
+
+        counts = counters.get_unread_counts([self.users[1].id, self.users[0].id])
+
+        self.assertEqual(counts, {self.users[1].id: 7, self.users[0].id: 2})
+        pipe = client.pipeline.return_value
+        pipe.set.assert_called_once_with(
+            counters.unread_key(self.users[0].id), 2, ex=counters.settings.NOTIFICATION_UNREAD_COUNTER_TTL, nx=True
+        )
+
+    @patch("notifications.counters.get_redis")
+    def test_increment_groups_repeated_users(self, mock_get_redis):
+        script = MagicMock()
+        mock_get_redis.return_value.register_script.return_value = script
+
+        counters.increment([1, 2, 1])
+
+        deltas = {call.kwargs["keys"][0]: call.kwargs["args"][0] for call in script.call_args_list}
+        self.assertEqual(deltas, {counters.unread_key(1): 2, counters.unread_key(2): 1})
+
+    @patch("notifications.counters.get_redis")
+    def test_drift_check_corrects_wrong_counters(self, mock_get_redis):
+        client = mock_get_redis.return_value
+        keys = [counters.unread_key(user.id).encode() for user in self.users[:2]]
+        client.scan_iter.return_value = iter(keys)
+        client.mget.return_value = [b"2", b"5"]
+
+        stats = counters.check_drift()
+
+        self.assertEqual(stats, {"checked": 2, "corrected": 1})
+        client.pipeline.return_value.set.assert_called_once_with(
+            counters.unread_key(self.users[1].id), 0, ex=counters.settings.NOTIFICATION_UNREAD_COUNTER_TTL
+        )
+
+
+class EmitNotificationsTests(TestCase):
+    @patch("notifications.sse.publish_frames")
+    def test_broadcast_does_not_count_per_notification(self, mock_publish_frames):
+        users = [User.objects.create_user(email=f"b{i}@test.com", role=User.Role.STUDENT) for i in range(10)]
+
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                send_notifications_task([user.id for user in users], "Title", "Body")
+
+        counts = [q for q in queries.captured_queries if "COUNT(" in q["sql"]]
+        self.assertEqual(len(counts), 1)
+        (frames,) = mock_publish_frames.call_args.args
+        self.assertEqual(len(frames), 10)
+        self.assertEqual({data["new_notifications"] for _, _, data in frames}, {1})
+
+
+class NotificationCounterViewTests(BaseAPITestCase):
+    def setUp(self):
+        self.student = self._create_student()
+        self.notifications = Notification.objects.bulk_create(
+            [Notification(user=self.student, title="t", content="c") for _ in range(3)]
+        )
+
+    def test_unread_count_endpoint(self):
+        resp = self.client.get("/api/notifications/unread-count", **self._auth_header(self.student))
+
+        self.assertEqual(resp.status_code, status.HTTP_200_OK)
+        self.assertEqual(resp.data, {"unread_count": 3})
+
+    @patch("notifications.views.counters.decrement")
+    def test_mark_read_decrements_once(self, mock_decrement):
+        url = f"/api/notifications/mark-read/{self.notifications[0].sqid}"
+        headers = self._auth_header(self.student)
+        self.client.patch(url, **headers)
+        self.client.patch(url, **headers)
+
+        mock_decrement.assert_called_once_with(self.student.id)
+
+    @patch("notifications.views.counters.decrement")
+    def test_deleting_unread_notification_decrements(self, mock_decrement):
+        self.client.delete(
+            f"/api/notifications/delete/{self.notifications[0].sqid}", **self._auth_header(self.student)
+        )
+
+        mock_decrement.assert_called_once_with(self.student.id)
+
+    @patch("notifications.views.counters.reset")
+    def test_mark_all_read_resets_counter(self, mock_reset):
+        self.client.patch("/api/notifications/mark-all-read", **self._auth_header(self.student))
+
+        mock_reset.assert_called_once_with(self.student.id)
+        resp = self.client.get("/api/notifications/unread-count", **self._auth_header(self.student))
+        self.assertEqual(resp.data, {"unread_count": 0})
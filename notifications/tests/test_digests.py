@@ -0,0 +1,120 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import User
+from futaverse.utils.email_service import BrevoEmailError
+from notifications import digests
+from notifications.models import Notification
+from notifications.tasks import send_notifications_task
+
+
+@patch("notifications.sse.publish_frames")
+@override_settings(NOTIFICATION_COALESCE_WINDOW_SECONDS=600)
+class CoalescingTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f"u{i}@test.com", role=User.Role.STUDENT) for i in range(2)
+        ]
+        self.user_ids = [user.id for user in self.users]
+
+    def _send(self, user_ids, title="Reminder", content="c"):
+        with self.captureOnCommitCallbacks(execute=True):
+            send_notifications_task(user_ids, title, content)
+
+    def test_repeats_inside_the_window_bump_the_count(self, mock_publish_frames):
+        self._send(self.user_ids, content="first")
+        self._send(self.user_ids[:1], content="second")
+        self._send(self.user_ids[:1], content="third")
+
+        self.assertEqual(Notification.objects.count(), 2)
+        merged = Notification.objects.get(user=self.users[0])
+        self.assertEqual((merged.count, merged.content), (3, "third"))
+        self.assertIsNotNone(merged.last_received_at)
+        self.assertEqual(Notification.objects.get(user=self.users[1]).count, 1)
+
+        # Only the first send produced frames.
+        self.assertEqual(mock_publish_frames.call_count, 1)
+
+    def test_read_old_or_differently_titled_notifications_are_not_merged(self, mock_publish_frames):
+        self._send(self.user_ids[:1])
+        Notification.objects.update(is_read=True)
+        self._send(self.user_ids[:1])
+        Notification.objects.filter(is_read=False).update(
+            created_at=timezone.now() - timedelta(seconds=601)
+        )
+        self._send(self.user_ids[:1])
+        self._send(self.user_ids[:1], title="Other")
+
+        self.assertEqual(Notification.objects.count(), 4)
+        self.assertEqual(set(Notification.objects.values_list("count", flat=True)), {1})
+
+    @override_settings(NOTIFICATION_COALESCE_WINDOW_SECONDS=0)
+    def test_window_of_zero_disables_coalescing(self, mock_publish_frames):
+        self._send(self.user_ids)
+        self._send(self.user_ids)
+
+        self.assertEqual(Notification.objects.count(), 4)
+
+
+@override_settings(NOTIFICATION_DIGEST_ENABLED=True)
+@patch("notifications.digests.BrevoEmailService")
+class DigestTests(TestCase):
+    def setUp(self):
+        self.users = [
+            User.objects.create_user(email=f"d{i}@test.com", role=User.Role.STUDENT) for i in range(3)
+        ]
+        low = Notification.Priority.LOW
+        Notification.objects.bulk_create(
+            [
+                Notification(user=self.users[0], title="Completed", content="c", priority=low, count=2),
+                Notification(user=self.users[1], title="Completed", content="c", priority=low),
+                Notification(user=self.users[1], title="Completed", content="c", priority=low),
+                Notification(user=self.users[2], title="Other", content="c", priority=low),
+                Notification(user=self.users[2], title="Important", content="c"),
+                Notification(user=self.users[2], title="Read", content="c", priority=low, is_read=True),
+            ]
+        )
+
+    def test_identical_digests_share_one_bulk_send(self, mock_service):
+        mailer = mock_service.return_value
+
+        stats = digests.send_digests()
+
+        self.assertEqual(stats, {"users": 3, "emails_sent": 2, "failed": 0})
+        recipients = sorted(call.kwargs["recipients"] for call in mailer.send_bulk.call_args_list)
+        self.assertEqual(recipients, [["d0@test.com", "d1@test.com"], ["d2@test.com"]])
+
+        shared = next(
+            call.kwargs["body"]
+            for call in mailer.send_bulk.call_args_list
+            if len(call.kwargs["recipients"]) == 2
+        )
+        self.assertIn("Completed", shared)
+        self.assertIn("2 unread notifications", shared)
+
+        pending = Notification.objects.filter(
+            priority=Notification.Priority.LOW, is_read=False, emailed_at=None
+        )
+        self.assertFalse(pending.exists())
+        self.assertIsNone(Notification.objects.get(title="Important").emailed_at)
+
+        # Nothing left to send.
+        mailer.send_bulk.reset_mock()
+        self.assertEqual(digests.send_digests()["emails_sent"], 0)
+        mailer.send_bulk.assert_not_called()
+
+    def test_failed_batches_stay_pending(self, mock_service):
+        mock_service.return_value.send_bulk.side_effect = BrevoEmailError("down")
+
+        stats = digests.send_digests()
+
+        self.assertEqual(stats, {"users": 0, "emails_sent": 0, "failed": 3})
+        self.assertFalse(Notification.objects.exclude(emailed_at=None).exists())
+
+    @override_settings(NOTIFICATION_DIGEST_ENABLED=False)
+    def test_disabled(self, mock_service):
+        self.assertIsNone(digests.send_digests())
+        mock_service.assert_not_called()
@@ -0,0 +1,50 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from futaverse.tests_helpers import BaseAPITestCase
+from notifications.models import Notification
+
+
+class InboxPaginationTests(BaseAPITestCase):
+    def setUp(self):
+        self.student = self._create_student()
+        other = self._create_student(email="other@test.com")
+
+        # One timestamp for every row, as a broadcast's INSERT ... SELECT writes them.
+        created_at = timezone.now()
+        self.notifications = Notification.objects.bulk_create(
+            [
+                Notification(user=self.student, title=f"n{i}", content="c", is_read=i % 3 == 0)
+                for i in range(25)
+            ]
+            + [Notification(user=other, title="other", content="c")]
+        )
+        Notification.objects.update(created_at=created_at)
+
+    def _walk(self, url):
+        titles = []
+        while url:
+            resp = self.client.get(url, **self._auth_header(self.student))
+            self.assertEqual(resp.status_code, 200)
+            titles.extend(item["title"] for item in resp.data["results"])
+            url = resp.data["next"]
+        return titles
+
+    def test_pages_are_newest_first_without_gaps_or_repeats(self):
+        titles = self._walk("/api/notifications?size=10")
+
+        self.assertEqual(titles, [f"n{i}" for i in reversed(range(25))])
+
+    def test_unread_only(self):
+        titles = self._walk("/api/notifications?unread_only=true&size=4")
+
+        self.assertEqual(titles, [f"n{i}" for i in reversed(range(25)) if i % 3])
+
+    def test_pages_skip_the_count_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.get("/api/notifications?size=5", **self._auth_header(self.student))
+
+        self.assertEqual(len(resp.data["results"]), 5)
+        self.assertNotIn("count", resp.data)
+        self.assertFalse([q for q in queries.captured_queries if "COUNT(" in q["sql"]])
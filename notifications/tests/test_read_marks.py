@@ -0,0 +1,98 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from futaverse.tests_helpers import BaseAPITestCase
+from notifications import read_marks
+from notifications.models import Notification, NotificationReadMark
+from notifications.tasks import send_notifications_task
+
+
+class ReadMarkTests(BaseAPITestCase):
+    def setUp(self):
+        self.student = self._create_student()
+        self.other = self._create_student(email="other@test.com")
+        self.headers = self._auth_header(self.student)
+
+        Notification.objects.bulk_create(
+            [Notification(user=self.student, title=f"n{i}", content="c") for i in range(5)]
+            + [Notification(user=self.other, title="other", content="c")]
+        )
+        Notification.objects.update(created_at=timezone.now() - timedelta(minutes=1))
+
+    def _mark_all_read(self):
+        with CaptureQueriesContext(connection) as queries:
+            resp = self.client.patch("/api/notifications/mark-all-read", **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        return queries
+
+    def _unread_count(self):
+        return self.client.get("/api/notifications/unread-count", **self.headers).data["unread_count"]
+
+    def test_endpoint_only_moves_the_watermark(self):
+        queries = self._mark_all_read()
+
+        self.assertFalse(
+            [q for q in queries.captured_queries if q["sql"].startswith('UPDATE "notifications_notification"')]
+        )
+        self.assertEqual(Notification.objects.filter(user=self.student, is_read=False).count(), 5)
+
+        # Reads already see everything as read.
+        self.assertEqual(self._unread_count(), 0)
+        resp = self.client.get("/api/notifications", **self.headers)
+        self.assertTrue(all(item["is_read"] and item["read_at"] for item in resp.data["results"]))
+        resp = self.client.get("/api/notifications?unread_only=true", **self.headers)
+        self.assertEqual(resp.data["results"], [])
+
+        # Other users are untouched.
+        self.assertEqual(read_marks.get_read_before(self.other.id), None)
+
+    @patch("notifications.sse.publish_frames")
+    def test_newer_notifications_stay_unread(self, mock_publish_frames):
+        self._mark_all_read()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            # Same title as a covered row: must not be coalesced into it.
+            send_notifications_task([self.student.id], "n0", "again")
+
+        self.assertEqual(self._unread_count(), 1)
+        resp = self.client.get("/api/notifications?unread_only=true", **self.headers)
+        self.assertEqual([item["content"] for item in resp.data["results"]], ["again"])
+
+    @patch("notifications.views.counters.decrement")
+    def test_marking_or_deleting_a_covered_row_keeps_the_counter(self, mock_decrement):
+        self._mark_all_read()
+        first, second = Notification.objects.filter(user=self.student)[:2]
+
+        self.client.patch(f"/api/notifications/mark-read/{first.sqid}", **self.headers)
+        self.client.delete(f"/api/notifications/delete/{second.sqid}", **self.headers)
+
+        mock_decrement.assert_not_called()
+        first.refresh_from_db()
+        self.assertTrue(first.is_read)
+
+    @override_settings(NOTIFICATION_READ_MARK_CHUNK_SIZE=2)
+    def test_materialize_stores_is_read_in_chunks(self):
+        self._mark_all_read()
+        read_before = read_marks.get_read_before(self.student.id)
+
+        self.assertEqual(read_marks.materialize(self.student.id), 5)
+
+        self.assertEqual(
+            set(Notification.objects.filter(user=self.student).values_list("is_read", "read_at")),
+            {(True, read_before)},
+        )
+        self.assertFalse(Notification.objects.get(user=self.other).is_read)
+        self.assertTrue(NotificationReadMark.objects.get(user=self.student).materialized)
+        self.assertEqual(read_marks.materialize(self.student.id), 0)
+
+    def test_commit_queues_materialization(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self._mark_all_read()
+
+        self.assertFalse(Notification.objects.filter(user=self.student, is_read=False).exists())
+        self.assertEqual(read_marks.materialize_pending(), {"users": 0, "updated": 0})
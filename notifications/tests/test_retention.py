@@ -0,0 +1,94 @@
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core.models import User
+from notifications import retention
+from notifications.models import ArchivedNotification, Notification
+
+
+@override_settings(
+    NOTIFICATION_RETENTION_READ_DAYS=30,
+    NOTIFICATION_RETENTION_UNREAD_DAYS=90,
+    NOTIFICATION_PURGE_CHUNK_SIZE=3,
+    NOTIFICATION_PURGE_SLEEP_SECONDS=0,
+    NOTIFICATION_PURGE_MAX_SECONDS=0,
+)
+class RetentionTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(email="r@test.com", role=User.Role.STUDENT)
+        now = timezone.now()
+
+        def make(title, age_days, read_days_ago=None, **kwargs):
+            notification = Notification.objects.create(user=self.user, title=title, content="c", **kwargs)
+            read_at = now - timedelta(days=read_days_ago) if read_days_ago is not None else None
+            Notification.all_objects.filter(id=notification.id).update(
+                created_at=now - timedelta(days=age_days),
+                is_read=read_at is not None,
+                read_at=read_at,
+            )
+
+        # Oldest first, so ids follow created_at as in production.
+        make("old unread", 120)
+        make("old read", 100, read_days_ago=60)
+        make("old, read recently", 100, read_days_ago=5)
+        make("old deleted", 95, is_deleted=True, deleted_at=now - timedelta(days=40))
+        make("unread, not yet expired", 60)
+        make("read long ago", 50, read_days_ago=45)
+        make("recent read", 10, read_days_ago=1)
+        make("recent unread", 1)
+
+        self.expired = {"old unread", "old read", "old deleted", "read long ago"}
+
+    def _remaining(self):
+        return set(Notification.all_objects.values_list("title", flat=True))
+
+    @patch("notifications.retention.counters.adjust")
+    def test_purges_only_expired_rows_in_id_ranges(self, mock_adjust):
+        stats = retention.purge_expired(mode=retention.RetentionMode.DELETE)
+
+        self.assertEqual(stats["purged"], 4)
+        self.assertTrue(stats["complete"])
+        # Ranges of 3 ids; the walk stops at the range starting after the unread cutoff.
+        self.assertEqual(stats["chunks"], 2)
+        self.assertEqual(
+            self._remaining(),
+            {"old, read recently", "unread, not yet expired", "recent read", "recent unread"},
+        )
+        self.assertFalse(ArchivedNotification.objects.exists())
+        mock_adjust.assert_called_once_with({self.user.id: -1})
+
+    def test_archive_mode_copies_rows_first(self):
+        retention.purge_expired(mode=retention.RetentionMode.ARCHIVE)
+
+        self.assertEqual(set(ArchivedNotification.objects.values_list("title", flat=True)), self.expired)
+        archived = ArchivedNotification.objects.get(title="old read")
+        self.assertTrue(archived.is_read)
+        self.assertIsNotNone(archived.read_at)
+
+    def test_time_budget_resumes_from_the_cached_cursor(self):
+        with patch("notifications.retention.time.perf_counter", side_effect=[0, 0, 100, 100]):
+            stats = retention.purge_expired(max_seconds=10)
+
+        self.assertFalse(stats["complete"])
+        self.assertEqual(stats["chunks"], 1)
+        self.assertIsNotNone(cache.get(retention.CURSOR_KEY))
+
+        stats = retention.purge_expired()
+
+        self.assertTrue(stats["complete"])
+        self.assertEqual(self.expired & self._remaining(), set())
+        self.assertIsNone(cache.get(retention.CURSOR_KEY))
+
+    def test_management_command(self):
+        out = StringIO()
+        call_command("purge_notifications", "--mode", "archive", stdout=out)
+
+        self.assertIn("Purged 4 notifications (archive)", out.getvalue())
+        self.assertEqual(ArchivedNotification.objects.count(), 4)
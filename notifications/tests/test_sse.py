@@ -0,0 +1,121 @@
+import json
+from unittest.mock import MagicMock, patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django_q.models import Schedule
+
+from core.models import User
+from notifications import sse
+from notifications.models import Notification
+
+FLUSH_TASK = "notifications.tasks.flush_notification_frames_task"
+
+
+class NotificationFramesTests(TestCase):
+    def setUp(self):
+        self.alice, self.bob = [
+            User.objects.create_user(email=f"{name}@test.com", role=User.Role.STUDENT)
+            for name in ("alice", "bob")
+        ]
+        self.notifications = Notification.objects.bulk_create(
+            [
+                Notification(user=self.alice, title="a1", content="c"),
+                Notification(user=self.bob, title="b1", content="c"),
+                Notification(user=self.alice, title="a2", content="c"),
+            ]
+        )
+
+    def test_one_frame_per_channel(self):
+        frames = {
+            channel: (event_type, data) for channel, event_type, data in sse.build_frames(self.notifications)
+        }
+
+        self.assertEqual(set(frames), {f"user-{self.alice.sqid}", f"user-{self.bob.sqid}"})
+
+        event_type, data = frames[f"user-{self.alice.sqid}"]
+        self.assertEqual(event_type, sse.BATCH_EVENT_TYPE)
+        self.assertEqual([item["title"] for item in data["data"]], ["a1", "a2"])
+        self.assertEqual(data["new_notifications"], 2)
+
+        event_type, data = frames[f"user-{self.bob.sqid}"]
+        self.assertEqual(event_type, sse.EVENT_TYPE)
+        self.assertEqual(data["data"]["title"], "b1")
+        self.assertEqual(data["type"], sse.EVENT_TYPE)
+
+    @patch("notifications.sse.publish_event")
+    @patch("notifications.sse.send_event")
+    @patch("notifications.sse.get_storage")
+    def test_frames_are_buffered_and_pipelined(self, mock_get_storage, mock_send_event, mock_publish_event):
+        client = MagicMock()
+        storage = mock_get_storage.return_value
+        storage.append_events.return_value = [7, 3]
+
+        with patch.object(sse.eventstream, "redis_client", client):
+            sse.emit_notifications(self.notifications)
+
+        # One round trip into the replay buffer, one publishing every frame.
+        storage.append_events.assert_called_once()
+        self.assertEqual(len(storage.append_events.call_args.args[0]), 2)
+        pipe = client.pipeline.return_value
+        self.assertEqual(pipe.publish.call_count, 2)
+        pipe.execute.assert_called_once_with()
+        client.publish.assert_not_called()
+        mock_send_event.assert_not_called()
+
+        pubsub_channel, message = pipe.publish.call_args.args
+        self.assertEqual(pubsub_channel, sse.EVENTSTREAM_PUBSUB_CHANNEL)
+        message = json.loads(message)
+        self.assertIn(message["channel"], {f"user-{self.alice.sqid}", f"user-{self.bob.sqid}"})
+        self.assertIn("new_notifications", json.loads(message["data"]))
+        self.assertEqual(message["pub_id"], "3")
+        self.assertEqual(mock_publish_event.call_args.args[3:], ("3", "2"))
+
+    @patch("notifications.sse.send_event")
+    def test_falls_back_to_send_event_without_redis_listener(self, mock_send_event):
+        with patch.object(sse.eventstream, "redis_client", None):
+            sse.emit_notifications(self.notifications)
+
+        self.assertEqual(mock_send_event.call_count, 2)
+
+
+@override_settings(NOTIFICATION_SSE_COALESCE_SECONDS=5)
+class CoalescingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        NotificationFramesTests.setUp(self)
+
+    @patch("notifications.sse.publish_frames")
+    @patch("notifications.sse.get_redis")
+    def test_burst_is_buffered_and_flushed_once(self, mock_get_redis, mock_publish_frames):
+        client = mock_get_redis.return_value
+
+        sse.emit_notifications(self.notifications)
+
+        mock_publish_frames.assert_not_called()
+        client.rpush.assert_called_once_with(sse.BUFFER_KEY, *(n.id for n in self.notifications))
+        self.assertEqual(Schedule.objects.filter(func=FLUSH_TASK).count(), 1)
+
+        # A second burst inside the window joins the pending flush.
+        sse.emit_notifications(self.notifications[:1])
+        self.assertEqual(Schedule.objects.filter(func=FLUSH_TASK).count(), 1)
+
+        client.pipeline.return_value.execute.return_value = [[str(n.id).encode() for n in self.notifications], 1]
+        self.assertEqual(sse.flush_buffered(), 2)
+
+        # The flush cleared the flag: the next burst schedules a new one.
+        sse.emit_notifications(self.notifications[:1])
+        self.assertEqual(Schedule.objects.filter(func=FLUSH_TASK).count(), 2)
+
+        (frames,) = mock_publish_frames.call_args.args
+        self.assertEqual(
+            sorted(event_type for _, event_type, _ in frames), [sse.EVENT_TYPE, sse.BATCH_EVENT_TYPE]
+        )
+
+    @patch("notifications.sse.publish_frames")
+    @patch("notifications.sse.get_redis", return_value=None)
+    def test_publishes_directly_without_redis(self, mock_get_redis, mock_publish_frames):
+        sse.emit_notifications(self.notifications)
+
+        mock_publish_frames.assert_called_once()
+        self.assertFalse(Schedule.objects.filter(func=FLUSH_TASK).exists())
@@ -1,4 +1,4 @@
-from .views import ListNotificationsView, MarkNotificationAsReadView, MarkAllNotificationsAsReadView, DeleteNotificationView
+from .views import ListNotificationsView, MarkNotificationAsReadView, MarkAllNotificationsAsReadView, DeleteNotificationView, UnreadNotificationCountView
 
 from django.urls import path
 
@@ -6,5 +6,6 @@ urlpatterns = [
     path('', ListNotificationsView.as_view(), name='list-notifications'),
     path('/mark-read/<slug:sqid>', MarkNotificationAsReadView.as_view(), name='mark-notification-read'),
     path('/mark-all-read', MarkAllNotificationsAsReadView.as_view(), name='mark-all-notifications-read'),
-    path('/delete/<slug:sqid>', DeleteNotificationView.as_view(), name='delete-notification'),        
+    path('/delete/<slug:sqid>', DeleteNotificationView.as_view(), name='delete-notification'),
+    path('/unread-count', UnreadNotificationCountView.as_view(), name='unread-notification-count'),
 ]
\ No newline at end of file
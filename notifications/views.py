@@ -1,25 +1,39 @@
-from django.utils import timezone
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from . import counters, read_marks
 from .models import Notification
-from .serializers import NotificationSerializer
+from .serializers import NotificationCursorPagination, NotificationSerializer
 
 
 @extend_schema(
-    tags=["Notifications"], summary="List notifications for the logged in user"
+    tags=["Notifications"],
+    summary="List notifications for the logged in user",
+    parameters=[
+        OpenApiParameter("unread_only", bool, description="Only return unread notifications"),
+    ],
 )
 class ListNotificationsView(generics.ListAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = NotificationSerializer
+    pagination_class = NotificationCursorPagination
     queryset = Notification.objects.none()
 
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["read_before"] = self.read_before
+        return context
+
     def get_queryset(self):
-        user = self.request.user
+        self.read_before = read_marks.get_read_before(self.request.user.id)
+        queryset = Notification.objects.filter(user=self.request.user)
+
+        if self.request.query_params.get("unread_only", "").lower() in ("true", "1"):
+            queryset = queryset.filter(read_marks.user_unread_filter(self.read_before))
 
-        return Notification.objects.filter(user=user).order_by("-created_at")
+        return queryset
 
 
 @extend_schema(tags=["Notifications"], summary="Mark a notification as read")
@@ -34,8 +48,10 @@ class MarkNotificationAsReadView(generics.UpdateAPIView):
 
     def perform_update(self, serializer):
         notification = serializer.instance
+        read_before = read_marks.get_read_before(notification.user_id)
 
-        notification.mark_as_read()
+        if notification.mark_as_read(read_before):
+            counters.decrement(notification.user_id)
 
 
 @extend_schema(tags=["Notifications"], summary="Delete a notification")
@@ -47,6 +63,13 @@ class DeleteNotificationView(generics.DestroyAPIView):
     def get_queryset(self):
         return Notification.objects.filter(user=self.request.user)
 
+    def perform_destroy(self, instance):
+        was_unread = not instance.is_read_by(read_marks.get_read_before(instance.user_id))
+        instance.delete()
+
+        if was_unread:
+            counters.decrement(instance.user_id)
+
 
 @extend_schema(tags=["Notifications"], summary="Mark all notifications as read")
 class MarkAllNotificationsAsReadView(generics.GenericAPIView):
@@ -57,10 +80,22 @@ class MarkAllNotificationsAsReadView(generics.GenericAPIView):
     def patch(self, request):
         user = request.user
 
-        Notification.objects.filter(user=user, is_read=False).update(
-            is_read=True, read_at=timezone.now()
-        )
+        # Constant time: moves the read watermark; rows are updated in the background.
+        read_marks.mark_all_read(user.id)
+        counters.reset(user.id)
 
         return Response(
             {"detail": "All notifications marked as read."}, status=status.HTTP_200_OK
         )
+
+
+@extend_schema(tags=["Notifications"], summary="Get the unread notification count")
+class UnreadNotificationCountView(generics.GenericAPIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = None
+
+    def get(self, request):
+        return Response(
+            {"unread_count": counters.get_unread_count(request.user.id)},
+            status=status.HTTP_200_OK,
+        )
@@ -1,8 +1,7 @@
-from django.db.models import F
 from django.db import transaction
 
-from events.models import Event, Ticket, TicketPurchase
-from events.services import EventService
+from events import calendar_sync, reservations, ticket_emails
+from events.models import Event, TicketPurchase
 
 from logging import getLogger
 logger = getLogger(__name__)
@@ -25,14 +24,12 @@ def handle_charge_success(data):
             ticket = ticket_purchase.ticket
             event = ticket.event
             
-            event_service = EventService(event)
-            
-            Ticket.objects.filter(id=ticket.id).update(quantity_sold=F('quantity_sold') + 1)
+            # Consumes the checkout's seat hold and bumps quantity_sold after commit.
+            transaction.on_commit(lambda: reservations.confirm(ticket, reference))
+            ticket_emails.queue(reference)
         
         if event.mode in [Event.Mode.VIRTUAL, Event.Mode.HYBRID]:
-            event_service.sync_to_calendar()
-        
-        event_service.send_ticket_email(ticket_purchase)
+            calendar_sync.mark_dirty(event.id)
                 
     except TicketPurchase.DoesNotExist:
         logger.error(f"Purchase not found for reference: {reference}")
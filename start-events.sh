@@ -0,0 +1,6 @@
+#!/bin/bash
+
+# ASGI profile for the /events/ SSE stream; see futaverse/asgi.py.
+set -e
+
+exec daphne -b 0.0.0.0 -p "${PORT:-8000}" futaverse.asgi:application